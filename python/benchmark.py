@@ -0,0 +1,456 @@
+#!/usr/bin/env python2.6
+"""Benchmarks for the hytek module.  Synthetic HyTek reports of any size are
+generated from a seed, in either of the two layouts HyTek produces, and the
+parsing, scoring and dumping of them is timed.  Each benchmark reports the
+lines it handles per second, the objects it allocates and the peak memory it
+uses, and the numbers can be saved as a baseline for later runs to be
+compared against, so that a change which makes things slower fails
+loudly.  Pathological lines, meant to make a parser take time out of all
+proportion to their length, can be timed as well, as can the cold start of
+the command-line tool."""
+
+from gc import collect, disable, enable, get_objects
+from hytek import dump_to, export, load, LoadError, RaceTime, ResultsFile, \
+     ResultsParser, score, ScoreDumper, VirtualMeet
+from json import dump as dump_json, load as load_json
+from multiprocessing import Process, Queue
+from optparse import OptionParser
+from os import close, remove, write
+from os.path import abspath, dirname, join
+from random import Random
+from resource import getrusage, RUSAGE_SELF
+from subprocess import call
+from sys import executable, exit, stderr
+from tempfile import mkstemp
+from timeit import default_timer
+
+#Functions
+
+def generate(finishers=1000, teams=20, layout="last_first", seed=0):
+    """Generate a synthetic HyTek race report, yielding it one line at a
+    time.  The layout is either "last_first", in which the finishers are
+    named "Last, First", or "bib_year", in which each finisher has a bib
+    number and class year and is named "First Last".  Each team with at least
+    five finishers is scored; the same seed always gives the same report."""
+    if layout not in LAYOUTS:
+        raise ValueError("Unknown layout %s." % repr(layout))
+    random = Random(seed)
+    names = _team_names(teams)
+    members = [random.randrange(teams) for i in xrange(finishers)]
+    sizes = [0] * teams
+    for team in members:
+        sizes[team] += 1
+    format = LAYOUTS[layout]
+    scored = [0] * teams
+    points = 0
+    time = 24 * 6000 + random.randrange(6000)
+    for place, team in enumerate(members):
+        time += random.randrange(1 + 120000 // (finishers + 9))
+        scored[team] += 1
+        if sizes[team] >= 5 and scored[team] <= 7:
+            points += 1
+            awarded = str(points)
+        else:
+            awarded = ""
+        first = random.choice(FIRST_NAMES)
+        last = random.choice(LAST_NAMES)
+        if layout == "last_first":
+            name = "%s, %s" % (last, first)
+        else:
+            name = "%s %s" % (first, last)
+        yield format % dict(place=place + 1, bib=100 + place, name=name,
+                            year=random.choice(YEARS), team=names[team],
+                            time=RaceTime.from_hundredths(time),
+                            points=awarded)
+
+def _team_names(teams):
+    """Make up the given number of distinct team names."""
+    names = []
+    for prefix in ("",) + TEAM_PREFIXES:
+        for school in SCHOOLS:
+            if len(names) == teams:
+                return names
+            names.append((prefix + " " + school).strip())
+    raise ValueError("At most %d teams can be generated." % len(names))
+
+def benchmark(stage, finishers=1000, teams=20, layout="last_first", seed=0,
+              repeat=3):
+    """Run one benchmark in the current process.  Returns a dictionary
+    giving the best time in seconds over the repeats, the lines of the report
+    handled per second, the number of objects allocated by the first run and
+    still alive when it finishes, and the growth in peak memory, in
+    kilobytes, over the setup.  Small reports are run several times in a row
+    for each repeat so that the timer's resolution does not matter."""
+    setup, run = STAGES[stage]
+    lines = list(generate(finishers, teams, layout, seed))
+    argument = setup(lines)
+    del lines
+    collect()
+    before = getrusage(RUSAGE_SELF).ru_maxrss
+    objects = len(get_objects())
+    disable()
+    try:
+        start = default_timer()
+        result = run(argument)
+        best = default_timer() - start
+        objects = len(get_objects()) - objects
+        del result
+        loops = max(1, int(minimum_time / max(best, 1e-9)))
+        for i in xrange(repeat - 1):
+            start = default_timer()
+            for j in xrange(loops):
+                run(argument)
+            best = min(best, (default_timer() - start) / loops)
+    finally:
+        enable()
+    peak = getrusage(RUSAGE_SELF).ru_maxrss - before
+    return dict(seconds=best, lines_per_second=finishers / max(best, 1e-9),
+                objects=objects, peak_kb=peak)
+
+def run_benchmarks(stages=None, sizes=(100, 1000, 10000), teams=20,
+                   layouts=None, seed=0, repeat=3):
+    """Run each combination of benchmark, size and layout in a fresh process,
+    so that each one's peak memory is its own, yielding a (key, numbers)
+    pair for each as it completes."""
+    if stages is None:
+        stages = STAGE_ORDER
+    if layouts is None:
+        layouts = sorted(LAYOUTS)
+    for stage in stages:
+        for layout in layouts:
+            for size in sizes:
+                queue = Queue()
+                process = Process(target=_run_child,
+                                  args=(queue, stage, size, teams, layout,
+                                        seed, repeat))
+                process.start()
+                numbers = queue.get()
+                process.join()
+                if isinstance(numbers, Exception):
+                    raise numbers
+                yield "%s/%s/%d" % (stage, layout, size), numbers
+
+def _run_child(queue, *arguments):
+    """Run a benchmark in a child process and send back its numbers."""
+    try:
+        queue.put(benchmark(*arguments))
+    except Exception, error:
+        queue.put(error)
+
+def compare(numbers, baseline, tolerance=0.2):
+    """Compare benchmark numbers to a baseline, returning a message for each
+    regression: a rate more than the tolerance below the baseline's, or more
+    objects or memory than the tolerance above it.  Benchmarks missing from
+    the baseline are not compared.  If both sets of numbers hold the seconds
+    of the "calibration" workload, the baseline's rates are first scaled by
+    how much faster or slower it ran, so that a baseline saved on another
+    machine, or under another load, still applies."""
+    regressions = []
+    scale = 1.0
+    if "calibration" in numbers and "calibration" in baseline:
+        scale = baseline["calibration"]["seconds"] / \
+                numbers["calibration"]["seconds"]
+    for key in sorted(numbers):
+        if key not in baseline or key == "calibration":
+            continue
+        current, saved = numbers[key], baseline[key]
+        rate = saved["lines_per_second"] * scale * (1 - tolerance)
+        if current["lines_per_second"] < rate:
+            regressions.append("%s: %d lines/s, baseline %d" %
+                               (key, current["lines_per_second"],
+                                saved["lines_per_second"]))
+        for measure, slack in (("objects", 100), ("peak_kb", 1024)):
+            limit = saved[measure] * (1 + tolerance) + slack
+            if current[measure] > limit:
+                regressions.append("%s: %d %s, baseline %d" %
+                                   (key, current[measure], measure,
+                                    saved[measure]))
+    return regressions
+
+def calibrate(repeat=3):
+    """Time a fixed workload that uses nothing of the hytek module, splitting,
+    formatting and counting the words of made-up lines, and return the best
+    of its times in seconds.  It measures how fast the machine runs Python
+    code at the moment, against which the rates of a baseline are scaled."""
+    lines = ["%d Name%d Team%d %d:%02d.%02d" % (i, i % 97, i % 13, i // 600,
+                                               i // 10 % 60, i % 100)
+             for i in xrange(20000)]
+    best = None
+    for i in xrange(repeat):
+        start = default_timer()
+        counts = {}
+        for line in lines:
+            words = line.split()
+            key = "%s/%s" % (words[2], words[1])
+            counts[key] = counts.get(key, 0) + int(words[0]) % 7
+        seconds = default_timer() - start
+        if best is None or seconds < best:
+            best = seconds
+    return best
+
+def worst_case(length=100000, parsers=None):
+    """Time the parsing of each of the pathological lines, made about length
+    characters long, by each of the parsers given, by default one for the
+    standard layout and one for which every column is optional.  Returns a
+    dictionary mapping the name of each line and the index of the parser to
+    the seconds it took, whether the line was parsed or rejected."""
+    if parsers is None:
+        parsers = [ResultsParser(),
+                   ResultsParser(optional=ResultsParser.field_order)]
+    seconds = {}
+    for name, (prefix, word, suffix) in PATHOLOGICAL.iteritems():
+        line = prefix + word * max(1, length // len(word)) + suffix
+        for i, parser in enumerate(parsers):
+            start = default_timer()
+            try:
+                parser.parse(line)
+            except LoadError:
+                pass
+            seconds[name, i] = default_timer() - start
+    return seconds
+
+def startup(commands=("load", "score", "dump", "convert"), repeat=10):
+    """Time the cold start of the command-line tool: each command is run on
+    a small results file, python -m hytek COMMAND FILE, in a fresh
+    interpreter.  Returns a dictionary mapping each command to the best of
+    its times in seconds less the best time of an interpreter that does
+    nothing, which is given as "python"."""
+    descriptor, path = mkstemp(".txt")
+    try:
+        write(descriptor, _join(generate(40, 4, "bib_year")))
+        close(descriptor)
+        #The hytek package sits beside this module
+        directory = dirname(abspath(__file__))
+        null = open("/dev/null", "w")
+        try:
+            python = _fastest(["-c", "pass"], repeat, directory, null)
+            seconds = dict((command,
+                            _fastest(["-m", "hytek", command, path], repeat,
+                                     directory, null) - python)
+                           for command in commands)
+        finally:
+            null.close()
+        seconds["python"] = python
+        return seconds
+    finally:
+        remove(path)
+
+def _fastest(arguments, repeat, directory, output):
+    """Run the interpreter with the given arguments several times over,
+    returning the least time in seconds it took."""
+    fastest = None
+    for i in xrange(repeat):
+        start = default_timer()
+        call([executable] + arguments, stdout=output, cwd=directory)
+        seconds = default_timer() - start
+        if fastest is None or seconds < fastest:
+            fastest = seconds
+    return fastest
+
+def main(arguments=None):
+    """Run the benchmarks named on the command line, or all of them, and
+    report the numbers.  Exits with status 1 if any regressed against the
+    baseline, which is the one saved beside this module unless another is
+    given."""
+    usage = "usage: %prog [options] [BENCHMARK...]"
+    options = OptionParser(usage=usage)
+    options.add_option("-n", "--sizes", default="100,1000,10000",
+                       help="comma-separated numbers of finishers "
+                       "[default: %default]")
+    options.add_option("-t", "--teams", type="int", default=20,
+                       help="number of teams [default: %default]")
+    options.add_option("-l", "--layout", action="append", dest="layouts",
+                       choices=sorted(LAYOUTS),
+                       help="report layout; may be given more than once "
+                       "[default: all]")
+    options.add_option("-s", "--seed", type="int", default=0,
+                       help="random seed [default: %default]")
+    options.add_option("-r", "--repeat", type="int", default=3,
+                       help="runs of each benchmark to take the best of "
+                       "[default: %default]")
+    options.add_option("-b", "--baseline", metavar="FILE",
+                       default=baseline_path,
+                       help="compare the numbers to those saved in FILE "
+                       "[default: %default]")
+    options.add_option("--no-baseline", action="store_const",
+                       dest="baseline", const=None,
+                       help="do not compare the numbers to a baseline")
+    options.add_option("--tolerance", type="float", default=0.2,
+                       help="fraction by which a number may be worse than "
+                       "the baseline [default: %default]")
+    options.add_option("--save", metavar="FILE",
+                       help="save the numbers to FILE as a baseline")
+    options.add_option("-w", "--worst-case", type="int", metavar="LENGTH",
+                       help="time the parsing of pathological lines LENGTH "
+                       "characters long instead")
+    options.add_option("--startup", action="store_true", default=False,
+                       help="time the cold start of the command-line tool "
+                       "against its budget instead")
+    options, stages = options.parse_args(arguments)
+    if options.startup:
+        seconds = startup(repeat=options.repeat * 5)
+        print "%-32s %12s" % ("command", "ms")
+        print "%-32s %12.1f" % ("python", seconds.pop("python") * 1000)
+        over = 0
+        for command in sorted(seconds):
+            print "%-32s %12.1f" % ("+ " + command, seconds[command] * 1000)
+            if seconds[command] > startup_budget:
+                over += 1
+                print >> stderr, "REGRESSION %s takes %.1f ms to start" % (
+                    command, seconds[command] * 1000)
+        return 1 if over else 0
+    if options.worst_case:
+        print "%-32s %12s" % ("line", "seconds")
+        seconds = worst_case(options.worst_case)
+        for name, parser in sorted(seconds):
+            print "%-32s %12.4f" % ("%s/%d" % (name, parser),
+                                    seconds[name, parser])
+        return 0
+    for stage in stages:
+        if stage not in STAGES:
+            print >> stderr, "Unknown benchmark %s." % repr(stage)
+            return 2
+    sizes = [int(size) for size in options.sizes.split(",")]
+    numbers = {}
+    print "%-32s %12s %10s %10s" % ("benchmark", "lines/s", "objects",
+                                    "peak KB")
+    #The machine is calibrated before and after, in case its speed drifts
+    calibration = calibrate(options.repeat)
+    for key, result in run_benchmarks(stages or None, sizes, options.teams,
+                                      options.layouts, options.seed,
+                                      options.repeat):
+        numbers[key] = result
+        print "%-32s %12d %10d %10d" % (key, result["lines_per_second"],
+                                        result["objects"], result["peak_kb"])
+    calibration = (calibration + calibrate(options.repeat)) / 2
+    numbers["calibration"] = dict(seconds=calibration)
+    if options.save:
+        stream = open(options.save, "w")
+        try:
+            dump_json(numbers, stream, indent=1, sort_keys=True)
+        finally:
+            stream.close()
+    if options.baseline:
+        stream = open(options.baseline)
+        try:
+            baseline = load_json(stream)
+        finally:
+            stream.close()
+        regressions = compare(numbers, baseline, options.tolerance)
+        for regression in regressions:
+            print >> stderr, "REGRESSION " + regression
+        if regressions:
+            return 1
+    return 0
+
+#Stages
+
+#The least time in seconds for which each repeat of a benchmark is run
+minimum_time = 0.05
+#The baseline that the numbers are compared to by default, saved with
+#--no-baseline --save.  It leaves out the dumps, which time the formatting
+#module as much as this one.
+baseline_path = join(dirname(abspath(__file__)), "benchmark_baseline.json")
+#The most time in seconds that a command of the command-line tool may take to
+#start, beyond that of the interpreter itself
+startup_budget = 0.015
+
+class _NullStream(object):
+    """Stream that discards everything written to it."""
+
+    def write(self, string):
+        pass
+
+def _join(lines):
+    return "\n".join(lines)
+
+def _times(lines):
+    return [[word for word in line.split() if ":" in word][0]
+            for line in lines]
+
+def _scores(lines):
+    return score(load(_join(lines)))
+
+def _parse_lazy(text):
+    return [runner.team for runner in load(text, lazy=True)]
+
+def _dump(runners):
+    dump_to(_NullStream(), runners)
+
+def _export(results):
+    export(_NullStream(), results)
+
+def _dump_scores(scores):
+    for line in ScoreDumper(scores):
+        pass
+
+def _republish(lines):
+    """Load a report into a ResultsFile, with a copy of the report in which
+    the line in the middle has been retyped."""
+    edited = lines[:]
+    middle = len(lines) // 2
+    edited[middle] = edited[middle].replace(" ", "  ", 1)
+    return ResultsFile(_join(lines)), _join(lines), _join(edited)
+
+def _reload(versions):
+    results, original, edited = versions
+    results.reload(edited)
+    results.reload(original)
+
+#Each benchmark is a function to prepare its input from the lines of a
+#report, which is not timed, and a function to time.
+STAGES = {"parse": (_join, load),
+          "parse_columnar": (_join, lambda text: load(text, columnar=True)),
+          "parse_lazy": (_join, _parse_lazy),
+          "race_time": (_times, lambda times: map(RaceTime.from_string,
+                                                  times)),
+          "score": (lambda lines: load(_join(lines)), score),
+          "dump": (lambda lines: load(_join(lines)), _dump),
+          "dump_scores": (_scores, _dump_scores),
+          "export": (lambda lines: load(_join(lines), columnar=True),
+                     _export),
+          "duals": (lambda lines: VirtualMeet(load(_join(lines))),
+                    lambda meet: list(meet.duals())),
+          "reload": (_republish, _reload)}
+STAGE_ORDER = ("parse", "parse_columnar", "parse_lazy", "race_time", "score",
+               "dump", "dump_scores", "export", "duals", "reload")
+
+#Data
+
+LAYOUTS = {"last_first": "%(place)d %(name)-28s %(team)-21s %(time)8s "
+           "%(points)4s",
+           "bib_year": "%(place)d #%(bib)d %(name)-20s %(year)s "
+           "%(team)-21s %(time)8s %(points)4s"}
+YEARS = ("FR", "SO", "JR", "SR")
+FIRST_NAMES = ("Aaron", "Adam", "Alex", "Andrew", "Ben", "Brian", "Casey",
+               "Chris", "Cory", "Daniel", "David", "Eric", "Evan", "Francis",
+               "Heather", "Jackson", "John", "Karl", "Kevin", "Leo", "Matt",
+               "Michael", "Nick", "Ryan", "Sam", "Sean", "Shawn", "Stefan",
+               "Thomas", "Tyler")
+LAST_NAMES = ("Allen-Slaba", "Aubol", "Brainerd", "Castillo", "Cooper",
+              "Davis", "Devlin-Foltz", "Dickman", "Fisher", "Gage", "Jenkins",
+              "Kelly", "Kopczynski", "Larson", "McIsaac", "McLaughlin",
+              "O'Moore", "Parker", "Reynolds", "Rebol", "Smith", "Straube",
+              "Van Slyke", "Wagner", "Weiss")
+SCHOOLS = ("Willamette", "Whitworth", "Whitman College", "Linfield College",
+           "Lewis & Clark", "Puget Sound", "George Fox", "Pacific Lutheran",
+           "Pacific University", "Colorado College", "Occidental",
+           "Claremont-Mudd-S", "Cal Lutheran", "Pomona-Pitzer", "Redlands",
+           "La Verne", "Chapman", "Caltech", "Whittier", "Southwestern")
+TEAM_PREFIXES = ("North", "South", "East", "West", "Central", "Upper",
+                 "Lower", "Old", "New", "Saint")
+#Pathological lines, each a prefix, a word repeated to the length wanted and
+#a suffix.  A row pattern that backtracks takes time polynomial in the length
+#of most of them: the digits, for one, can be split into a place and a bib
+#in as many ways as there are digits, starting at any one of them.
+PATHOLOGICAL = {"digits": ("", "1", ""),
+                "numbers": ("", "1 ", ""),
+                "words": ("", "Ab ", ""),
+                "names": ("", "Ab, Cd ", ""),
+                "row fragments": ("", "1 #12 Ab Cd SO Ef ", ""),
+                "times": ("", "1 Ab Cd Ef 1:1", ""),
+                "long team": ("1 Ab Cd SO", " Ef", " 1:00"),
+                "long row": ("1 Ab Cd SO", " Ef", " 25:00.00 1")}
+
+if __name__ == "__main__":
+    exit(main())
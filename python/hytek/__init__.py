@@ -0,0 +1,3605 @@
+#!/usr/bin/env python2.6
+"""The HyTek Meet Manager is the standard program for managing Cross-Country
+races.  This package is designed to parse HyTek race results as far as is
+possible and dump race results to a HyTek-style report.  It is also a
+command-line tool: run python -m hytek for its commands."""
+
+#Modules that only some of the package needs, such as formatting, json and
+#multiprocessing, are imported where they are used, so that the command-line
+#tool starts quickly.
+from abc import ABCMeta, abstractproperty
+from array import array
+from bisect import bisect_left, insort
+from datetime import timedelta
+from errno import EEXIST, EPIPE
+from itertools import islice, izip
+from operator import itemgetter
+from os import fdopen, listdir, makedirs, remove, rename, stat, utime
+from os.path import join
+from re import compile as Regex
+from struct import calcsize, error as StructError, pack, unpack_from
+from sys import argv, byteorder, stderr, stdin, stdout
+from timeit import default_timer
+
+#Functions
+
+def load(string, parser=None, columnar=False, cache=None, stats=None,
+         lazy=False):
+    """Attempt to parse HyTek race results into a list of finishers.  The
+    argument may be a string, an open file or any other iterable of lines,
+    or a buffer such as a bytearray, memoryview or memory-mapped file, which
+    is read a chunk at a time rather than copied whole.
+    Because some race results may have different column orders, add new ones,
+    or leave standard columns out, this may fail.  If the required information
+    cannot be extracted, a LoadError is raised.  A ResultsParser for a
+    particular column layout may be supplied; by default the standard layout is
+    used.  If columnar is true, the results are returned as a ResultSet rather
+    than a list.  If a ResultsCache, or the directory of one, is supplied as
+    the cache, the argument is instead the path of a file, which is only
+    parsed if the cache has not seen its contents before.  If a Stats
+    instance is supplied, the stages of the load are measured into it.  If
+    lazy is true, the finishers are LazyFinishers, whose fields are only
+    converted when they are first read."""
+    if lazy:
+        if columnar or cache is not None:
+            raise ValueError("Lazy loads are neither columnar nor cached.")
+        return list(iload(string, parser, stats, lazy))
+    if cache is not None:
+        if isinstance(cache, basestring):
+            cache = ResultsCache(cache)
+        return cache.load(string, parser, columnar, stats)
+    if not columnar:
+        return list(iload(string, parser, stats))
+    if parser is None:
+        parser = ResultsParser.for_layout()
+    results = ResultSet()
+    rows = parser.ivalues(string, stats)
+    #A number too large for the result set is thrown back to the parser,
+    #which raises a LoadError naming the line it came from
+    if stats is None:
+        for values in rows:
+            try:
+                results.append_values(values)
+            except OverflowError, error:
+                rows.throw(error)
+    else:
+        timer = default_timer
+        for values in rows:
+            start = timer()
+            try:
+                results.append_values(values)
+            except OverflowError, error:
+                rows.throw(error)
+            stats.time("build", timer() - start)
+    return results
+
+def iload(lines, parser=None, stats=None, lazy=False):
+    """Parse HyTek race results to an iterator, yielding each finisher as soon
+    as its line has been read.  The argument may be a string, a buffer, an
+    open file or any other iterable of lines; it is consumed one line at a
+    time, so the whole file never needs to be held in memory.  If a line
+    cannot be parsed, a LoadError is raised when the iterator reaches it.  If
+    a Stats instance is supplied, the stages of the load are measured into
+    it.  If lazy is true, the finishers are LazyFinishers."""
+    if parser is None:
+        parser = ResultsParser.for_layout()
+    if lazy:
+        return parser.ilazy(lines, stats)
+    return parser.iparse(lines, stats)
+
+def load_many(paths, workers=None, ordered=False, parser=None,
+              columnar=False, cache=None):
+    """Load many files of HyTek race results in parallel, yielding a (path,
+    results) pair for each file as soon as it has been loaded.  If a file
+    cannot be read or parsed, its results are the LoadError describing why,
+    and the rest of the files are loaded regardless.  The files are spread
+    across a pool of worker processes, cpu_count() of them by default; each
+    worker compiles its parser once, when it starts.  Pairs are yielded in the
+    order the files finish loading unless ordered is true, in which case they
+    are yielded in the order of the paths.  A ResultsCache, or the directory
+    of one, may be shared by the workers, as for load()."""
+    if parser is None:
+        parser = ResultsParser.for_layout()
+    if isinstance(cache, basestring):
+        cache = ResultsCache(cache)
+    layout = (parser.field_order, tuple(parser.optional))
+    jobs = [(path, columnar, cache) for path in paths]
+    if workers == 1 or len(jobs) < 2:
+        _start_worker(layout)
+        for job in jobs:
+            yield _load_file(job)
+        return
+    from multiprocessing import Pool
+    pool = Pool(workers, _start_worker, (layout,))
+    try:
+        if ordered:
+            loaded = pool.imap(_load_file, jobs)
+        else:
+            loaded = pool.imap_unordered(_load_file, jobs)
+        for pair in loaded:
+            yield pair
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+
+def load_meet(string, parser=None, columnar=False, workers=1):
+    """Parse a HyTek Meet Manager report of a whole meet, which may hold
+    several events, into a list of Events in the order they first appear.
+    The argument may be a string, an open file or any other iterable of lines,
+    and is read once, by split_events.  The rows of each event are then parsed
+    on their own, in parallel across a pool of that many worker processes if
+    workers is more than one, or one per CPU if it is None.  A LoadError is
+    raised for the first row that cannot be parsed.  The parser and columnar
+    arguments are as for load()."""
+    if parser is None:
+        parser = ResultsParser.for_layout()
+    sections = split_events(string)
+    jobs = [(rows, columnar) for number, name, rows in sections]
+    if workers == 1 or len(jobs) < 2:
+        loaded = [_parse_rows(parser, job) for job in jobs]
+    else:
+        from multiprocessing import Pool
+        layout = (parser.field_order, tuple(parser.optional))
+        pool = Pool(workers, _start_worker, (layout,))
+        try:
+            loaded = pool.map(_load_rows, jobs)
+            pool.close()
+        finally:
+            pool.terminate()
+            pool.join()
+    events = []
+    for (number, name, rows), results in zip(sections, loaded):
+        if isinstance(results, LoadError):
+            raise results
+        events.append(Event(number, name, results))
+    return events
+
+def split_events(lines):
+    """Split a HyTek Meet Manager report into its events in a single pass.
+    Returns a list of (number, name, rows) triples, one for each event in the
+    order they first appear, where the rows are (line number, line) pairs for
+    the event's finishers.  An event is begun by a header such as "Event 1
+    Men 8k Run CC"; an event whose header is repeated after a page break
+    carries on where it left off.  Borders of "=" signs, column headings and
+    page headers are skipped, as is each event's "Team Scores" section.  Rows
+    before the first event header belong to an event with neither number nor
+    name, so a report of a single race needs no header at all."""
+    lines = _lines(lines)
+    sections = []
+    events = {}
+    rows = None
+    scores = paused = False
+    for i, line in enumerate(lines):
+        line = line.rstrip("\r\n")
+        start = line.lstrip()[:1]
+        if start.isdigit():
+            if not scores and not paused:
+                if rows is None:
+                    rows = []
+                    sections.append((None, None, rows))
+                rows.append((i + 1, line))
+            continue
+        if not start:
+            continue
+        header = Event.header.match(line)
+        if header is not None:
+            number = int(header.group(1))
+            if number not in events:
+                events[number] = []
+                sections.append((number, header.group(2), events[number]))
+            rows = events[number]
+            scores = paused = False
+        elif Event.border.match(line):
+            paused = False
+        elif Event.team_scores.match(line):
+            scores = True
+        elif Event.page_header.search(line):
+            paused = True
+    return sections
+
+def _lines(source):
+    """Get the lines of race results from a string, a buffer or any other
+    iterable of lines.  The lines of strings and buffers may end with "\n",
+    "\r\n" or "\r", and keep their endings."""
+    if isinstance(source, basestring):
+        return iter(source.splitlines(True))
+    from mmap import mmap
+    if isinstance(source, _buffer_types + (mmap,)):
+        return _buffer_lines(source)
+    return source
+
+def _buffer_lines(data, size=65536):
+    """Split a buffer into lines, copying it into strings a chunk at a time,
+    so that no more than a chunk and the lines made from it are held at
+    once."""
+    if hasattr(data, "tobytes"):
+        chunks = (data[start:start + size].tobytes()
+                  for start in xrange(0, len(data), size))
+    else:
+        chunks = (buffer(data, start, size)[:]
+                  for start in xrange(0, len(data), size))
+    #The pieces of a line that runs on past the end of a chunk, which are
+    #only joined once the line ends, so that a long line costs no more than
+    #a short one.  A line ending in "\r" is held back too, in case the next
+    #chunk begins with its "\n".
+    pieces = []
+    for chunk in chunks:
+        if pieces and pieces[-1].endswith("\r") and \
+           not chunk.startswith("\n"):
+            yield "".join(pieces)
+            pieces = []
+        lines = chunk.splitlines(True)
+        rest = None
+        if not lines[-1].endswith("\n"):
+            rest = lines.pop()
+        if lines:
+            if pieces:
+                pieces.append(lines[0])
+                lines[0] = "".join(pieces)
+                pieces = []
+            for line in lines:
+                yield line
+        if rest is not None:
+            pieces.append(rest)
+    if pieces:
+        yield "".join(pieces)
+
+#The types of buffer read by _lines, besides memory-mapped files;
+#memoryview is new in Python 2.7
+_buffer_types = (bytearray, buffer)
+try:
+    _buffer_types += (memoryview,)
+except NameError:
+    pass
+
+def _parse_rows(parser, job):
+    """Parse the rows of one event, as given by split_events."""
+    rows, columnar = job
+    match = parser.row_matcher()
+    convert = parser.convert
+    if columnar:
+        results = ResultSet()
+        for number, line in rows:
+            try:
+                results.append_values(convert(match(line), line, number))
+            except OverflowError:
+                raise _too_large(line, number)
+        return results
+    results = []
+    for number, line in rows:
+        place, bib, name, year, team, time, points = convert(match(line), line,
+                                                             number)
+        results.append(Finisher(name, time, year, team, place, points, bib))
+    return results
+
+def _too_large(line, line_number=None):
+    """Get the LoadError for a row with a number too large to store as a
+    RaceTime or in a ResultSet."""
+    if line_number is None:
+        return LoadError("\"%s\" has a number too large to store." % line)
+    return LoadError("Line %d: \"%s\" has a number too large to store." %
+                     (line_number, line))
+
+def _load_rows(job):
+    """Parse the rows of one event in a worker process.  Errors are returned
+    rather than raised, to be raised again by the parent."""
+    try:
+        return _parse_rows(_worker_parser, job)
+    except LoadError, error:
+        return error
+
+def _start_worker(layout):
+    """Compile the parser that a worker process will use for each file."""
+    global _worker_parser
+    _worker_parser = ResultsParser.for_layout(*layout)
+
+def _load_file(job):
+    """Load one file in a worker process.  Errors are returned rather than
+    raised, so that one bad file does not stop the others."""
+    path, columnar, cache = job
+    try:
+        if cache is not None:
+            return path, cache.load(path, _worker_parser, columnar)
+        stream = open(path)
+        try:
+            return path, load(stream, _worker_parser, columnar)
+        finally:
+            stream.close()
+    except Exception, error:
+        return path, LoadError("%s: %s" % (path, error))
+
+def main(arguments=None):
+    """Run the command-line tool.  The first argument names one of the
+    commands, load, score, dump or convert, and the rest are that command's
+    options and files; run a command with --help for its usage.  Only the
+    modules the command needs are imported: when no options are given, not
+    even optparse, which takes longer to import than this package."""
+    if arguments is None:
+        arguments = argv[1:]
+    if not arguments or arguments[0] not in _commands:
+        print >> stderr, "usage: python -m hytek {%s} [options] ..." % \
+              ",".join(_command_order)
+        return 2
+    name = arguments[0]
+    usage, specifications, command = _commands[name]
+    arguments = arguments[1:]
+    if [argument for argument in arguments
+        if argument.startswith("-") and argument != "-"]:
+        from optparse import OptionParser
+        parser = OptionParser(usage="usage: python -m hytek %s %s" %
+                              (name, usage))
+        for flags, settings in specifications:
+            parser.add_option(*flags, **settings)
+        options, paths = parser.parse_args(arguments)
+    else:
+        options = _Defaults(specifications)
+        paths = arguments
+    try:
+        return command(options, paths)
+    except IOError, error:
+        #Whoever was reading the output, such as head, has stopped
+        if error.errno != EPIPE:
+            raise
+        return 0
+
+def _read(paths):
+    """Read the results file named by a command's arguments, or standard
+    input if there is none or it is -.  Returns its contents, mapped into
+    memory where possible so that a large file is never read whole, or None
+    after reporting an error."""
+    if len(paths) > 1:
+        print >> stderr, "Expected one file, got %d." % len(paths)
+        return None
+    if not paths or paths[0] == "-":
+        return stdin.read()
+    try:
+        stream = open(paths[0], "rb")
+    except IOError, error:
+        print >> stderr, error
+        return None
+    from mmap import ACCESS_READ, mmap
+    try:
+        try:
+            return mmap(stream.fileno(), 0, access=ACCESS_READ)
+        except (EnvironmentError, ValueError):
+            #Empty files and pipes cannot be mapped
+            return stream.read()
+    finally:
+        stream.close()
+
+def _load_input(paths):
+    """Read and parse the results file named by a command's arguments,
+    returning a ResultSet, or None after reporting an error."""
+    contents = _read(paths)
+    if contents is None:
+        return None
+    try:
+        return load(contents, columnar=True)
+    except LoadError, error:
+        print >> stderr, error
+        return None
+
+def _load_command(options, paths):
+    """Load the HyTek race results files named on the command line, in
+    parallel, and report how many finishers were found in each."""
+    failures = 0
+    for path, results in load_many(paths, options.workers, options.ordered,
+                                   columnar=True, cache=options.cache):
+        if isinstance(results, LoadError):
+            failures += 1
+            print >> stderr, results
+        else:
+            print "%s: %d finishers" % (path, len(results))
+    return 1 if failures else 0
+
+def _score_command(options, paths):
+    """Score a HyTek race results file and write the team scores as a
+    HyTek-style report."""
+    results = _load_input(paths)
+    if results is None:
+        return 1
+    scores = score(results, options.scoring, options.displacing)
+    for line in ScoreDumper(scores):
+        print line
+    return 0
+
+def _dump_command(options, paths):
+    """Regenerate the HyTek-style report of a HyTek race results file."""
+    results = _load_input(paths)
+    if results is None:
+        return 1
+    scores = score(results) if options.score else None
+    dump_to(stdout, results, scores, options.distance)
+    return 0
+
+def _convert_command(options, paths):
+    """Convert a HyTek race results file, or its team scores, to one of the
+    formats of export()."""
+    if options.scores and options.format == "columns":
+        print >> stderr, "Team scores cannot be converted to columns."
+        return 2
+    results = _load_input(paths)
+    if results is None:
+        return 1
+    if options.scores:
+        export_scores(stdout, score(results), options.format,
+                      options.encoding)
+    else:
+        export(stdout, results, options.format, encoding=options.encoding)
+    return 0
+
+#For each command: its usage, its options, as the arguments to
+#OptionParser.add_option, and the function that runs it
+_commands = {
+    "load": ("[options] FILE...", [
+        (("-j", "--workers"),
+         dict(type="int", default=None, help="number of worker processes "
+              "[default: one per CPU]")),
+        (("-o", "--ordered"),
+         dict(action="store_true", default=False, help="report files in "
+              "the order given rather than as they finish")),
+        (("-c", "--cache"),
+         dict(metavar="DIRECTORY", default=None, help="keep parsed results "
+              "in DIRECTORY and reuse them for files that have not "
+              "changed"))], _load_command),
+    "score": ("[options] [FILE]", [
+        (("-s", "--scoring"),
+         dict(type="int", default=5, help="runners who score for each team "
+              "[default: %default]")),
+        (("-d", "--displacing"),
+         dict(type="int", default=7, help="runners who displace for each "
+              "team [default: %default]"))], _score_command),
+    "dump": ("[options] [FILE]", [
+        (("-s", "--score"),
+         dict(action="store_true", default=False, help="score the race and "
+              "add the team scores")),
+        (("-d", "--distance"),
+         dict(type="int", default=None, metavar="METERS", help="label the "
+              "report with the distance run"))], _dump_command),
+    "convert": ("[options] [FILE]", [
+        (("-f", "--format"),
+         dict(default="csv", choices=["csv", "jsonl", "columns"],
+              help="csv, jsonl or columns [default: %default]")),
+        (("-s", "--scores"),
+         dict(action="store_true", default=False, help="convert the team "
+              "scores instead of the results")),
+        (("-e", "--encoding"),
+         dict(default="cp1252", help="encoding of the results file, for "
+              "jsonl [default: %default]"))], _convert_command)}
+_command_order = ("load", "score", "dump", "convert")
+
+class _Defaults(object):
+    """The values of a command's options when none are given on the command
+    line, named as optparse would name them."""
+
+    def __init__(self, specifications):
+        for flags, settings in specifications:
+            name = flags[-1].lstrip("-").replace("-", "_")
+            setattr(self, name, settings.get("default"))
+
+def score(results, scoring=5, displacing=7):
+    """Score a cross-country race, returning a list of Team instances in order
+    of finish.  The results, a list of IFinishers (which may be the rows of a
+    ResultSet) or a ResultSet, are taken to be in order of finish.  Only teams
+    with at least as many finishers as there are scoring places are scored; the
+    top finishers of each such team, up to the number of displacing places, are
+    awarded points in order of finish, and the points of the scoring places are
+    summed for the team score.  Everyone else, such as individuals and the
+    runners of incomplete teams, is awarded no points.  The points of each
+    finisher are updated to match.  Ties are broken in favor of the team whose
+    next runner after the scoring places finished first, a team without one
+    losing the tie."""
+    if isinstance(results, ResultSet):
+        return _score_groups(results, scoring, displacing)
+    results = list(results)
+    lookup = {}
+    teams = array("l")
+    names = []
+    times = array("l")
+    for finisher in results:
+        name = finisher.team
+        if name is None:
+            teams.append(-1)
+        else:
+            code = lookup.get(name)
+            if code is None:
+                code = lookup[name] = len(names)
+                names.append(name)
+            teams.append(code)
+        time = finisher.time
+        times.append(-1 if time is None else _hundredths(time))
+    #Count the finishers of each team to find the complete teams
+    counts = [0] * len(names)
+    for team in teams:
+        if team >= 0:
+            counts[team] += 1
+    #Award points in a single pass over the finishers
+    taken = [displacing if count < scoring else 0 for count in counts]
+    members = [[] for name in names]
+    points = array("l", [-1]) * len(teams)
+    awarded = 0
+    for i, team in enumerate(teams):
+        if team >= 0 and taken[team] < displacing:
+            taken[team] += 1
+            awarded += 1
+            points[i] = awarded
+            members[team].append(i)
+    for finisher, value in zip(results, points):
+        finisher.points = value if value >= 0 else None
+    #Rank the complete teams
+    teams = [(names[team], [points[i] for i in indices],
+              [times[i] for i in indices], [results[i] for i in indices])
+             for team, indices in enumerate(members)
+             if len(indices) >= scoring]
+    return _rank(teams, scoring, awarded + 1)
+
+def _score_groups(results, scoring, displacing):
+    """Score a ResultSet from its index of finishers by team, which already
+    holds each team's finishers in order of finish, so only the runners who
+    are awarded points are visited."""
+    times = results.columns["time"].data
+    complete = [(name, rows[:displacing])
+                for name, rows in results.index("team").iteritems()
+                if name is not None and len(rows) >= scoring]
+    scored = sorted(i for name, rows in complete for i in rows)
+    points = array("l", [-1]) * len(results)
+    for awarded, i in enumerate(scored):
+        points[i] = awarded + 1
+    results.columns["points"] = _IntegerColumn(points)
+    teams = [(name, [points[i] for i in rows], [times[i] for i in rows],
+              [results[i] for i in rows]) for name, rows in complete]
+    return _rank(teams, scoring, len(scored) + 1)
+
+def _rank(teams, scoring, unplaced):
+    """Rank complete teams, returning a list of Team instances in order of
+    finish.  Each team is given as a tuple of its name and the points, times
+    in hundredths of a second and finishers of its displacing runners, in
+    order of finish.  A team with no runner after its scoring places takes
+    the unplaced points as its tiebreaker."""
+    ranking = []
+    for name, points, hundredths, finishers in teams:
+        total = sum(points[:scoring])
+        if len(points) > scoring:
+            tiebreaker = points[scoring]
+        else:
+            tiebreaker = unplaced
+        ranking.append((total, tiebreaker, name, hundredths, finishers))
+    ranking.sort()
+    scores = []
+    for rank, (total, tiebreaker, name, hundredths, finishers) in \
+            enumerate(ranking):
+        if rank > 0 and ranking[rank - 1][:2] == (total, tiebreaker):
+            place = scores[-1].place
+        else:
+            place = rank + 1
+        top_five = _average(hundredths[:5])
+        if len(hundredths) >= 7:
+            top_seven = _average(hundredths[:7])
+        else:
+            top_seven = None
+        scores.append(Team(name, place, total, finishers, top_five,
+                           top_seven))
+    return scores
+
+def _average(hundredths):
+    """Average a list of times given in hundredths of a second, returning a
+    RaceTime, or None if any of the times is missing."""
+    if not hundredths or min(hundredths) < 0:
+        return None
+    count = len(hundredths)
+    return _race_time((sum(hundredths) * 2 + count) // (count * 2))
+
+def _hundredths(time):
+    """Convert a RaceTime or datetime.timedelta into a whole number of
+    hundredths of a second."""
+    if isinstance(time, RaceTime):
+        return int(time)
+    return ((time.days * 86400 + time.seconds) * 100 +
+            (time.microseconds + 5000) // 10000)
+
+def normalize_name(name):
+    """Reduce the name of a finisher to the form used to look it up: "Last,
+    First" and "First Last" both become "first last", in lower case and with
+    single spaces."""
+    if name is None:
+        return None
+    last, comma, first = name.partition(",")
+    if comma:
+        name = first + " " + last
+    return " ".join(name.lower().split())
+
+def normalize_team(team):
+    """Reduce the name of a team to the form used to match it: in lower case,
+    with punctuation and the words "College" and "University" dropped and
+    with single spaces, so that "Whitman College" matches "Whitman"."""
+    if team is None:
+        return None
+    words = _punctuation.sub(" ", team.lower()).split()
+    return " ".join(word for word in words if word not in _team_words)
+
+_punctuation = Regex(r"[^\w\s&]+")
+_team_words = frozenset(["college", "university", "univ"])
+
+def _normalize_bib(bib):
+    """Reduce a bib number, with or without its "#", to the form used to look
+    it up."""
+    if bib is None:
+        return None
+    return str(bib).lstrip("#")
+
+def _normalize_time(time):
+    """Reduce a time, given as a string, RaceTime or datetime.timedelta, to
+    the form used to look it up."""
+    if time is None:
+        return None
+    if isinstance(time, basestring):
+        return _race_time(_parse_hundredths(time))
+    return _race_time(_hundredths(time))
+
+def _normalize_year(year):
+    """Reduce a class year to the form used to look it up."""
+    if year is None:
+        return None
+    return year.upper()
+
+def dump(results, scores=None, distance=None, widths=None, stats=None):
+    """Dump the given meet score and results to a string.  It is recommended
+    that the results argument be a list of IFinisher instances and the scores
+    argument be a list of ITeam instances."""
+    """Dump the given meet score and results to a string."""
+    return "\n".join(idump(results, scores, distance, widths, stats))
+
+def idump(results, scores=None, distance=None, widths=None, stats=None):
+    """Dump the given meet score and results to an iterator.  It is recommended
+    that the results argument be a list of IFinisher instances and the scores
+    argument be a list of ITeam instances.  If the widths of the columns of
+    the results are given, as for ResultsDumper, the results may be any
+    iterable of finishers and are only read as the report is produced.  If a
+    Stats instance is supplied, the formatting is measured into it."""
+    if stats is not None:
+        return _profiled_dump(results, scores, distance, widths, stats)
+    return _idump(results, scores, distance, widths)
+
+def _idump(results, scores, distance, widths):
+    for row in ResultsDumper(results, distance, widths):
+        yield row
+    if scores is not None:
+        yield ""
+        for row in ScoreDumper(scores):
+            yield row
+
+def _profiled_dump(results, scores, distance, widths, stats):
+    """Dump as _idump does, timing the formatting of the results and the
+    scores and counting the lines and bytes of the report."""
+    stats.start()
+    try:
+        start = default_timer()
+        table = ResultsDumper(results, distance, widths)
+        stats.time("format results", default_timer() - start)
+        for row in _profiled_rows(table, stats, "format results"):
+            yield row
+        if scores is not None:
+            stats.add("report lines")
+            stats.add("report bytes")
+            yield ""
+            start = default_timer()
+            table = ScoreDumper(scores)
+            stats.time("format scores", default_timer() - start)
+            for row in _profiled_rows(table, stats, "format scores"):
+                yield row
+    finally:
+        stats.stop()
+
+def _profiled_rows(table, stats, stage):
+    """Yield the lines of a table, timing them and counting them and their
+    bytes."""
+    lines = size = 0
+    try:
+        for row in _timed(iter(table), stats, stage):
+            lines += 1
+            size += len(row) + 1
+            yield row
+    finally:
+        stats.add("report lines", lines)
+        stats.add("report bytes", size)
+
+def _timed(iterator, stats, stage):
+    """Yield the items of an iterator, adding the time taken to get each of
+    them to the given stage."""
+    timer = default_timer
+    elapsed = 0.0
+    try:
+        while True:
+            start = timer()
+            try:
+                item = iterator.next()
+            except StopIteration:
+                elapsed += timer() - start
+                return
+            elapsed += timer() - start
+            yield item
+    finally:
+        stats.time(stage, elapsed)
+
+def dump_to(stream, results, scores=None, distance=None, widths=None,
+            buffer_size=65536, stats=None):
+    """Dump the given meet score and results to a file-like object, one line
+    at a time.  Lines are written in chunks of roughly buffer_size
+    characters.  If the widths of the columns of the results are given, as
+    for ResultsDumper, the report is written as the results are read, in
+    constant memory; ResultsDumper.standard_widths may be used when the
+    results are too many to be sized in advance.  If a Stats instance is
+    supplied, the formatting is measured into it."""
+    chunk = []
+    size = 0
+    for row in idump(results, scores, distance, widths, stats):
+        chunk.append(row)
+        size += len(row) + 1
+        if size >= buffer_size:
+            chunk.append("")
+            stream.write("\n".join(chunk))
+            chunk = []
+            size = 0
+    if chunk:
+        chunk.append("")
+        stream.write("\n".join(chunk))
+
+def export(stream, results, format="csv", buffer_size=65536,
+           encoding="cp1252"):
+    """Write race results to a file-like object in a format meant for other
+    programs rather than for people: "csv", comma-separated values under a
+    header row; "jsonl", a JSON object per finisher per line; or "columns",
+    the binary format of ResultSet.encode.  Times are written as in a HyTek
+    report, and missing values are left empty or null.  Strings are written to
+    CSV as they were read; for JSON they are decoded from the given encoding,
+    by default the Windows-1252 of HyTek's reports, with any byte that it does
+    not define replaced.  Nothing is padded or sized: the rows are encoded a
+    batch at a time straight from the columns of a ResultSet, each distinct
+    string only once, and written in chunks of roughly buffer_size bytes.
+    Other results may be any iterable of IFinishers and are read a batch at a
+    time."""
+    if format == "columns":
+        if not isinstance(results, ResultSet):
+            results = ResultSet(results)
+        stream.writelines(results.encode())
+        return
+    try:
+        encode, time, null = _export_formats[format]
+    except KeyError:
+        raise ValueError("Unknown format %s." % repr(format))
+    if format == "csv":
+        template = ",".join(["%s"] * len(ResultSet.fields))
+        stream.write(",".join(ResultSet.fields) + "\n")
+    else:
+        template = "{%s}" % ",".join("\"%s\":%%s" % field
+                                     for field in ResultSet.fields)
+    rows = max(1, buffer_size // 64)
+    if isinstance(results, ResultSet):
+        batches = ((results, start, min(start + rows, len(results)))
+                   for start in xrange(0, len(results), rows))
+    else:
+        results = iter(results)
+        batches = _batches(results, rows)
+    #The encoded strings of each string column, kept across batches
+    tables = {}
+    for batch, start, stop in batches:
+        cells = []
+        for field in ResultSet.fields:
+            column = batch.columns[field]
+            if isinstance(column, _StringColumn):
+                table = tables.get(field)
+                if table is None or table[0] is not column:
+                    #The code -1 of a missing value picks out the null at the
+                    #end
+                    values = [encode(value, encoding)
+                              for value in column.values]
+                    table = tables[field] = (column, values + [null])
+                values = table[1]
+                codes = column.codes[start:stop]
+                cells.append([values[code] for code in codes])
+            elif isinstance(column, _TimeColumn):
+                cells.append([time % (value // 6000, value // 100 % 60,
+                                      value % 100) if value >= 0 else null
+                              for value in column.data[start:stop]])
+            else:
+                cells.append([str(value) if value >= 0 else null
+                              for value in column.data[start:stop]])
+        stream.write("\n".join([template % row for row in zip(*cells)]))
+        stream.write("\n")
+
+def _batches(finishers, size):
+    """Gather an iterator of IFinishers into ResultSets of the given size,
+    yielding each with the range of its rows to export."""
+    while True:
+        batch = ResultSet(islice(finishers, size))
+        if not len(batch):
+            return
+        yield batch, 0, len(batch)
+
+def export_scores(stream, scores, format="csv", encoding="cp1252"):
+    """Write team scores, as returned by score(), to a file-like object in
+    one of the text formats of export(): for each team, its place, name,
+    score, top five and top seven averages and the points of its displacing
+    runners, which are seven columns in CSV and a list in JSON Lines.  Team
+    names are encoded as by export()."""
+    try:
+        encode, time, null = _export_formats[format]
+    except KeyError:
+        raise ValueError("Unknown format %s." % repr(format))
+    fields = ("place", "team", "score", "top_five", "top_seven")
+    lines = []
+    if format == "csv":
+        lines.append(",".join(fields + tuple(str(i) for i in xrange(1, 8))))
+    for team in scores:
+        averages = []
+        for average in (team.top_five, team.top_seven):
+            if average is None:
+                averages.append(null)
+            else:
+                hundredths = _hundredths(average)
+                averages.append(time % (hundredths // 6000,
+                                        hundredths // 100 % 60,
+                                        hundredths % 100))
+        points = [null if runner.points is None else str(runner.points)
+                  for runner in team.finishers]
+        cells = [str(team.place), encode(team.name, encoding),
+                 str(team.score)]
+        cells += averages
+        if format == "csv":
+            points += [null] * (7 - len(points))
+            lines.append(",".join(cells + points))
+        else:
+            lines.append("{%s,\"points\":[%s]}" % (
+                ",".join("\"%s\":%s" % pair for pair in zip(fields, cells)),
+                ",".join(points)))
+    if lines:
+        lines.append("")
+        stream.write("\n".join(lines))
+
+def _json_string(value, encoding):
+    """Quote a string for JSON, decoding it from the given encoding if it is
+    not already unicode."""
+    from json.encoder import encode_basestring_ascii
+    if isinstance(value, str):
+        value = value.decode(encoding, "replace")
+    return encode_basestring_ascii(value)
+
+def _csv_string(value, encoding):
+    """Quote a string for CSV if it needs to be.  It is written in the
+    encoding it was read in."""
+    if _csv_special.search(value) is None:
+        return value
+    return "\"" + value.replace("\"", "\"\"") + "\""
+
+_csv_special = Regex(r"[\",\r\n]")
+
+#For each text format of export(): the function to encode strings, the
+#format of times and the text of a missing value
+_export_formats = {"csv": (_csv_string, "%d:%02d.%02d", ""),
+                   "jsonl": (_json_string, "\"%d:%02d.%02d\"", "null")}
+
+#Interfaces
+
+class IFinisher(object):
+    """Interface representing finishers of a race."""
+    __metaclass__ = ABCMeta
+    __slots__ = ()
+    place = abstractproperty()
+    name = abstractproperty()
+    year = abstractproperty()
+    team = abstractproperty()
+    time = abstractproperty()
+    points = abstractproperty()
+
+class ITeam(object):
+    """Interface representing teams in a race."""
+    __metaclass__ = ABCMeta
+    __slots__ = ()
+    place = abstractproperty()
+    name = abstractproperty()
+    score = abstractproperty()
+    finishers = abstractproperty()
+    top_five = abstractproperty()
+    top_seven = abstractproperty()
+
+#Classes
+
+class Finisher(IFinisher):
+    """Simple implementation of the IFinisher interface."""
+    __slots__ = ["place", "name", "team", "time", "points", "year", "bib"]
+    def __init__(self, name, time, year=None, team=None, place=None,
+                 points=None, bib=None):
+        self.name = name
+        self.year = year
+        self.time = time
+        self.place = place
+        self.team = team
+        self.points = points
+        self.bib = bib
+
+    def __repr__(self):
+        return "Finisher(%s, %s, %s, %s, %s, %s, %s)" % (repr(self.name),
+                                                         repr(self.time),
+                                                         repr(self.year),
+                                                         repr(self.team),
+                                                         repr(self.place),
+                                                         repr(self.points),
+                                                         repr(self.bib))
+
+class LazyFinisher(IFinisher):
+    """Implementation of the IFinisher interface that keeps the match of the
+    line it was parsed from, which holds the line and the spans of its
+    fields.  Each field is only converted, by the parser's cleanup functions,
+    when it is first read, and is remembered thereafter, so reading one or
+    two fields of every finisher costs little more than matching the lines.
+    Fields may be assigned as for a Finisher."""
+    __slots__ = ["match", "parser", "_place", "_name", "_team", "_time",
+                 "_points", "_year", "_bib"]
+
+    def __init__(self, match, parser):
+        self.match = match
+        self.parser = parser
+
+    def __repr__(self):
+        return "Finisher(%s, %s, %s, %s, %s, %s, %s)" % (repr(self.name),
+                                                         repr(self.time),
+                                                         repr(self.year),
+                                                         repr(self.team),
+                                                         repr(self.place),
+                                                         repr(self.points),
+                                                         repr(self.bib))
+
+    @property
+    def line(self):
+        """The line the finisher was parsed from."""
+        return self.match.string
+
+    def decode(self, field):
+        """Convert a field from the line, whether or not it has been read
+        before."""
+        try:
+            value = self.match.group(field)
+        except IndexError:
+            #The field is not in the parser's layout
+            return None
+        if value is None:
+            return None
+        convert = self.parser.cleanup.get(field)
+        if convert is not None:
+            try:
+                value = convert(value)
+            except TypeError:
+                pass
+        return value
+
+    def _field(name):
+        slot = "_" + name
+        def getter(self):
+            value = getattr(self, slot, _undecoded)
+            if value is _undecoded:
+                value = self.decode(name)
+                setattr(self, slot, value)
+            return value
+        def setter(self, value):
+            setattr(self, slot, value)
+        return property(getter, setter)
+
+    place = _field("place")
+    name = _field("name")
+    team = _field("team")
+    time = _field("time")
+    points = _field("points")
+    year = _field("year")
+    bib = _field("bib")
+    del _field
+
+#Marks the fields of a LazyFinisher that have not been read
+_undecoded = object()
+
+class Team(ITeam):
+    """Simple implementation of the ITeam interface, as produced by
+    score()."""
+    __slots__ = ["name", "place", "score", "finishers", "top_five",
+                 "top_seven"]
+
+    def __init__(self, name, place=None, score=None, finishers=(),
+                 top_five=None, top_seven=None):
+        self.name = name
+        self.place = place
+        self.score = score
+        self.finishers = list(finishers)
+        self.top_five = top_five
+        self.top_seven = top_seven
+
+    def __repr__(self):
+        return "Team(%s, %s, %s, %s, %s, %s)" % (repr(self.name),
+                                                 repr(self.place),
+                                                 repr(self.score),
+                                                 repr(self.finishers),
+                                                 repr(self.top_five),
+                                                 repr(self.top_seven))
+
+class Event(object):
+    """One event of a meet: its number and name, as given in its header, and
+    its results, as parsed by load_meet()."""
+    __slots__ = ["number", "name", "results"]
+    #Patterns for the lines of a meet report that are not finishers
+    header = Regex(r"\s*Event\s+(\d+)\s*(.*?)\s*$")
+    border = Regex(r"\s*=+\s*$")
+    team_scores = Regex(r"\s*Team Scores\b")
+    page_header = Regex(r"HY-TEK's")
+
+    def __init__(self, number, name, results):
+        self.number = number
+        self.name = name
+        self.results = results
+
+    def __repr__(self):
+        return "Event(%s, %s, %s)" % (repr(self.number), repr(self.name),
+                                      repr(self.results))
+
+class RaceTime(int):
+    """The time it took for a runner to finish a race.  A RaceTime is a whole
+    number of hundredths of a second, the precision of HyTek results.  It has
+    the days, seconds and microseconds attributes of a datetime.timedelta and
+    behaves like one: it compares, hashes and does arithmetic with RaceTimes
+    and timedeltas, but a bare number is not a time, so adding or comparing
+    one raises a TypeError (and == is False) instead of falling back on
+    int.  Only a float, long or bool on the left of an operator, which take
+    any int before RaceTime is asked, still see the number of hundredths,
+    and a timedelta on the left of a comparison does not know RaceTime.
+    to_superclass converts it to a timedelta for anything else."""
+    __slots__ = ()
+
+    def __new__(cls, seconds):
+        return int.__new__(cls, int(round(seconds * 100)))
+
+    def __repr__(self):
+        return "RaceTime(%d, %d)" % (self.seconds, self.microseconds)
+
+    def __reduce__(self):
+        return (_race_time, (int(self),))
+
+    def __str__(self):
+        hundredths = int(self)
+        if hundredths < 0:
+            return "-" + str(-self)
+        return "%d:%02d.%02d" % (hundredths // 6000, hundredths // 100 % 60,
+                                 hundredths % 100)
+
+    def __eq__(self, other):
+        if isinstance(other, RaceTime):
+            return int(self) == int(other)
+        if isinstance(other, timedelta):
+            return int(self) * 10000 == _microseconds(other)
+        return False
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __lt__(self, other):
+        return self._compare(other) < 0
+
+    def __le__(self, other):
+        return self._compare(other) <= 0
+
+    def __gt__(self, other):
+        return self._compare(other) > 0
+
+    def __ge__(self, other):
+        return self._compare(other) >= 0
+
+    def __hash__(self):
+        #Hash as the equal timedelta does
+        return hash((self.days, self.seconds, self.microseconds))
+
+    def _compare(self, other):
+        if isinstance(other, RaceTime):
+            return cmp(int(self), int(other))
+        if isinstance(other, timedelta):
+            return cmp(int(self) * 10000, _microseconds(other))
+        raise TypeError("Cannot compare a RaceTime with %s." % repr(other))
+
+    def __add__(self, other):
+        if isinstance(other, RaceTime):
+            return _race_time(int(self) + int(other))
+        if isinstance(other, timedelta):
+            return _race_time(int(self) + _hundredths(other))
+        return _unsupported("+", self, other)
+
+    def __radd__(self, other):
+        #Allow sum() without a start value
+        if other == 0 and type(other) in (int, long):
+            return self
+        return self.__add__(other)
+
+    def __sub__(self, other):
+        if isinstance(other, RaceTime):
+            return _race_time(int(self) - int(other))
+        if isinstance(other, timedelta):
+            return _race_time(int(self) - _hundredths(other))
+        return _unsupported("-", self, other)
+
+    def __rsub__(self, other):
+        if isinstance(other, timedelta):
+            return _race_time(_hundredths(other) - int(self))
+        return _unsupported("-", other, self)
+
+    def __mul__(self, other):
+        if isinstance(other, RaceTime) or \
+           not isinstance(other, (int, long, float)):
+            return _unsupported("*", self, other)
+        return _race_time(int(round(int(self) * other)))
+
+    __rmul__ = __mul__
+
+    def __div__(self, other):
+        if isinstance(other, RaceTime):
+            return _unsupported("/", self, other)
+        if isinstance(other, (int, long)):
+            return _race_time(int(self) // other)
+        if isinstance(other, float):
+            return _race_time(int(round(int(self) / other)))
+        return _unsupported("/", self, other)
+
+    __truediv__ = __div__
+
+    def __floordiv__(self, other):
+        if isinstance(other, RaceTime) or not isinstance(other, (int, long)):
+            return _unsupported("//", self, other)
+        return _race_time(int(self) // other)
+
+    def __rdiv__(self, other):
+        return _unsupported("/", other, self)
+
+    __rtruediv__ = __rdiv__
+
+    def __rfloordiv__(self, other):
+        return _unsupported("//", other, self)
+
+    def __mod__(self, other):
+        return _unsupported("%", self, other)
+
+    def __rmod__(self, other):
+        return _unsupported("%", other, self)
+
+    def __divmod__(self, other):
+        return _unsupported("divmod()", self, other)
+
+    def __rdivmod__(self, other):
+        return _unsupported("divmod()", other, self)
+
+    def __pow__(self, other, modulo=None):
+        return _unsupported("**", self, other)
+
+    def __rpow__(self, other):
+        return _unsupported("**", other, self)
+
+    def __lshift__(self, other):
+        return _unsupported("<<", self, other)
+
+    def __rlshift__(self, other):
+        return _unsupported("<<", other, self)
+
+    def __rshift__(self, other):
+        return _unsupported(">>", self, other)
+
+    def __rrshift__(self, other):
+        return _unsupported(">>", other, self)
+
+    def __and__(self, other):
+        return _unsupported("&", self, other)
+
+    def __rand__(self, other):
+        return _unsupported("&", other, self)
+
+    def __or__(self, other):
+        return _unsupported("|", self, other)
+
+    def __ror__(self, other):
+        return _unsupported("|", other, self)
+
+    def __xor__(self, other):
+        return _unsupported("^", self, other)
+
+    def __rxor__(self, other):
+        return _unsupported("^", other, self)
+
+    def __invert__(self):
+        raise TypeError("bad operand type for unary ~: 'RaceTime'")
+
+    def __neg__(self):
+        return _race_time(-int(self))
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return _race_time(abs(int(self)))
+
+    @property
+    def hundredths(self):
+        return int(self)
+
+    @property
+    def days(self):
+        return int(self) // 8640000
+
+    @property
+    def seconds(self):
+        return int(self) // 100 % 86400
+
+    @property
+    def microseconds(self):
+        return int(self) % 100 * 10000
+
+    def total_seconds(self):
+        """The length of the time in seconds."""
+        return int(self) / 100.0
+
+    def to_superclass(self):
+        """Convert the time into a datetime.timedelta."""
+        return timedelta(0, int(self) // 100, int(self) % 100 * 10000)
+
+    @classmethod
+    def from_hundredths(cls, hundredths):
+        """Construct a RaceTime instance from a whole number of hundredths of a
+        second.
+
+        >>> RaceTime.from_hundredths(148480)
+        RaceTime(1484, 800000)"""
+        return int.__new__(cls, hundredths)
+
+    @classmethod
+    def from_string(cls, string):
+        """Construct a RaceTime instance from a string.
+
+        >>> RaceTime.from_string("24:44.8")
+        RaceTime(1484, 800000)"""
+        return int.__new__(cls, _parse_hundredths(string))
+
+    @classmethod
+    def from_superclass(cls, tdobject):
+        """Construct a RaceTime instance from a datetime.timedelta instance.
+
+        >>> RaceTime.from_superclass(datetime.timedelta(0, 24*60+44.8))
+        RaceTime(1484, 800000)"""
+        return int.__new__(cls, _hundredths(tdobject))
+
+    @staticmethod
+    def array_from_strings(strings):
+        """Convert a sequence of time strings, as accepted by from_string, into
+        an array of whole numbers of hundredths of a second."""
+        return array("l", [_parse_hundredths(string) for string in strings])
+
+def _race_time(hundredths):
+    """Construct a RaceTime from a whole number of hundredths of a second."""
+    return int.__new__(RaceTime, hundredths)
+
+def _unsupported(operator, left, right):
+    """Refuse an operation between a RaceTime and something that is not a
+    time.  Returning NotImplemented would let int carry it out instead."""
+    raise TypeError("unsupported operand type(s) for %s: %s and %s" %
+                    (operator, repr(type(left).__name__),
+                     repr(type(right).__name__)))
+
+def _microseconds(tdobject):
+    """The length of a datetime.timedelta in whole microseconds."""
+    return ((tdobject.days * 86400 + tdobject.seconds) * 1000000 +
+            tdobject.microseconds)
+
+def _parse_hundredths(string):
+    """Parse a time of the form [minutes:]seconds[.fraction] into a whole
+    number of hundredths of a second, rounding any digits past the
+    hundredths.  Strings of digits are handled directly; anything else is
+    left to float, as it always was.  A TypeError is raised if the string is
+    not a time."""
+    if not isinstance(string, basestring):
+        raise TypeError("Expected a string, got %s." % repr(string))
+    #The usual minutes:seconds.hundredths
+    if len(string) >= 7 and string[-3] == "." and string[-6] == ":":
+        seconds = string[-5:-3]
+        fraction = string[-2:]
+        if seconds.isdigit() and seconds < "60" and fraction.isdigit():
+            try:
+                return ((int(string[:-6]) * 60 + int(seconds)) * 100 +
+                        int(fraction))
+            except ValueError:
+                pass
+    minutes, colon, seconds = string.rpartition(":")
+    whole, point, fraction = seconds.partition(".")
+    if whole.isdigit() and (not fraction or fraction.isdigit()) and \
+       (not colon or minutes.isdigit()):
+        whole = int(whole)
+        if fraction:
+            scale = 10 ** len(fraction)
+            fraction = (int(fraction) * 200 + scale) // (scale * 2)
+        else:
+            fraction = 0
+        if not colon:
+            return whole * 100 + fraction
+        if whole >= 60:
+            raise TypeError("Too many seconds in %s." % repr(string))
+        return (int(minutes) * 60 + whole) * 100 + fraction
+    try:
+        if ":" not in string:
+            minutes = 0
+            seconds = float(string)
+        else:
+            minutes, seconds = string.split(":")
+            minutes = int(minutes)
+            seconds = float(seconds)
+            if seconds >= 60:
+                raise TypeError("Too many seconds in %s." % repr(string))
+    except ValueError, error:
+        raise TypeError(error)
+    return int(round((minutes * 60 + seconds) * 100))
+
+def _clean_team(team):
+    """Strip the name of a team, interning it so that every finisher of the
+    team shares one string."""
+    return intern(str.strip(team))
+
+class ResultsParser(object):
+    """Parser for the rows of HyTek race results in one column layout.  A line
+    that cannot begin with the first column, or that has no colon when a time
+    is required, is turned away at once.  A line no longer than fast_length
+    is matched against the compiled row pattern, which handles almost every
+    row quickly.  Any other line is split into tokens at runs of whitespace
+    and the tokens are matched to the columns from left to right.  Each
+    column but the team spans at most three tokens, in at most two ways, so
+    however garbled a line is, it is parsed in time linear in its length.
+    When a whole report is parsed and fixed_width is true, the columns of a
+    line longer than fast_length are first cut out at offsets inferred from
+    the long rows before it, and the line is only split into tokens if it
+    does not fit; see _FixedWidth.  A parser
+    should be reused across loads; ResultsParser.for_layout keeps a small
+    least-recently-used cache of parsers for exactly this purpose."""
+    #Building block patterns, which describe the layout in messages
+    first_name = "[A-Z]\w*"
+    last_name = "[A-Z][\w']*(?:[ -][\w']+)?"
+    last_first = last_name + ", " + first_name
+    first_last = first_name + " " + last_name
+    freshman = "F[rR]"
+    sophomore = "S[oOpP]"
+    junior = "J[rR]"
+    senior = "S[rR]"
+    year = "|".join([freshman, sophomore, junior, senior])
+    #Patterns for each of the columns
+    patterns = dict(place="\d+", bib="#?\d+",
+                    year=r"\b(?:" + year + r")\b",
+                    name=last_first + "|" + first_last,
+                    team=r"[A-Z](?:\D*[^\d\s])?",
+                    time="\d+:\d\d(?:\.\d{1,2})", points=r"\d+")
+    #The characters each column can begin with
+    initials = dict(place="0123456789", bib="#0123456789", year="FJS",
+                    name="ABCDEFGHIJKLMNOPQRSTUVWXYZ",
+                    team="ABCDEFGHIJKLMNOPQRSTUVWXYZ", time="0123456789",
+                    points="0123456789")
+    years = frozenset(["FR", "Fr", "SO", "So", "SP", "Sp", "JR", "Jr", "SR",
+                       "Sr"])
+    field_order = ("place", "bib", "name", "year", "team", "time", "points")
+    optional = ("bib", "year", "points")
+    cleanup = {"place": int, "team": _clean_team, "year": intern,
+               "points": int, "time": RaceTime.from_string}
+    #Increment whenever a change to the parser alters the results it gives,
+    #so that results cached by an older version are not reused.
+    version = 3
+    cache_size = 8
+    #The longest line tried against the row pattern before it is split into
+    #tokens.  The pattern backtracks in time that grows with the cube of the
+    #line's length, which stays well under a millisecond up to here.
+    fast_length = 100
+    #Whether to cut the columns out of the long rows of a report at inferred
+    #offsets before splitting them into tokens
+    fixed_width = True
+    _cache = {}
+    _cache_order = []
+    #Patterns for single tokens.  None can backtrack further than the token,
+    #so each takes time linear in the token's length.
+    _separator = Regex(r"(\s+)")
+    _digit = Regex(r"\d")
+    _first_token = Regex(r"[A-Z]\w*$")
+    _last_token = Regex(r"[A-Z][\w']*(-[\w']+)?$")
+    _last_comma_token = Regex(r"[A-Z][\w']*(?:-[\w']+)?,$")
+    _part_token = Regex(r"[\w']+$")
+    _part_comma_token = Regex(r"[\w']+,$")
+    _time_token = Regex(r"\d+:\d\d\.\d\d?$")
+
+    def __init__(self, field_order=None, optional=None):
+        if field_order is None:
+            field_order = ResultsParser.field_order
+        if optional is None:
+            optional = ResultsParser.optional
+        self.field_order = tuple(field_order)
+        self.optional = frozenset(optional)
+        patterns = []
+        self._columns = []
+        for field in self.field_order:
+            try:
+                pattern = "(?P<%s>%s)" % (field, self.patterns[field])
+            except KeyError:
+                raise ValueError("Unknown column %s." % repr(field))
+            #Some fields are optional
+            if field in self.optional:
+                pattern += "?"
+            patterns.append(pattern)
+        self.row = "\s*".join(patterns)
+        #The row pattern is tried first on lines short enough that it cannot
+        #take long, and the position of each of the columns of
+        #ResultsParser.field_order among its groups
+        self._pattern = Regex(r"\s*" + self.row)
+        self._groups = [self.field_order.index(field)
+                        if field in self.field_order else None
+                        for field in ResultsParser.field_order]
+        self._in_order = self.field_order == ResultsParser.field_order
+        #The characters a row can begin with, or None if every column may be
+        #left blank
+        self._initials = self._follow(self.field_order)
+        for i, field in enumerate(self.field_order):
+            self._columns.append((ResultsParser.field_order.index(field),
+                                  getattr(self, "_" + field),
+                                  field in self.optional,
+                                  self._follow(self.field_order[i + 1:])))
+        #Whether the columns after the team can begin with a token that has
+        #no digits in it, and so might take the place of the team's last
+        #words
+        self._team_retreats = False
+        if "team" in self.field_order:
+            follow = self._columns[self.field_order.index("team")][3]
+            self._team_retreats = follow is not None and \
+                                  bool(follow - set("#0123456789"))
+        self._timed = "time" in self.field_order and \
+                      "time" not in self.optional
+        self.converters = [(field, self.cleanup.get(field))
+                           for field in ResultsParser.field_order]
+        self._conversions = [(i, convert)
+                             for i, (field, convert)
+                             in enumerate(self.converters)
+                             if convert is not None]
+
+    def _follow(self, fields):
+        """The characters that can begin the given columns, or None if they
+        may all be left blank."""
+        initials = set()
+        for field in fields:
+            initials.update(self.initials[field])
+            if field not in self.optional:
+                return frozenset(initials)
+        return None
+
+    def __repr__(self):
+        return "ResultsParser(%s, %s)" % (repr(self.field_order),
+                                          repr(tuple(sorted(self.optional))))
+
+    def parse(self, line, line_number=None):
+        """Parse a single line of race results into a Finisher.  If the line
+        does not match the row pattern, a LoadError is raised."""
+        place, bib, name, year, team, time, points = self.parse_values(
+            line, line_number)
+        return Finisher(name, time, year, team, place, points, bib)
+
+    def parse_values(self, line, line_number=None):
+        """Parse a single line of race results into a list of field values,
+        in the order given by ResultsParser.field_order.  Columns missing from
+        this parser's layout are None.  If the line does not match the row
+        pattern, a LoadError is raised."""
+        return self.convert(self.match(line), line, line_number)
+
+    def convert(self, match, line, line_number=None):
+        """Convert the RowMatch of a line into a list of field values, as
+        returned by parse_values, raising a LoadError if there is no match.
+        The values of the match are converted in place."""
+        if match is None:
+            if line_number is None:
+                raise LoadError("\"%s\" does not match /%s/." %
+                                (line, self.row))
+            raise LoadError("Line %d: \"%s\" does not match /%s/." %
+                            (line_number, line, self.row))
+        #Missing values, and fields without a cleanup function, are left
+        #alone without raising and catching a TypeError for each
+        values = match.values
+        for i, convert in self._conversions:
+            value = values[i]
+            if value is not None:
+                try:
+                    values[i] = convert(value)
+                except TypeError:
+                    pass
+                except OverflowError:
+                    raise _too_large(line, line_number)
+        return values
+
+    def row_matcher(self):
+        """Get a function that matches the lines of one report in turn, as
+        match does.  If fixed_width is true, it learns the offsets of the
+        columns from the lines it is given, so it must not be shared between
+        reports."""
+        if self.fixed_width:
+            return _FixedWidth(self).match
+        return self.match
+
+    def match(self, line):
+        """Match a line of race results to the columns of the layout,
+        returning a RowMatch, or None if the line is not a row.  Text after
+        the last column is ignored."""
+        if self._initials is not None and \
+           line.lstrip()[:1] not in self._initials:
+            return None
+        if self._timed and ":" not in line:
+            return None
+        if len(line) <= self.fast_length:
+            match = self._pattern.match(line)
+            if match is not None:
+                groups = match.groups()
+                if self._in_order:
+                    return RowMatch(line, list(groups))
+                return RowMatch(line, [None if i is None else groups[i]
+                                       for i in self._groups])
+        #The parts alternate between tokens and the whitespace between them
+        parts = self._separator.split(line)
+        start = p = 0 if parts[0] else 2
+        count = len(parts)
+        values = [None] * 7
+        #Almost every row is matched by taking the longest match of each
+        #column in turn, which is what the search would try first anyway
+        for index, candidates, optional, follow in self._columns:
+            if p < count and parts[p]:
+                ends = candidates(parts, p)
+                if ends:
+                    end = ends[0]
+                    if end == p + 2:
+                        values[index] = parts[p]
+                    else:
+                        values[index] = "".join(parts[p:end - 1])
+                    p = end
+                    continue
+            if not optional:
+                if not self._match(parts, 0, start, values):
+                    return None
+                break
+        return RowMatch(line, values)
+
+    def _match(self, parts, i, p, values):
+        """Match the columns of the layout from the ith on to the tokens from
+        the pth part on, filling in the text of the columns.  Each column
+        tries its longest match first and an optional column is left blank
+        only if no match will do, as in a regular expression."""
+        if i == len(self._columns):
+            return True
+        index, candidates, optional, follow = self._columns[i]
+        count = len(parts)
+        if p < count and parts[p]:
+            for end in candidates(parts, p):
+                #Skip the matches after which the rest cannot begin
+                if follow is not None and \
+                   (end >= count or parts[end][:1] not in follow):
+                    continue
+                if self._match(parts, i + 1, end, values):
+                    if end == p + 2:
+                        values[index] = parts[p]
+                    else:
+                        values[index] = "".join(parts[p:end - 1])
+                    return True
+        if optional and self._match(parts, i + 1, p, values):
+            values[index] = None
+            return True
+        return False
+
+    #The ways each column can match the tokens from the pth part on, given as
+    #the parts just past the column, longest first.  Places and points have
+    #at most nine digits, so that converting them takes no time to speak of.
+
+    def _place(self, parts, p):
+        token = parts[p]
+        if len(token) <= 9 and token.isdigit():
+            return (p + 2,)
+        return ()
+
+    _points = _place
+
+    def _bib(self, parts, p):
+        token = parts[p]
+        if token.isdigit() or token[0] == "#" and token[1:].isdigit():
+            return (p + 2,)
+        return ()
+
+    def _year(self, parts, p):
+        if parts[p] in self.years:
+            return (p + 2,)
+        return ()
+
+    def _time(self, parts, p):
+        if self._time_token.match(parts[p]):
+            return (p + 2,)
+        return ()
+
+    def _name(self, parts, p):
+        """A name is "Last, First" or "First Last", and the last name may
+        have a second part after a hyphen or a space.  The words of a name
+        are separated by single spaces."""
+        count = len(parts)
+        if p + 2 >= count or parts[p + 1] != " " or not parts[p + 2]:
+            return ()
+        first, second = parts[p], parts[p + 2]
+        third = None
+        if p + 4 < count and parts[p + 3] == " ":
+            third = parts[p + 4]
+        if self._last_comma_token.match(first):
+            if self._first_token.match(second):
+                return (p + 4,)
+            return ()
+        if third and self._part_comma_token.match(second):
+            last = self._last_token.match(first)
+            if last is not None and last.group(1) is None and \
+               self._first_token.match(third):
+                return (p + 6,)
+            return ()
+        if not self._first_token.match(first):
+            return ()
+        last = self._last_token.match(second)
+        if last is None:
+            return ()
+        if third and last.group(1) is None and \
+           self._part_token.match(third):
+            return (p + 6, p + 4)
+        return (p + 4,)
+
+    def _team(self, parts, p):
+        """A team begins with a capital and may run on to the first token
+        with a digit in it."""
+        token = parts[p]
+        if not "A" <= token[0] <= "Z" or self._digit.search(token):
+            return ()
+        digit = self._digit.search
+        count = len(parts)
+        end = p + 2
+        while end < count and parts[end] and not digit(parts[end]):
+            end += 2
+        if self._team_retreats:
+            return xrange(end, p, -2)
+        return (end,)
+
+    def iparse(self, lines, stats=None):
+        """Parse race results to an iterator of Finishers.  The argument may
+        be a string, a buffer, an open file or any other iterable of lines.
+        Blank lines are skipped.  If a Stats instance is supplied, the stages
+        of the parse are measured into it."""
+        values = self.ivalues(lines, stats)
+        if stats is not None:
+            return self._profiled_finishers(values, stats)
+        return (Finisher(name, time, year, team, place, points, bib)
+                for place, bib, name, year, team, time, points in values)
+
+    def ilazy(self, lines, stats=None):
+        """Parse race results to an iterator of LazyFinishers.  Each line is
+        matched as it is read, so a line that cannot be parsed still raises a
+        LoadError, but no field is converted until it is read.  If a Stats
+        instance is supplied, the reading and matching of the lines are
+        measured into it."""
+        lines = _lines(lines)
+        if stats is not None:
+            return self._profiled_lazy(lines, stats)
+        return self._ilazy(lines)
+
+    def _ilazy(self, lines):
+        search = self.row_matcher()
+        for i, line in enumerate(lines):
+            line = line.rstrip("\r\n")
+            if len(line) == 0 or line.isspace():
+                continue
+            match = search(line)
+            if match is None:
+                self.parse_values(line, i + 1)
+            yield LazyFinisher(match, self)
+
+    def _profiled_lazy(self, lines, stats):
+        """Parse as _ilazy does, timing the reading and matching of each
+        line."""
+        timer = default_timer
+        search = self.row_matcher()
+        matching = 0.0
+        count = blank = size = 0
+        stats.start()
+        try:
+            for i, line in enumerate(_timed(iter(lines), stats, "read")):
+                size += len(line)
+                line = line.rstrip("\r\n")
+                if len(line) == 0 or line.isspace():
+                    blank += 1
+                    continue
+                start = timer()
+                match = search(line)
+                matching += timer() - start
+                if match is None:
+                    stats.add("failures")
+                    self.parse_values(line, i + 1)
+                count += 1
+                yield LazyFinisher(match, self)
+        finally:
+            stats.time("match", matching)
+            stats.add("lines", count)
+            stats.add("blank lines", blank)
+            stats.add("bytes", size)
+            stats.stop()
+
+    def ivalues(self, lines, stats=None):
+        """Parse race results to an iterator of field value lists, as returned
+        by parse_values.  Blank lines are skipped.  If a Stats instance is
+        supplied, the stages of the parse are measured into it."""
+        lines = _lines(lines)
+        if stats is not None:
+            return self._profiled_values(lines, stats)
+        return self._ivalues(lines)
+
+    def _ivalues(self, lines):
+        match = self.row_matcher()
+        convert = self.convert
+        for i, line in enumerate(lines):
+            line = line.rstrip("\r\n")
+            if len(line) == 0 or line.isspace():
+                continue
+            values = convert(match(line), line, i + 1)
+            try:
+                yield values
+            except OverflowError:
+                raise _too_large(line, i + 1)
+
+    def _profiled_values(self, lines, stats):
+        """Parse as _ivalues does, timing the reading, matching and
+        conversion of each line separately."""
+        timer = default_timer
+        search = self.row_matcher()
+        stages = ["convert " + field for field, convert in self.converters]
+        conversions = self._conversions
+        times = [0.0] * len(stages)
+        matching = 0.0
+        count = blank = size = 0
+        stats.start()
+        try:
+            for i, line in enumerate(_timed(iter(lines), stats, "read")):
+                size += len(line)
+                line = line.rstrip("\r\n")
+                if len(line) == 0 or line.isspace():
+                    blank += 1
+                    continue
+                start = timer()
+                match = search(line)
+                matching += timer() - start
+                if match is None:
+                    stats.add("failures")
+                    self.parse_values(line, i + 1)
+                count += 1
+                #As in convert, missing values and fields without a cleanup
+                #function are left alone, so their stages stay at nothing
+                values = match.values
+                for j, convert in conversions:
+                    value = values[j]
+                    if value is None:
+                        continue
+                    start = timer()
+                    try:
+                        values[j] = convert(value)
+                    except TypeError:
+                        pass
+                    except OverflowError:
+                        raise _too_large(line, i + 1)
+                    times[j] += timer() - start
+                try:
+                    yield values
+                except OverflowError:
+                    raise _too_large(line, i + 1)
+        finally:
+            stats.time("match", matching)
+            for stage, seconds in zip(stages, times):
+                stats.time(stage, seconds)
+            stats.add("lines", count)
+            stats.add("blank lines", blank)
+            stats.add("bytes", size)
+            stats.stop()
+
+    def _profiled_finishers(self, values, stats):
+        timer = default_timer
+        building = 0.0
+        try:
+            for place, bib, name, year, team, time, points in values:
+                start = timer()
+                finisher = Finisher(name, time, year, team, place, points,
+                                    bib)
+                building += timer() - start
+                yield finisher
+        finally:
+            stats.time("build", building)
+
+    @classmethod
+    def for_layout(cls, field_order=None, optional=None):
+        """Get a parser for the given column layout, reusing a recently
+        compiled one where possible.  The layout is the order in which the
+        columns appear and which of them may be left blank; either defaults to
+        that of a standard HyTek report."""
+        if field_order is None:
+            field_order = cls.field_order
+        if optional is None:
+            optional = cls.optional
+        key = (tuple(field_order), frozenset(optional))
+        parser = cls._cache.get(key)
+        if parser is None:
+            parser = cls(field_order, optional)
+            cls._cache[key] = parser
+        else:
+            cls._cache_order.remove(key)
+        cls._cache_order.append(key)
+        while len(cls._cache_order) > cls.cache_size:
+            del cls._cache[cls._cache_order.pop(0)]
+        return parser
+
+class RowMatch(object):
+    """A row of race results as matched by a ResultsParser: the line and the
+    text of each column, in the order given by ResultsParser.field_order,
+    None for a column left blank or missing from the layout.  Like a regular
+    expression match, the text of a column is read with group, which raises
+    an IndexError for an unknown column."""
+    __slots__ = ["string", "values"]
+
+    def __init__(self, string, values):
+        self.string = string
+        self.values = values
+
+    def __repr__(self):
+        return "<RowMatch of %s>" % repr(self.string)
+
+    def group(self, field):
+        try:
+            return self.values[_field_indexes[field]]
+        except KeyError:
+            raise IndexError("No column %s." % repr(field))
+
+    def groupdict(self):
+        return dict(zip(ResultsParser.field_order, self.values))
+
+#The position of each column in ResultsParser.field_order
+_field_indexes = dict((field, i)
+                      for i, field in enumerate(ResultsParser.field_order))
+
+class _FixedWidth(object):
+    """Matches the rows of one report, which HyTek lays out in columns of
+    fixed width.  A line no longer than the parser's fast_length is left to
+    the compiled row pattern, which matches it faster than its columns can
+    be cut out and checked.  The columns of a longer line are cut out between
+    offsets inferred from the long rows matched so far and checked all at
+    once against a pattern of the columns on their own, which is nearly twice
+    as fast as splitting the line into tokens.  A column is only taken if it
+    is exactly what the tokens would give, so a row that fits gives the same
+    fields as ResultsParser.match; any other line is matched by the parser,
+    and its columns widen the offsets.  Two rows in a row that contradict the
+    offsets, as when the places grow a digit, start them afresh."""
+    __slots__ = ["parser", "fast_length", "fallback", "columns", "pattern",
+                 "spans", "cut", "gaps", "misfits"]
+    #The columns that differ from ResultsParser.patterns: places and points
+    #have at most nine digits, as for the tokens of a long line, and the
+    #team may not run on over the line breaks between the columns
+    patterns = dict(place=r"\d{1,9}", points=r"\d{1,9}",
+                    team=r"[A-Z](?:[^\d\n]*[^\d\s])?")
+
+    def __init__(self, parser):
+        self.parser = parser
+        self.fast_length = parser.fast_length
+        self.fallback = parser.match
+        self.columns = parser.field_order
+        #The columns joined by line breaks.  A blank column must not be
+        #able to begin where the next value does, a team must be followed by
+        #a digit, as it would end there, and a name is never left blank.
+        patterns = []
+        for field in self.columns:
+            pattern = self.patterns.get(field, parser.patterns[field])
+            if field == "team":
+                pattern += r"(?=\n*(?:\d|\Z))"
+            if field in parser.optional and field != "name":
+                pattern = "(?:(%s)|(?!\n*(?:%s)))" % (pattern,
+                                                     parser.patterns[field])
+            else:
+                pattern = "(%s)" % pattern
+            patterns.append(pattern)
+        self.pattern = Regex("\n".join(patterns) + r"\Z")
+        #The earliest start and latest end of each column in the rows fitted
+        #so far, the function that cuts a line into columns and the function
+        #that picks out the characters before each cut, or None until a row
+        #has been matched
+        self.spans = self.cut = self.gaps = None
+        self.misfits = 0
+
+    def match(self, line):
+        if len(line) <= self.fast_length:
+            return self.fallback(line)
+        parser = self.parser
+        if self.cut is not None and isinstance(line, str) and \
+           not "".join(self.gaps(line)).strip():
+            match = self.pattern.match("\n".join(map(str.strip,
+                                                     self.cut(line))))
+            if match is not None:
+                groups = match.groups()
+                if parser._in_order:
+                    return RowMatch(line, list(groups))
+                return RowMatch(line, [None if i is None else groups[i]
+                                       for i in parser._groups])
+        match = self.fallback(line)
+        if match is not None:
+            self._learn(line, match.values)
+        return match
+
+    def _learn(self, line, values):
+        """Widen the offsets of the columns to fit a matched line."""
+        spans = []
+        end = 0
+        for field in self.columns:
+            value = values[_field_indexes[field]]
+            if value is None:
+                spans.append(None)
+            else:
+                start = line.find(value, end)
+                end = start + len(value)
+                spans.append((start, end))
+        if self.spans is not None:
+            merged = []
+            for old, new in zip(self.spans, spans):
+                if old is None or new is None:
+                    merged.append(old or new)
+                else:
+                    merged.append((min(old[0], new[0]), max(old[1], new[1])))
+            if self._fit(merged):
+                self.misfits = 0
+                return
+            self.misfits += 1
+            if self.misfits < 2:
+                return
+        self.misfits = 0
+        if not self._fit(spans):
+            self.spans = self.cut = self.gaps = None
+
+    def _fit(self, spans):
+        """Place the cut between each pair of columns midway across the
+        whitespace that separates them in the rows given by their spans,
+        returning whether there is whitespace to cut at.  A name must be
+        followed by two spaces, so that it cannot run on to the next
+        column."""
+        if len(self.columns) < 2:
+            return False
+        cuts = [0]
+        gaps = []
+        end = 0
+        for i, field in enumerate(self.columns[:-1]):
+            if spans[i] is not None:
+                end = spans[i][1]
+            space = 2 if field == "name" else 1
+            lower = max(cuts[-1], end + space)
+            upper = min([span[0] for span in spans[i + 1:]
+                         if span is not None] or [lower])
+            if lower > upper:
+                return False
+            cut = (lower + upper) // 2
+            cuts.append(cut)
+            gaps.append(slice(cut - space, cut))
+        cuts.append(None)
+        self.spans = spans
+        self.cut = itemgetter(*[slice(start, end)
+                                for start, end in zip(cuts, cuts[1:])])
+        self.gaps = itemgetter(*gaps)
+        return True
+
+class ResultSet(object):
+    """Column-oriented container of race results.  Places, points and times
+    (in hundredths of a second) are kept in compact integer arrays and the
+    string columns are dictionary-encoded, so no object is created per
+    finisher.  Indexing or iterating over a result set hands out lightweight
+    IFinisher views onto its rows; sorting, filtering and aggregation work
+    directly on the columns.  Lookups by the value of a column go through a
+    hash index of the column, built the first time it is needed and kept up
+    to date as finishers are added; names, bib numbers and years are looked
+    up in a normalized form, so that "Dickman, Karl" is found as "Karl
+    Dickman" and bib "#278" as 278."""
+    fields = ResultsParser.field_order
+    normalizers = {"name": normalize_name, "bib": _normalize_bib,
+                   "time": _normalize_time, "year": _normalize_year}
+    #The binary format: magic number, format version, integer size, byte
+    #order and row count, then each column in turn
+    magic = "HYTC"
+    format_version = 1
+    header = "<4sHBBL"
+
+    def __init__(self, finishers=()):
+        self.columns = dict(place=_IntegerColumn(), bib=_StringColumn(),
+                            name=_StringColumn(), year=_StringColumn(),
+                            team=_StringColumn(), time=_TimeColumn(),
+                            points=_IntegerColumn())
+        self._indexes = {}
+        self.extend(finishers)
+
+    def __len__(self):
+        return len(self.columns["place"])
+
+    def __iter__(self):
+        for i in xrange(len(self)):
+            yield ResultRow(self, i)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.take(xrange(*index.indices(len(self))))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("ResultSet index out of range")
+        return ResultRow(self, index)
+
+    def __repr__(self):
+        return "<ResultSet of %d finishers>" % len(self)
+
+    def append(self, finisher):
+        """Add an IFinisher to the end of the result set."""
+        self.append_values([getattr(finisher, field, None)
+                            for field in self.fields])
+
+    def append_values(self, values):
+        """Add a finisher, given as a sequence of field values in the order of
+        ResultSet.fields, to the end of the result set.  If a number is too
+        large to store, an OverflowError is raised and nothing is added."""
+        columns = self.columns
+        length = len(self)
+        try:
+            for field, value in zip(self.fields, values):
+                columns[field].append(value)
+        except OverflowError:
+            #Take back the values already added, so that the columns stay the
+            #same length
+            for column in columns.itervalues():
+                if len(column) > length:
+                    column.pop()
+            raise
+        if self._indexes:
+            row = len(self) - 1
+            for field, (column, index) in self._indexes.iteritems():
+                if column is columns[field]:
+                    key = self._key(field, column[row])
+                    index.setdefault(key, []).append(row)
+
+    def extend(self, finishers):
+        """Add each of the given IFinishers to the end of the result set."""
+        for finisher in finishers:
+            self.append(finisher)
+
+    def column(self, field):
+        """Get a list of the decoded values of a column."""
+        column = self.columns[field]
+        return [column[i] for i in xrange(len(column))]
+
+    def irows(self, fields):
+        """Yield the values of the given columns for each finisher, as
+        lists."""
+        columns = [self.columns[field] for field in fields]
+        for i in xrange(len(self)):
+            yield [column[i] for column in columns]
+
+    def argsort(self, field, reverse=False):
+        """Get the indices of the finishers sorted by the given column.
+        Missing values sort first."""
+        return sorted(xrange(len(self)), key=self.columns[field].sort_key,
+                      reverse=reverse)
+
+    def sort(self, field, reverse=False):
+        """Get a new ResultSet sorted by the given column."""
+        return self.take(self.argsort(field, reverse))
+
+    def index(self, field):
+        """Get the hash index of a column: a dictionary mapping each value,
+        normalized for lookup, to the ascending list of indices of the
+        finishers with that value.  The index is built on first use and kept
+        up to date as finishers are added, so it must not be modified."""
+        column = self.columns[field]
+        indexed = self._indexes.get(field)
+        if indexed is not None and indexed[0] is column:
+            return indexed[1]
+        normalize = self.normalizers.get(field)
+        index = {}
+        if isinstance(column, _StringColumn):
+            #Visit each distinct value once rather than once per finisher
+            keys = column.values
+            if normalize is not None:
+                keys = [normalize(value) for value in keys]
+            rows = [index.setdefault(key, []) for key in keys]
+            for i, code in enumerate(column.codes):
+                if code < 0:
+                    index.setdefault(None, []).append(i)
+                else:
+                    rows[code].append(i)
+        else:
+            for i in xrange(len(column)):
+                index.setdefault(self._key(field, column[i]), []).append(i)
+        self._indexes[field] = (column, index)
+        return index
+
+    def where(self, field, value):
+        """Get the indices of the finishers whose column has the given
+        value."""
+        return list(self.index(field).get(self._key(field, value), ()))
+
+    def lookup(self, field, value):
+        """Get the first finisher whose column has the given value, or None
+        if there is none."""
+        rows = self.index(field).get(self._key(field, value))
+        if not rows:
+            return None
+        return ResultRow(self, rows[0])
+
+    def group(self, field, value):
+        """Get a view of the finishers whose column has the given value.  The
+        view stays up to date as finishers are added to the result set."""
+        return ResultGroup(self, field, self._key(field, value))
+
+    def filter(self, field, value):
+        """Get a new ResultSet of the finishers whose column has the given
+        value."""
+        return self.take(self.where(field, value))
+
+    def groups(self, field):
+        """Group the finishers by a column.  Returns a dictionary mapping each
+        value, normalized for lookup, to the ascending list of indices of its
+        finishers."""
+        return dict((key, list(rows))
+                    for key, rows in self.index(field).iteritems() if rows)
+
+    def take(self, indices):
+        """Get a new ResultSet of the finishers at the given indices."""
+        results = ResultSet()
+        for field, column in self.columns.iteritems():
+            results.columns[field] = column.take(indices)
+        return results
+
+    def sum(self, field, indices=None):
+        """Total a numeric column, skipping missing values.  Only the given
+        indices are included if any are supplied."""
+        return self.columns[field].sum(indices)
+
+    def mean(self, field, indices=None):
+        """Average a numeric column, skipping missing values, or None if
+        there are no values.  Only the given indices are included if any are
+        supplied."""
+        return self.columns[field].mean(indices)
+
+    def encode(self):
+        """Encode the result set in a compact binary format, returned as a
+        list of strings to be written one after the other.  Each column is
+        written in turn: integer columns as arrays of machine integers and
+        string columns as an array of codes followed by a table of the
+        distinct strings.  Unicode strings are encoded as UTF-8."""
+        chunks = [pack(self.header, self.magic, self.format_version,
+                       array("l").itemsize, byteorder == "big", len(self))]
+        for field in self.fields:
+            column = self.columns[field]
+            if isinstance(column, _StringColumn):
+                values = [value.encode("utf-8")
+                          if isinstance(value, unicode) else value
+                          for value in column.values]
+                offsets = array("l", [0])
+                for value in values:
+                    offsets.append(offsets[-1] + len(value))
+                chunks.append(column.codes.tostring())
+                chunks.append(array("l", [len(values)]).tostring())
+                chunks.append(offsets.tostring())
+                chunks.extend(values)
+            else:
+                chunks.append(column.data.tostring())
+        return chunks
+
+    @classmethod
+    def decode(cls, data):
+        """Decode a result set from a string, or a buffer such as an mmap,
+        written by encode.  A ValueError is raised if the data is not an
+        encoded result set or was written on a platform with a different
+        integer size or byte order."""
+        if len(data) < calcsize(cls.header):
+            raise ValueError("Encoded results truncated.")
+        magic, version, size, big, length = unpack_from(cls.header, data)
+        if magic != cls.magic or version != cls.format_version:
+            raise ValueError("Not an encoded result set.")
+        if size != array("l").itemsize or big != (byteorder == "big"):
+            raise ValueError("Results encoded on another platform.")
+        position = calcsize(cls.header)
+        results = cls()
+        for field in cls.fields:
+            column = results.columns[field]
+            if isinstance(column, _StringColumn):
+                column.codes, position = _read_array(data, position, length)
+                (count,), position = _read_array(data, position, 1)
+                offsets, position = _read_array(data, position, count + 1)
+                end = position + offsets[-1]
+                if end > len(data):
+                    raise ValueError("Encoded results truncated.")
+                column.values = [data[position + start:position + stop]
+                                 for start, stop in zip(offsets, offsets[1:])]
+                column.lookup = dict(zip(column.values, xrange(count)))
+                position = end
+            else:
+                column.data, position = _read_array(data, position, length)
+        if position != len(data):
+            raise ValueError("Encoded results have trailing data.")
+        return results
+
+    def _key(self, field, value):
+        normalize = self.normalizers.get(field)
+        if normalize is None:
+            return value
+        return normalize(value)
+
+def _read_array(data, position, count):
+    """Read an array of count machine integers from the data at the given
+    position, returning it and the position after it."""
+    end = position + count * array("l").itemsize
+    if end > len(data):
+        raise ValueError("Encoded results truncated.")
+    return array("l", data[position:end]), end
+
+class ResultRow(IFinisher):
+    """A view of one finisher in a ResultSet.  Fields are read from the
+    result set's columns when they are accessed.  Points may also be set, as
+    score does, which writes them to the result set's points column."""
+    __slots__ = ["results", "index"]
+
+    def __init__(self, results, index):
+        self.results = results
+        self.index = index
+
+    def __repr__(self):
+        return "Finisher(%s, %s, %s, %s, %s, %s, %s)" % (repr(self.name),
+                                                         repr(self.time),
+                                                         repr(self.year),
+                                                         repr(self.team),
+                                                         repr(self.place),
+                                                         repr(self.points),
+                                                         repr(self.bib))
+
+    def _field(name):
+        def getter(self):
+            return self.results.columns[name][self.index]
+        return property(getter)
+
+    place = _field("place")
+    bib = _field("bib")
+    name = _field("name")
+    year = _field("year")
+    team = _field("team")
+    time = _field("time")
+    points = _field("points")
+    del _field
+
+    @points.setter
+    def points(self, points):
+        results = self.results
+        column = results.columns["points"]
+        column.data[self.index] = column.encode(points)
+        #The points index no longer matches the column
+        results._indexes.pop("points", None)
+
+class ResultGroup(object):
+    """A view of the finishers in a ResultSet that share the value of a
+    column, as returned by ResultSet.group.  It reads the result set's index
+    whenever it is used, so finishers added to the result set later appear in
+    the view."""
+    __slots__ = ["results", "field", "key"]
+
+    def __init__(self, results, field, key):
+        self.results = results
+        self.field = field
+        self.key = key
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        results = self.results
+        for i in self.rows:
+            yield ResultRow(results, i)
+
+    def __getitem__(self, index):
+        return ResultRow(self.results, self.rows[index])
+
+    def __repr__(self):
+        return "<ResultGroup of %d finishers>" % len(self)
+
+    @property
+    def rows(self):
+        """The ascending indices of the finishers in the view."""
+        return self.results.index(self.field).get(self.key, ())
+
+class _IntegerColumn(object):
+    """Column of non-negative integers stored in an array, with missing values
+    stored as -1."""
+    __slots__ = ["data"]
+
+    def __init__(self, data=None):
+        if data is None:
+            data = array("l")
+        self.data = data
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, index):
+        value = self.data[index]
+        if value < 0:
+            return None
+        return value
+
+    def append(self, value):
+        self.data.append(self.encode(value))
+
+    def pop(self):
+        self.data.pop()
+
+    def encode(self, value):
+        if value is None:
+            return -1
+        return value
+
+    def sort_key(self, index):
+        return self.data[index]
+
+    def take(self, indices):
+        data = self.data
+        return type(self)(array("l", [data[i] for i in indices]))
+
+    def sum(self, indices=None):
+        data = self.data
+        if indices is not None:
+            data = [data[i] for i in indices]
+        return sum(value for value in data if value >= 0)
+
+    def mean(self, indices=None):
+        data = self.data
+        if indices is not None:
+            data = [data[i] for i in indices]
+        values = [value for value in data if value >= 0]
+        if not values:
+            return None
+        return float(sum(values)) / len(values)
+
+class _TimeColumn(_IntegerColumn):
+    """Column of RaceTimes stored as integer hundredths of a second."""
+    __slots__ = []
+
+    def __getitem__(self, index):
+        value = self.data[index]
+        if value < 0:
+            return None
+        return _race_time(value)
+
+    def encode(self, value):
+        if value is None:
+            return -1
+        if isinstance(value, basestring):
+            return _parse_hundredths(value)
+        return _hundredths(value)
+
+    def sum(self, indices=None):
+        return _race_time(super(_TimeColumn, self).sum(indices))
+
+    def mean(self, indices=None):
+        mean = super(_TimeColumn, self).mean(indices)
+        if mean is None:
+            return None
+        return _race_time(int(round(mean)))
+
+class _StringColumn(object):
+    """Dictionary-encoded column of strings.  Each distinct string is stored
+    once and rows hold its integer code, or -1 where the value is missing."""
+    __slots__ = ["codes", "values", "lookup"]
+
+    def __init__(self):
+        self.codes = array("l")
+        self.values = []
+        self.lookup = {}
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        code = self.codes[index]
+        if code < 0:
+            return None
+        return self.values[code]
+
+    def append(self, value):
+        self.codes.append(self.encode(value))
+
+    def pop(self):
+        self.codes.pop()
+
+    def encode(self, value):
+        if value is None:
+            return -1
+        code = self.lookup.get(value)
+        if code is None:
+            code = self.lookup[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def sort_key(self, index):
+        code = self.codes[index]
+        if code < 0:
+            return ""
+        return self.values[code]
+
+    def take(self, indices):
+        column = _StringColumn()
+        for i in indices:
+            column.append(self[i])
+        return column
+
+class Stats(object):
+    """Counters and timings of the stages of loading and dumping race
+    results, collected whenever a Stats instance is passed to load(),
+    iload(), dump(), idump() or dump_to(); without one, nothing is measured
+    and nothing is slowed down.  Timings are in seconds, by stage: "read",
+    "match", "convert" followed by a field, "build", "format results" and
+    "format scores".  Counts are of "lines" parsed, "blank lines",
+    "failures" to match, "bytes" read, "report lines" and "report bytes"
+    written, and "cache hits" and "cache misses".  The callback, if given, is
+    called with the stats each time a load or dump finishes.  If profile is
+    true, loads and dumps are also run under cProfile; because loads and
+    dumps may be iterators, the profile includes whatever their caller does
+    while iterating over them."""
+
+    def __init__(self, callback=None, profile=False):
+        self.callback = callback
+        self.times = {}
+        self.counts = {}
+        if profile:
+            from cProfile import Profile
+            self.profiler = Profile()
+        else:
+            self.profiler = None
+
+    def __repr__(self):
+        lines = self.counts.get("lines", 0)
+        seconds = sum(self.times.itervalues())
+        return "<Stats of %d lines in %.3f seconds>" % (lines, seconds)
+
+    def add(self, counter, amount=1):
+        """Add to one of the counts."""
+        self.counts[counter] = self.counts.get(counter, 0) + amount
+
+    def time(self, stage, seconds):
+        """Add to the time taken by one of the stages."""
+        self.times[stage] = self.times.get(stage, 0.0) + seconds
+
+    def throughput(self):
+        """Get the number of lines parsed per second spent parsing, or None if
+        no time has been spent parsing."""
+        parsing = sum(seconds for stage, seconds in self.times.iteritems()
+                      if not stage.startswith("format"))
+        if parsing <= 0:
+            return None
+        return self.counts.get("lines", 0) / parsing
+
+    def to_dict(self):
+        """Get the counts, timings and throughput as a dictionary."""
+        return dict(counts=dict(self.counts), times=dict(self.times),
+                    throughput=self.throughput())
+
+    def to_json(self, stream=None):
+        """Export the stats as JSON, written to the stream if one is given
+        and returned as a string otherwise."""
+        from json import dump, dumps
+        if stream is None:
+            return dumps(self.to_dict(), sort_keys=True)
+        dump(self.to_dict(), stream, sort_keys=True)
+
+    def dump_profile(self, path):
+        """Write the cProfile statistics to a file, to be read with the
+        pstats module."""
+        if self.profiler is None:
+            raise ValueError("Profiling was not requested.")
+        self.profiler.dump_stats(path)
+
+    def start(self):
+        """Called when a load or dump starts."""
+        if self.profiler is not None:
+            self.profiler.enable()
+
+    def stop(self):
+        """Called when a load or dump finishes."""
+        if self.profiler is not None:
+            self.profiler.disable()
+        if self.callback is not None:
+            self.callback(self)
+
+class ResultsCache(object):
+    """On-disk cache of parsed race results.  Entries are keyed by a hash of
+    the contents of a file together with the version and layout of the parser
+    that read it, so a file is parsed again whenever either changes.  Each
+    entry is stored in a compact binary format, fixed-width integer columns
+    plus a table of strings for each string column, as written by
+    ResultSet.encode, which is memory-mapped and read straight back into a
+    ResultSet.  When the entries take up more than max_size bytes, the least
+    recently used are evicted."""
+    extension = ".hytc"
+
+    def __init__(self, directory, max_size=64 * 1024 * 1024):
+        self.directory = directory
+        self.max_size = max_size
+
+    def __repr__(self):
+        return "ResultsCache(%s, %d)" % (repr(self.directory), self.max_size)
+
+    def load(self, path, parser=None, columnar=False, stats=None):
+        """Load a file of HyTek race results, reading them from the cache if
+        the file's contents have been parsed before and parsing and caching
+        them otherwise.  The results are returned as by load(); a Stats
+        instance, if supplied, counts the cache hits and misses and measures
+        any parsing."""
+        if parser is None:
+            parser = ResultsParser.for_layout()
+        stream = open(path, "rb")
+        try:
+            contents = stream.read()
+        finally:
+            stream.close()
+        key = self.key(contents, parser)
+        results = self.get(key)
+        if results is None:
+            results = load(contents, parser, columnar=True, stats=stats)
+            self.put(key, results)
+            if stats is not None:
+                stats.add("cache misses")
+        elif stats is not None:
+            stats.add("cache hits")
+        if columnar:
+            return results
+        return [Finisher(name, time, year, team, place, points, bib)
+                for place, bib, name, year, team, time, points
+                in results.irows(ResultSet.fields)]
+
+    def key(self, contents, parser):
+        """Get the key under which the results of parsing the given contents
+        with the given parser are cached."""
+        from hashlib import sha1
+        digest = sha1("%d\n%d\n%s\n" % (ResultSet.format_version,
+                                        parser.version, parser.row))
+        digest.update(contents)
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Get the cached ResultSet with the given key, or None if there is
+        none.  An entry that cannot be read, because it is damaged or was
+        written on a different platform, is discarded."""
+        from mmap import mmap, ACCESS_READ
+        path = self._path(key)
+        try:
+            stream = open(path, "rb")
+        except IOError:
+            return None
+        try:
+            try:
+                data = mmap(stream.fileno(), 0, access=ACCESS_READ)
+                try:
+                    results = ResultSet.decode(data)
+                finally:
+                    data.close()
+            except (EnvironmentError, StructError, ValueError):
+                results = None
+        finally:
+            stream.close()
+        if results is None:
+            self._remove(path)
+            return None
+        #Mark the entry as recently used
+        try:
+            utime(path, None)
+        except OSError:
+            pass
+        return results
+
+    def put(self, key, results):
+        """Store a ResultSet in the cache under the given key, then evict
+        entries as necessary to keep within the size limit."""
+        from tempfile import mkstemp
+        try:
+            makedirs(self.directory)
+        except OSError, error:
+            if error.errno != EEXIST:
+                raise
+        #Write to a temporary file first so that no process ever sees a
+        #partly written entry
+        descriptor, temporary = mkstemp(".tmp", dir=self.directory)
+        stream = fdopen(descriptor, "wb")
+        try:
+            try:
+                stream.writelines(results.encode())
+            finally:
+                stream.close()
+            rename(temporary, self._path(key))
+        except:
+            self._remove(temporary)
+            raise
+        self.evict()
+
+    def evict(self):
+        """Remove the least recently used entries until the total size of
+        the cache is within its limit."""
+        entries = []
+        total = 0
+        try:
+            names = listdir(self.directory)
+        except OSError:
+            return
+        for name in names:
+            if not name.endswith(self.extension):
+                continue
+            path = join(self.directory, name)
+            try:
+                status = stat(path)
+            except OSError:
+                continue
+            entries.append((status.st_mtime, path, status.st_size))
+            total += status.st_size
+        entries.sort()
+        for used, path, size in entries:
+            if total <= self.max_size:
+                break
+            self._remove(path)
+            total -= size
+
+    def clear(self):
+        """Remove every entry from the cache."""
+        try:
+            names = listdir(self.directory)
+        except OSError:
+            return
+        for name in names:
+            if name.endswith(self.extension):
+                self._remove(join(self.directory, name))
+
+    def _path(self, key):
+        return join(self.directory, key + self.extension)
+
+    def _remove(self, path):
+        try:
+            remove(path)
+        except OSError:
+            pass
+
+class AthleteIndex(object):
+    """Index of athletes across many meets, joining the finishers of each
+    meet to the athletes already seen.  A finisher is the same athlete as one
+    already indexed if the team and name match once normalized, with any
+    aliases of the team resolved, so "Reynolds, Francis" of "Puget Sound"
+    matches "Francis Reynolds" of "Univ. of Puget Sound" given the alias.
+    Failing an exact match, athletes are blocked by team, last name and first
+    initial, and a finisher is matched within its block to an athlete whose
+    first name begins with the finisher's or vice versa, as "Matt" and
+    "Matthew" do; no athlete is matched twice in one meet.  Every lookup is a
+    hash on a small key, so indexing takes time linear in the number of
+    finishers.  Athletes who change teams are indexed separately."""
+
+    def __init__(self, aliases=None):
+        """The aliases, if given, are a dictionary mapping other names of
+        teams to their canonical names."""
+        self.aliases = {}
+        if aliases is not None:
+            for alias, team in aliases.iteritems():
+                self.aliases[normalize_team(alias)] = team
+        self.athletes = []
+        self._exact = {}
+        self._blocks = {}
+        self._names = {}
+        self._teams = {}
+
+    def __len__(self):
+        return len(self.athletes)
+
+    def __iter__(self):
+        return iter(self.athletes)
+
+    def __repr__(self):
+        return "<AthleteIndex of %d athletes>" % len(self)
+
+    def add(self, meet, results):
+        """Add the finishers of a meet to the index.  The meet may be any
+        hashable label, such as the path of its results file or its date, and
+        the results any iterable of IFinishers."""
+        if isinstance(results, ResultSet):
+            #Read the columns directly rather than through a view per row
+            fields = ("name", "team", "year", "place", "time", "points")
+            for values in results.irows(fields):
+                self._add(meet, *values)
+        else:
+            for finisher in results:
+                self.add_finisher(meet, finisher)
+
+    def add_meets(self, meets):
+        """Add many meets to the index, given as (meet, results) pairs such
+        as those yielded by load_many()."""
+        for meet, results in meets:
+            self.add(meet, results)
+
+    def add_finisher(self, meet, finisher):
+        """Add one finisher in a meet to the index, returning the Athlete to
+        whose history the performance was added."""
+        return self._add(meet, finisher.name, finisher.team, finisher.year,
+                         finisher.place, finisher.time, finisher.points)
+
+    def find(self, name, team=None):
+        """Get the athletes who have competed under the given name, in
+        either form, and for the given team if one is supplied."""
+        athletes = self._names.get(normalize_name(name), [])
+        if team is not None:
+            team_key = self._team(team)[1]
+            athletes = [athlete for athlete in athletes
+                        if self._team(athlete.team)[1] == team_key]
+        return list(athletes)
+
+    def team(self, team):
+        """Get the canonical name of a team."""
+        return self._team(team)[0]
+
+    def _add(self, meet, name, team, year, place, time, points):
+        raw_team = team
+        team, team_key = self._team(team)
+        name_key = normalize_name(name)
+        exact = (team_key, name_key)
+        athlete = self._exact.get(exact)
+        if athlete is None or meet in athlete.meets:
+            athlete = self._match(team_key, name_key, meet)
+        if athlete is None:
+            athlete = Athlete(_first_last(name), team)
+            self.athletes.append(athlete)
+            first, last = _split_name(name_key)
+            block = self._blocks.setdefault((team_key, last, first[:1]), [])
+            block.append((first, athlete))
+        self._exact.setdefault(exact, athlete)
+        named = self._names.setdefault(name_key, [])
+        if athlete not in named:
+            named.append(athlete)
+        athlete.meets.add(meet)
+        athlete.history.append(Performance(meet, name, raw_team, year, place,
+                                           time, points))
+        return athlete
+
+    def _team(self, team):
+        """Get the canonical name of a team and its normalized form.  Teams
+        are few, so both are remembered for each name seen."""
+        canonical = self._teams.get(team)
+        if canonical is None:
+            name = self.aliases.get(normalize_team(team), team)
+            canonical = self._teams[team] = (name, normalize_team(name))
+        return canonical
+
+    def _match(self, team_key, name_key, meet):
+        first, last = _split_name(name_key)
+        for other, athlete in self._blocks.get((team_key, last, first[:1]),
+                                               ()):
+            if meet not in athlete.meets and \
+               (first.startswith(other) or other.startswith(first)):
+                return athlete
+        return None
+
+def _split_name(name_key):
+    """Split a normalized name into the first name and the rest."""
+    first, space, last = name_key.partition(" ")
+    return first, last
+
+def _first_last(name):
+    """Put a name given in either form into the form "First Last"."""
+    last, comma, first = name.partition(",")
+    if comma:
+        return first.strip() + " " + last.strip()
+    return name
+
+class Athlete(object):
+    """One athlete as identified across meets by an AthleteIndex: the name,
+    in the form "First Last", and the team under which the athlete was first
+    seen, and the athlete's performances in the order they were added."""
+    __slots__ = ["name", "team", "history", "meets"]
+
+    def __init__(self, name, team):
+        self.name = name
+        self.team = team
+        self.history = []
+        self.meets = set()
+
+    def __repr__(self):
+        return "<Athlete %s of %s, %d performances>" % (self.name, self.team,
+                                                        len(self.history))
+
+class Performance(object):
+    """One performance in the history of an Athlete: the meet, the name and
+    team as they appeared in its results, and the finisher's year, place,
+    time and points."""
+    __slots__ = ["meet", "name", "team", "year", "place", "time", "points"]
+
+    def __init__(self, meet, name, team, year, place, time, points):
+        self.meet = meet
+        self.name = name
+        self.team = team
+        self.year = year
+        self.place = place
+        self.time = time
+        self.points = points
+
+    def __repr__(self):
+        return "Performance(%s, %s, %s, %s, %s, %s, %s)" % (repr(self.meet),
+                                                            repr(self.name),
+                                                            repr(self.team),
+                                                            repr(self.year),
+                                                            repr(self.place),
+                                                            repr(self.time),
+                                                            repr(self.points))
+
+class LiveRace(object):
+    """Race results that are scored as the finishers come in.  Finishers are
+    added one at a time in order of finish, and corrections can be made by
+    disqualifying a finisher or swapping two of them.  Places and points are
+    kept implicitly, as counts over the finish order held in Fenwick trees,
+    and each team keeps its finishers in order, so every update takes time
+    roughly logarithmic in the size of the field.  The current results and
+    team scores can be produced, or dumped to a report, at any time."""
+
+    def __init__(self, scoring=5, displacing=7):
+        self.scoring = scoring
+        self.displacing = displacing
+        #Finishers and times by the order in which they were recorded
+        self.runners = []
+        self.times = []
+        self.present = _FenwickTree()
+        self.eligible = _FenwickTree()
+        #The recorded positions of each team's finishers, and those of them
+        #that have been awarded points
+        self.members = {}
+        self.awarded = {}
+
+    def __len__(self):
+        return self.present.total
+
+    def add_finisher(self, finisher):
+        """Record the next IFinisher across the line, returning its place.
+        Its time, name, year, team and bib are used; its place and points are
+        those of the race."""
+        slot = len(self.runners)
+        self.runners.append(finisher)
+        self.times.append(finisher.time)
+        self.present.add(slot, 1)
+        self.eligible.add(slot, 0)
+        self._join(finisher.team, slot)
+        return self.present.total
+
+    def disqualify(self, place):
+        """Remove the finisher in the given place from the race, moving
+        everyone behind them up a place.  Returns the finisher removed."""
+        slot = self._slot(place)
+        finisher = self.runners[slot]
+        self.runners[slot] = None
+        self.present.add(slot, -1)
+        self._leave(finisher.team, slot)
+        return finisher
+
+    def swap(self, first, second):
+        """Exchange the finishers in two places, as when their finish cards
+        were taken out of order.  The times stay with the places."""
+        first, second = self._slot(first), self._slot(second)
+        if first == second:
+            return
+        runners = self.runners
+        self._leave(runners[first].team, first)
+        self._leave(runners[second].team, second)
+        runners[first], runners[second] = runners[second], runners[first]
+        self._join(runners[first].team, first)
+        self._join(runners[second].team, second)
+
+    def results(self):
+        """Get the current results as a list of Finishers in order of
+        finish."""
+        results = []
+        eligible = self.eligible
+        for slot, runner in enumerate(self.runners):
+            if runner is None:
+                continue
+            if eligible.get(slot):
+                points = eligible.prefix(slot + 1)
+            else:
+                points = None
+            results.append(Finisher(runner.name, self.times[slot],
+                                    runner.year, runner.team,
+                                    len(results) + 1, points,
+                                    getattr(runner, "bib", None)))
+        return results
+
+    def scores(self):
+        """Get the current team scores as a list of Teams in order of
+        finish."""
+        teams = []
+        for team, slots in self.awarded.iteritems():
+            if not slots:
+                continue
+            finishers = [self._finisher(slot) for slot in slots]
+            teams.append((team, [runner.points for runner in finishers],
+                          [-1 if runner.time is None
+                           else _hundredths(runner.time)
+                           for runner in finishers],
+                          finishers))
+        return _rank(teams, self.scoring, self.eligible.total + 1)
+
+    def dump(self, distance=None):
+        """Dump the current results and team scores to a string."""
+        return dump(self.results(), self.scores(), distance)
+
+    def _finisher(self, slot):
+        runner = self.runners[slot]
+        points = None
+        if self.eligible.get(slot):
+            points = self.eligible.prefix(slot + 1)
+        return Finisher(runner.name, self.times[slot], runner.year,
+                        runner.team, self.present.prefix(slot + 1), points,
+                        getattr(runner, "bib", None))
+
+    def _slot(self, place):
+        if not 1 <= place <= self.present.total:
+            raise IndexError("No finisher in place %s." % repr(place))
+        return self.present.find(place)
+
+    def _join(self, team, slot):
+        if team is None:
+            return
+        insort(self.members.setdefault(team, []), slot)
+        self._award(team)
+
+    def _leave(self, team, slot):
+        if team is None:
+            return
+        self.members[team].remove(slot)
+        self._award(team)
+
+    def _award(self, team):
+        """Bring the team's points into line with its finishers: a complete
+        team's first finishers, up to the number of displacing places, are
+        awarded points and nobody else is."""
+        members = self.members[team]
+        if len(members) >= self.scoring:
+            awarded = members[:self.displacing]
+        else:
+            awarded = []
+        previous = self.awarded.get(team, [])
+        if awarded == previous:
+            return
+        for slot in previous:
+            self.eligible.add(slot, -1)
+        for slot in awarded:
+            self.eligible.add(slot, 1)
+        self.awarded[team] = awarded
+
+class _FenwickTree(object):
+    """Binary indexed tree of integer counts, supporting updates, prefix sums
+    and searches by prefix sum in logarithmic time.  It grows as positions
+    are added."""
+    __slots__ = ["tree", "values", "total"]
+
+    def __init__(self):
+        self.tree = [0]
+        self.values = []
+        self.total = 0
+
+    def add(self, index, delta):
+        """Add delta to the count at index, which may be one past the last
+        position."""
+        if index == len(self.values):
+            self.values.append(0)
+            if len(self.values) >= len(self.tree):
+                self._grow()
+        self.values[index] += delta
+        self.total += delta
+        tree = self.tree
+        index += 1
+        while index < len(tree):
+            tree[index] += delta
+            index += index & -index
+
+    def get(self, index):
+        """Get the count at index."""
+        return self.values[index]
+
+    def prefix(self, end):
+        """Sum the counts of the positions before end."""
+        tree = self.tree
+        total = 0
+        while end > 0:
+            total += tree[end]
+            end -= end & -end
+        return total
+
+    def find(self, count):
+        """Find the first position at which the prefix sum, including that
+        position, reaches count.  The counts must not be negative."""
+        tree = self.tree
+        index = 0
+        step = 1
+        while step * 2 < len(tree):
+            step *= 2
+        while step:
+            if index + step < len(tree) and tree[index + step] < count:
+                index += step
+                count -= tree[index]
+            step //= 2
+        return index
+
+    def _grow(self):
+        size = len(self.tree) * 2
+        tree = [0] * size
+        for i, value in enumerate(self.values):
+            tree[i + 1] += value
+            parent = i + 1 + ((i + 1) & -(i + 1))
+            if parent < size:
+                tree[parent] += tree[i + 1]
+        self.tree = tree
+
+class VirtualMeet(object):
+    """Scores virtual meets between any of the teams of a race, as if the
+    other teams had not run.  Only the top displacing finishers of each team
+    that could be scored, one with at least as many finishers as there are
+    scoring places, can ever be awarded points, so they are picked out and
+    sorted once; scoring a meet then only merges the finishers of its teams,
+    in order of finish, and places them again.  The teams are returned as by
+    score(), with copies of their finishers carrying the points of the
+    virtual meet and the team scores ready for a ScoreDumper."""
+
+    def __init__(self, results, scoring=5, displacing=7):
+        self.scoring = scoring
+        self.displacing = displacing
+        #The name, number of finishers and displacing finishers of each team
+        if isinstance(results, ResultSet):
+            groups = [(name, len(rows),
+                       [(row, results[row]) for row in rows[:displacing]])
+                      for name, rows in results.index("team").iteritems()
+                      if rows]
+            groups.sort(key=lambda (name, count, rows): rows[0][0])
+        else:
+            lookup = {}
+            groups = []
+            for row, finisher in enumerate(results):
+                name = finisher.team
+                group = lookup.get(name)
+                if group is None:
+                    group = lookup[name] = [name, 0, []]
+                    groups.append(group)
+                group[1] += 1
+                if group[1] <= displacing:
+                    group[2].append((row, finisher))
+        #The complete teams in order of their first finishers, and for each
+        #the rows, times and fields of its displacing finishers
+        self.teams = []
+        self.entrants = set()
+        self._codes = {}
+        self._rows = []
+        self._times = []
+        self._fields = []
+        for name, count, rows in groups:
+            if name is None:
+                continue
+            self.entrants.add(name)
+            if count < scoring:
+                continue
+            self._codes[name] = len(self.teams)
+            self.teams.append(name)
+            self._rows.append([row for row, finisher in rows])
+            self._times.append([-1 if finisher.time is None
+                                else _hundredths(finisher.time)
+                                for row, finisher in rows])
+            self._fields.append([(finisher.name, finisher.time,
+                                  finisher.year, finisher.team,
+                                  finisher.place, finisher.bib)
+                                 for row, finisher in rows])
+
+    def __repr__(self):
+        return "<VirtualMeet of %d teams>" % len(self.teams)
+
+    def score(self, teams=None):
+        """Score a meet between the named teams, or between every team if
+        none are named, returning a list of Team instances in order of
+        finish.  Teams too small to be scored are left out, as by score();
+        a ValueError is raised for a team that did not run."""
+        if teams is None:
+            return self._score(range(len(self.teams)))
+        return self._score(self._lookup(teams))
+
+    def dual(self, first, second):
+        """Score a dual meet between two teams."""
+        return self.score([first, second])
+
+    def duals(self, teams=None):
+        """Score the dual meet between every pair of the named teams, or of
+        all the teams, yielding a ((first, second), scores) pair for each,
+        where first finished ahead of second in the race.  Only teams that
+        can be scored are paired."""
+        if teams is None:
+            codes = range(len(self.teams))
+        else:
+            codes = sorted(set(self._lookup(teams)))
+        names = self.teams
+        for i, first in enumerate(codes):
+            for second in codes[i + 1:]:
+                yield ((names[first], names[second]),
+                       self._score((first, second)))
+
+    def _lookup(self, teams):
+        """Find the codes of the named teams that can be scored."""
+        codes = []
+        for name in teams:
+            code = self._codes.get(name)
+            if code is not None:
+                codes.append(code)
+            elif name not in self.entrants:
+                raise ValueError("No team %s in the race." % repr(name))
+        return codes
+
+    def _score(self, codes):
+        rows = []
+        for code in codes:
+            rows.extend(self._rows[code])
+        rows.sort()
+        places = dict(zip(rows, xrange(1, len(rows) + 1)))
+        teams = []
+        for code in codes:
+            points = [places[row] for row in self._rows[code]]
+            finishers = [Finisher(name, time, year, team, place, value, bib)
+                         for (name, time, year, team, place, bib), value
+                         in zip(self._fields[code], points)]
+            teams.append((self.teams[code], points, self._times[code],
+                          finishers))
+        return _rank(teams, self.scoring, len(rows) + 1)
+
+class ResultsFile(object):
+    """Race results that are reloaded whenever their file is republished
+    with corrections, such as a misspelled name, a corrected time or two
+    swapped places.  The finishers parsed from each line are kept, keyed by
+    the line, so reloading only parses the lines that were added or
+    changed, and returns a ChangeSet of what is different.  As for a
+    LiveRace, each team keeps its finishers in order of finish, and only
+    the teams named in the changes are sorted again; points are awarded
+    anew among the runners who can score, and only the lines of the report
+    whose finishers changed are formatted again.  The report therefore has
+    columns of fixed widths, by default the standard ones of a
+    ResultsDumper.  The scores and report are always those of the last
+    version loaded."""
+
+    def __init__(self, string=None, parser=None, scoring=5, displacing=7,
+                 distance=None, widths=None):
+        if parser is None:
+            parser = ResultsParser.for_layout()
+        if widths is None:
+            widths = ResultsDumper.standard_widths
+        self.parser = parser
+        self.scoring = scoring
+        self.displacing = displacing
+        self.results = []
+        self.scores = []
+        #The finisher parsed from each line, those parsed from the later
+        #copies of any repeated line, and the position of each finisher in
+        #the order of finish
+        self._parsed = {}
+        self._repeats = {}
+        self._order = {}
+        #The finishers of each team in order of finish, and those of them
+        #that have been awarded points
+        self.members = {}
+        self.awarded = {}
+        self._scored = []
+        #The report, as its header, the line of each finisher and the lines
+        #of the team scores
+        self._dumper = ResultsDumper((), distance, widths)
+        self._header = list(self._dumper.iheader())
+        self._lines = {}
+        self._score_lines = []
+        if string is not None:
+            self.reload(string)
+
+    def __len__(self):
+        return len(self.results)
+
+    def __repr__(self):
+        return "<ResultsFile of %d finishers>" % len(self.results)
+
+    def reload(self, string):
+        """Load a new version of the results, a string, a buffer, an open
+        file or any other iterable of lines, returning a ChangeSet of the
+        differences from the last version.  A LoadError is raised, and
+        nothing is changed, if a new line cannot be parsed."""
+        if isinstance(string, basestring):
+            lines = string.splitlines()
+        else:
+            lines = [line.rstrip("\r\n") for line in _lines(string)]
+        rows = lines
+        if len(set(lines)) < len(lines):
+            rows = [line for line in lines
+                    if len(line) > 0 and not line.isspace()]
+            if len(set(rows)) < len(rows):
+                results, parsed, repeats, inserted = self._match_repeated(
+                    lines)
+                return self._update(results, parsed, repeats, inserted)
+        #Look every line up at once, then parse those that were not found
+        results = map(self._parsed.get, rows)
+        inserted = []
+        blank = False
+        try:
+            i = results.index(None)
+            while True:
+                line = rows[i]
+                if len(line) == 0 or line.isspace():
+                    blank = True
+                else:
+                    results[i] = finisher = self._parse(line, lines)
+                    inserted.append(finisher)
+                i = results.index(None, i + 1)
+        except ValueError:
+            pass
+        if blank:
+            rows = [line for line, finisher in izip(rows, results)
+                    if finisher is not None]
+            results = filter(None, results)
+        return self._update(results, dict(izip(rows, results)), {},
+                            inserted)
+
+    def _parse(self, line, lines):
+        """Parse a new line, numbering it only if it cannot be parsed."""
+        try:
+            return self.parser.parse(line)
+        except LoadError:
+            return self.parser.parse(line, lines.index(line) + 1)
+
+    def _match_repeated(self, lines):
+        """Match the lines to the finishers of the last version one at a
+        time, as is needed when some lines are repeated, returning the
+        finishers, the first finisher of each line, the later finishers of
+        each repeated line and the finishers that were parsed anew."""
+        previous = self._parsed
+        previous_repeats = self._repeats
+        results = []
+        parsed = {}
+        repeats = {}
+        inserted = []
+        for i, line in enumerate(lines):
+            if len(line) == 0 or line.isspace():
+                continue
+            if line not in parsed:
+                finisher = previous.get(line)
+                if finisher is None:
+                    finisher = self.parser.parse(line, i + 1)
+                    inserted.append(finisher)
+                parsed[line] = finisher
+            else:
+                copies = repeats.setdefault(line, [])
+                old = previous_repeats.get(line, ())
+                if len(copies) < len(old):
+                    finisher = old[len(copies)]
+                else:
+                    finisher = self.parser.parse(line, i + 1)
+                    inserted.append(finisher)
+                copies.append(finisher)
+            results.append(finisher)
+        return results, parsed, repeats, inserted
+
+    def _update(self, results, parsed, repeats, inserted):
+        """Replace the last version with the new results, given as by
+        _match_repeated(), and update the scores and report to match."""
+        previous_order = self._order
+        positions = map(previous_order.get, results)
+        if inserted:
+            positions = [position for position in positions
+                         if position is not None]
+        removed = []
+        if len(positions) < len(self.results):
+            present = set(results)
+            removed = [finisher for finisher in self.results
+                       if finisher not in present]
+        moved = []
+        if positions != sorted(positions):
+            #The fewest lines that were moved to give the new order
+            kept = [finisher for finisher in results
+                    if finisher in previous_order]
+            moved = [kept[i] for i in _out_of_order(positions)]
+        changes = ChangeSet(inserted, removed, moved=moved)
+        self._parsed = parsed
+        self._repeats = repeats
+        self.results = results
+        self._order = dict(izip(results, xrange(len(results))))
+        if changes:
+            changes.rescored = self._rescore(changes)
+            self._redump(changes)
+        changes.modified = _pair_changes(changes.removed, changes.inserted)
+        return changes
+
+    def dump(self):
+        """Dump the current results and team scores to a string."""
+        return "\n".join(self.idump())
+
+    def idump(self):
+        """Dump the current results and team scores to an iterator of the
+        lines of the report."""
+        for row in self._header:
+            yield row
+        lines = self._lines
+        for finisher in self.results:
+            yield lines[finisher]
+        yield ""
+        for row in self._score_lines:
+            yield row
+
+    def _rescore(self, changes):
+        """Bring the teams named in the changes, and the points of every
+        finisher, into line with the new results, returning the finishers
+        whose points changed although their lines did not."""
+        order = self._order
+        removed = set(changes.removed)
+        gone = removed.union(changes.moved)
+        arrived = changes.inserted + changes.moved
+        teams = set(finisher.team for finisher in changes.removed)
+        teams.update(finisher.team for finisher in arrived)
+        teams.discard(None)
+        members = self.members
+        for team in teams:
+            runners = [runner for runner in members.get(team, ())
+                       if runner not in gone]
+            runners.extend(finisher for finisher in arrived
+                           if finisher.team == team)
+            if not runners:
+                members.pop(team, None)
+                self.awarded.pop(team, None)
+                continue
+            runners.sort(key=order.get)
+            members[team] = runners
+            if len(runners) >= self.scoring:
+                self.awarded[team] = runners[:self.displacing]
+            else:
+                self.awarded.pop(team, None)
+        #Points go to the awarded runners in order of finish
+        fresh = set(changes.inserted)
+        for finisher in changes.inserted:
+            finisher.points = None
+        scored = sorted((order[runner], runner)
+                        for runners in self.awarded.itervalues()
+                        for runner in runners)
+        rescored = []
+        for points, (position, runner) in enumerate(scored):
+            if runner.points != points + 1:
+                runner.points = points + 1
+                if runner not in fresh:
+                    rescored.append(runner)
+        awarded = set(runner for position, runner in scored)
+        for runner in self._scored:
+            if runner not in awarded and runner not in removed and \
+                    runner.points is not None:
+                runner.points = None
+                rescored.append(runner)
+        self._scored = [runner for position, runner in scored]
+        teams = [(name, [runner.points for runner in runners],
+                  [-1 if runner.time is None else _hundredths(runner.time)
+                   for runner in runners], runners)
+                 for name, runners in self.awarded.iteritems()]
+        self.scores = _rank(teams, self.scoring, len(scored) + 1)
+        rescored.sort(key=order.get)
+        return rescored
+
+    def _redump(self, changes):
+        """Format the lines of the report for the finishers that changed, and
+        the team scores."""
+        lines = self._lines
+        for finisher in changes.removed:
+            del lines[finisher]
+        format_row = self._dumper.format_row
+        fields = ResultsDumper.fields
+        for finisher in changes.inserted + changes.rescored:
+            lines[finisher] = format_row([getattr(finisher, field)
+                                          for field in fields])
+        self._score_lines = list(ScoreDumper(self.scores))
+
+class ChangeSet(object):
+    """The differences between two versions of a results file, as found by
+    ResultsFile.reload().  The finishers inserted, removed and moved are
+    in order of finish; a finisher whose line was only moved ahead of
+    others is the same instance as before.  A line that was changed rather
+    than added or taken out is paired, by bib, by name and team or by
+    place, with the line it replaced, and the (old, new) pair of finishers
+    is listed as modified instead.  The finishers whose lines did not change
+    but whose points did are rescored.  The length of a change set is the
+    number of lines changed."""
+
+    def __init__(self, inserted=(), removed=(), modified=(), moved=(),
+                 rescored=()):
+        self.inserted = list(inserted)
+        self.removed = list(removed)
+        self.modified = list(modified)
+        self.moved = list(moved)
+        self.rescored = list(rescored)
+
+    def __len__(self):
+        return (len(self.inserted) + len(self.removed) + len(self.modified) +
+                len(self.moved))
+
+    def __repr__(self):
+        return "<ChangeSet of %d inserted, %d removed, %d modified and %d " \
+               "moved>" % (len(self.inserted), len(self.removed),
+                           len(self.modified), len(self.moved))
+
+def _pair_changes(removed, inserted):
+    """Pair the removed finishers with the inserted finishers that replaced
+    them, taking the pairs out of both lists and returning them."""
+    pairs = []
+    for key in _change_keys:
+        if not removed or not inserted:
+            break
+        candidates = {}
+        for finisher in removed:
+            value = key(finisher)
+            if value is not None:
+                candidates.setdefault(value, []).append(finisher)
+        unpaired = []
+        for finisher in inserted:
+            matches = candidates.get(key(finisher))
+            if matches:
+                pairs.append((matches.pop(0), finisher))
+            else:
+                unpaired.append(finisher)
+        paired = set(old for old, new in pairs)
+        removed[:] = [finisher for finisher in removed
+                      if finisher not in paired]
+        inserted[:] = unpaired
+    return pairs
+
+def _out_of_order(keys):
+    """Find the indices of the fewest keys that must be moved to leave the
+    rest in increasing order, which are those outside of a longest
+    increasing subsequence.  The keys must be distinct."""
+    #The last key of the best subsequence found of each length, its index,
+    #and the index before each in its subsequence
+    tails = []
+    ends = []
+    links = []
+    for i, key in enumerate(keys):
+        length = bisect_left(tails, key)
+        if length == len(tails):
+            tails.append(key)
+            ends.append(i)
+        else:
+            tails[length] = key
+            ends[length] = i
+        links.append(ends[length - 1] if length else -1)
+    keep = set()
+    i = ends[-1] if ends else -1
+    while i >= 0:
+        keep.add(i)
+        i = links[i]
+    return [i for i in xrange(len(keys)) if i not in keep]
+
+def _name_key(finisher):
+    if finisher.name is None:
+        return None
+    return normalize_name(finisher.name), normalize_team(finisher.team)
+
+#The keys by which a changed line is paired with the line it replaced, from
+#the most to the least particular
+_change_keys = [lambda finisher: _normalize_bib(finisher.bib), _name_key,
+                lambda finisher: finisher.place]
+
+class DefaultTable(object):
+    """Default HyTek table, for subclassing.  It wraps a formatting.Table,
+    which is only imported once a table is made, and passes on everything
+    it does not define itself to that table."""
+
+    def __init__(self, rows, label=None, headings=None, pads=None):
+        from formatting import Table
+        self.table = Table(rows, label, headings, top_border="=",
+                           body_top="=", pads=pads)
+
+    def __getattr__(self, name):
+        if name == "table":
+            raise AttributeError(name)
+        return getattr(self.table, name)
+
+    def __iter__(self):
+        return iter(self.table)
+
+class ResultsDumper(DefaultTable):
+    """Dump a list of race results to a HyTek-style report.  Iterating over an
+    instance of this class produces the the report line-by-line.  Normally
+    every row is built up front so that the columns can be sized to fit.  If
+    the widths of the columns are given instead, the results may be any
+    iterable of finishers, and each row is formatted only when its line is
+    produced, so the first line comes out at once and memory use does not
+    depend on the size of the field.  Values wider than their column are not
+    cut short."""
+    headings = [None, "Name", "Year", "School", "Finals", "Points"]
+    fields = ("place", "name", "year", "team", "time", "points")
+    standard_widths = (3, 24, 2, 20, 8, 4)
+
+    def __init__(self, results, distance=None, widths=None):
+        pads = [str.rjust, None, None, None, None, lambda string, width:
+                    string.rjust(4).ljust(width)]
+        self.results = results
+        self.widths = None
+        if widths is not None:
+            if len(widths) != len(self.fields):
+                raise ValueError("Expected %d column widths, got %d." %
+                                 (len(self.fields), len(widths)))
+            self.widths = [max(width, len(heading or ""))
+                           for width, heading in zip(widths, self.headings)]
+            self._columns = zip([pad or str.ljust for pad in pads],
+                                self.widths)
+            #Size the table's header with a row as wide as each column
+            rows = [["-" * width for width in self.widths]]
+        elif isinstance(results, ResultSet):
+            rows = list(results.irows(self.fields))
+        else:
+            rows = [[getattr(runner, field) for field in self.fields]
+                    for runner in results]
+        label = "%d m run CC" % distance if distance is not None else None
+        super(ResultsDumper, self).__init__(rows, label, self.headings, pads)
+
+    def __iter__(self):
+        """Yields each of the lines of the report one at a time."""
+        if self.widths is None:
+            for row in super(ResultsDumper, self).__iter__():
+                yield row
+            return
+        for row in self.iheader():
+            yield row
+        if isinstance(self.results, ResultSet):
+            rows = self.results.irows(self.fields)
+        else:
+            rows = ([getattr(runner, field) for field in self.fields]
+                    for runner in self.results)
+        format_row = self.format_row
+        for row in rows:
+            yield format_row(row)
+
+    def format_row(self, row):
+        """Format a row, holding the value of each of the fields, as a line
+        of the report.  This needs the widths of the columns to have been
+        given."""
+        if self.widths is None:
+            raise ValueError("The widths of the columns were not given.")
+        return self.column_seperator.join([pad("" if value is None
+                                               else str(value), width)
+                                           for value, (pad, width)
+                                           in zip(row, self._columns)])
+
+class ScoreDumper(DefaultTable):
+    """Dump the scoring information of a race to a HyTek-style report."""
+
+    def __init__(self, scores):
+        self.scores = scores
+        label = "Team Scores"
+        headings = ["Rank", "Team".ljust(len("  Top 5 Avg:  dd:dd.dd ")),
+                    "Total"]
+        headings += [str(num).rjust(4) for num in xrange(1, 6)]
+        headings += [("*" + str(num)).rjust(4) for num in xrange(6, 8)]
+        pads = [str.rjust] * 10
+        pads[1] = None
+        rows = []
+        for team in scores:
+            new_row = [team.place, team.name, team.score]
+            new_row += [runner.points for runner in team.finishers]
+            diff = 7 - len(team.finishers)
+            if diff > 0:
+                new_row += [None] * diff
+            rows.append(new_row)
+        super(ScoreDumper, self).__init__(rows, label, headings, pads)
+
+    def __iter__(self):
+        """Yields each of the lines of the report one at a time."""
+        for row in self.iheader():
+            yield row
+        for row, team in zip(self.ibody(), self.scores):
+            yield row
+            yield "       Top 5 Avg:  " + str(team.top_five)
+            if team.top_seven is not None:
+                yield "       Top 7 Avg:  " + str(team.top_seven)
+
+#Exceptions
+
+class LoadError(Exception): pass
@@ -0,0 +1,7 @@
+"""Run the hytek command-line tool: python -m hytek COMMAND [options] ...
+Kept apart from the package so that only this file is compiled each time."""
+
+from hytek import main
+from sys import exit
+
+exit(main())
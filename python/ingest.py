@@ -0,0 +1,237 @@
+#!/usr/bin/env python2.6
+"""A service that accepts uploads of HyTek race results, as sent by the timing
+stations at a meet, and answers each with the regenerated HyTek report.
+Uploads are parsed in a bounded pool of worker processes, so a slow file
+holds up no one else; identical uploads are parsed only once; and when the
+pool is full, new uploads are turned away rather than left to queue without
+limit.  The service speaks HTTP over TCP or a Unix socket: POST the results
+file and the report is streamed back as it is written."""
+
+from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+from hashlib import sha1
+from hytek import dump_to, load, LoadError, score
+from multiprocessing import Pool, TimeoutError
+from multiprocessing.pool import ThreadPool
+from optparse import OptionParser
+from SocketServer import ThreadingMixIn, UnixStreamServer
+from sys import exit
+from threading import Condition
+from time import time
+from urlparse import parse_qs, urlsplit
+
+#Functions
+
+def _parse_upload(data):
+    """Parse an upload in a worker.  Errors are returned rather than raised,
+    so that the worker survives them and the upload's place in the pool is
+    always given back."""
+    try:
+        return load(data, columnar=True)
+    except Exception, error:
+        return error
+
+def main(arguments=None):
+    """Serve uploads of race results until interrupted."""
+    usage = "usage: %prog [options]"
+    options = OptionParser(usage=usage)
+    options.add_option("-s", "--socket", metavar="PATH",
+                       help="listen on the Unix socket PATH")
+    options.add_option("--host", default="localhost",
+                       help="host to listen on [default: %default]")
+    options.add_option("-p", "--port", type="int", default=8008,
+                       help="port to listen on [default: %default]")
+    options.add_option("-j", "--workers", type="int", default=None,
+                       help="number of worker processes [default: one per "
+                       "CPU]")
+    options.add_option("-c", "--capacity", type="int", default=64,
+                       help="most uploads to parse at once [default: "
+                       "%default]")
+    options.add_option("-w", "--wait", type="float", default=1.0,
+                       help="seconds an upload may wait for room in the "
+                       "pool [default: %default]")
+    options, arguments = options.parse_args(arguments)
+    ingestor = Ingestor(options.workers, options.capacity, options.wait)
+    if options.socket:
+        server = UnixIngestionServer(options.socket, ingestor)
+    else:
+        server = IngestionServer((options.host, options.port), ingestor)
+    try:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    finally:
+        server.server_close()
+        ingestor.close()
+    return 0
+
+#Classes
+
+class Ingestor(object):
+    """Parses uploads of race results in a bounded pool of workers.  At most
+    capacity uploads are parsed at once; an upload that finds the pool full
+    waits up to wait seconds for room and is then refused with a BusyError.
+    Uploads are identified by a hash of their contents, so an upload that is
+    identical to one being parsed, or to one of the last remember uploads,
+    shares its results rather than being parsed again.  Threads are used
+    instead of processes if threads is true."""
+
+    def __init__(self, workers=None, capacity=64, wait=1.0, timeout=60.0,
+                 remember=256, threads=False):
+        if threads:
+            self.pool = ThreadPool(workers)
+        else:
+            self.pool = Pool(workers)
+        self.capacity = capacity
+        self.wait = wait
+        self.timeout = timeout
+        self.remember = remember
+        self.pending = 0
+        self._condition = Condition()
+        self._uploads = {}
+        self._order = []
+
+    def __repr__(self):
+        return "<Ingestor with %d of %d uploads pending>" % (self.pending,
+                                                              self.capacity)
+
+    def submit(self, data):
+        """Start parsing an upload, returning a multiprocessing AsyncResult
+        whose value is the ResultSet, or the LoadError or other exception if
+        the upload could not be parsed.  A BusyError is raised if the pool
+        stays full for too long."""
+        key = sha1(data).hexdigest()
+        self._condition.acquire()
+        try:
+            upload = self._uploads.get(key)
+            if upload is not None:
+                self._order.remove(key)
+                self._order.append(key)
+                return upload
+            deadline = time() + self.wait
+            while self.pending >= self.capacity:
+                remaining = deadline - time()
+                if remaining <= 0:
+                    raise BusyError("%d uploads are already being parsed." %
+                                    self.pending)
+                self._condition.wait(remaining)
+            self.pending += 1
+            upload = self.pool.apply_async(_parse_upload, (data,),
+                                           callback=self._finished)
+            self._uploads[key] = upload
+            self._order.append(key)
+            while len(self._order) > self.remember:
+                del self._uploads[self._order.pop(0)]
+            return upload
+        finally:
+            self._condition.release()
+
+    def load(self, data):
+        """Parse an upload, returning its ResultSet.  A LoadError is raised
+        if it cannot be parsed, a BusyError if the pool is full and a
+        multiprocessing.TimeoutError if parsing takes longer than the
+        timeout.  Any other error in parsing is raised as it was."""
+        results = self.submit(data).get(self.timeout)
+        if isinstance(results, Exception):
+            raise results
+        return results
+
+    def close(self):
+        """Stop the workers once the uploads being parsed are done."""
+        self.pool.close()
+        self.pool.join()
+
+    def _finished(self, results):
+        self._condition.acquire()
+        try:
+            self.pending -= 1
+            self._condition.notify()
+        finally:
+            self._condition.release()
+
+class IngestionHandler(BaseHTTPRequestHandler):
+    """Handles one request to an ingestion server.  The body of a POST is a
+    results file; the response is the regenerated report.  The query may ask
+    for the team scores with score=1 and give the race's distance in meters
+    with distance=8000."""
+    protocol_version = "HTTP/1.0"
+    buffer_size = 16384
+
+    def do_POST(self):
+        try:
+            length = int(self.headers.getheader("Content-Length"))
+        except (TypeError, ValueError):
+            self.send_error(411, "A Content-Length is required")
+            return
+        data = self.rfile.read(length)
+        query = parse_qs(urlsplit(self.path)[3])
+        distance = query.get("distance", [None])[0]
+        if distance is not None:
+            try:
+                distance = int(distance)
+            except ValueError:
+                self.send_error(400, "The distance must be in meters")
+                return
+        try:
+            results = self.server.ingestor.load(data)
+        except LoadError, error:
+            self.send_error(400, str(error))
+            return
+        except BusyError, error:
+            self.send_response(503, str(error))
+            self.send_header("Retry-After", "1")
+            self.end_headers()
+            return
+        except TimeoutError:
+            self.send_error(504, "Parsing took too long")
+            return
+        except Exception:
+            self.send_error(500, "The upload could not be parsed")
+            return
+        scores = None
+        if query.get("score", ["0"])[0] not in ("", "0"):
+            #The results may be shared with other uploads, so score a copy
+            results = results[:]
+            scores = score(results)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain")
+        self.end_headers()
+        dump_to(self.wfile, results, scores, distance,
+                buffer_size=self.buffer_size)
+
+    def address_string(self):
+        if isinstance(self.client_address, tuple):
+            return self.client_address[0]
+        return "local"
+
+    def log_message(self, format, *arguments):
+        if self.server.verbose:
+            BaseHTTPRequestHandler.log_message(self, format, *arguments)
+
+class IngestionServer(ThreadingMixIn, HTTPServer):
+    """Ingestion server listening on a TCP address.  Each connection is
+    handled in its own thread while the parsing is done by the Ingestor."""
+    daemon_threads = True
+    request_queue_size = 256
+    verbose = False
+
+    def __init__(self, address, ingestor):
+        HTTPServer.__init__(self, address, IngestionHandler)
+        self.ingestor = ingestor
+
+class UnixIngestionServer(ThreadingMixIn, UnixStreamServer):
+    """Ingestion server listening on a Unix socket."""
+    daemon_threads = True
+    request_queue_size = 256
+    verbose = False
+
+    def __init__(self, path, ingestor):
+        UnixStreamServer.__init__(self, path, IngestionHandler)
+        self.ingestor = ingestor
+
+#Exceptions
+
+class BusyError(Exception): pass
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,1248 @@
+"""Unit tests for the hytek package."""
+
+from datetime import timedelta
+from hytek import AthleteIndex, dump, dump_to, export, export_scores, \
+     Finisher, idump, IFinisher, iload, LazyFinisher, LiveRace, load, \
+     load_many, load_meet, LoadError, normalize_team, RaceTime, ResultsCache, \
+     ResultsDumper, ResultSet, ResultsFile, ResultsParser, score, \
+     ScoreDumper, split_events, Stats, VirtualMeet
+from json import loads
+from mmap import ACCESS_READ, mmap
+from os import listdir, utime
+from os.path import abspath, dirname, getsize, join
+from pstats import Stats as Pstats
+from py.test import raises
+from shutil import rmtree
+from StringIO import StringIO
+from subprocess import PIPE, Popen
+from sys import executable
+from tempfile import mkdtemp
+
+def test_load_good_files():
+    nwc = """
+    1 Reynolds, Francis            Puget Sound           25:00.71    1
+    2 Castillo, Leo                Willamette            25:21.38    2
+    3 Parker, Matt                 Willamette            25:24.27    3
+    4 Redfield, Stefan             Willamette            25:35.76    4
+    5 Dickman, Karl                Lewis & Clark         25:39.35    5
+    6 Fisher, Shawn                Linfield College      25:47.41    6
+    7 McIsaac, Chris               Linfield College      25:53.22    7
+    8 Rebol, Nick                  Willamette            25:55.10    8
+    9 Jenkins, Aaron               Whitworth             25:58.83    9
+    10 Dudley, Tyler                Whitworth             26:00.72   10
+    11 Rand, Cory                   Whitman College       26:03.20   11
+    12 Roberts, John                Lewis & Clark         26:09.10   12
+    13 Davis, Tyler                 Linfield College      26:09.78   13
+    14 Caseria, Dusty               Whitworth             26:10.56   14
+    15 Platano, Chris               Willamette            26:15.49   15
+    16 McLaughlin, Ryan             Willamette            26:22.06   16
+    17 Aubol, Kevin                 Willamette            26:23.94   17
+    18 Gallagher, Nicholas          Whitworth             26:30.72   18
+    19 Eberhart, Cameron            George Fox            26:34.71   19
+    20 Stewart, Collin              Whitworth             26:40.91   20
+    21 Donovan, Ben                 Willamette            26:43.73
+    22 Berrian, Trevor              Whitworth             26:50.68   21
+    23 Smith, Nathan                Willamette            26:51.67
+    24 Sharma, Sean                 Willamette            26:58.43
+    25 Parker, Hugh                 Whitman College       27:07.11   22
+    26 Phillips, John               Pacific Lutheran      27:14.10   23
+    27 Hennessey, Sam               Whitman College       27:14.72   24
+    28 Villasenor, Alfredo          Whitman College       27:18.41   25
+    29 Andrascik, Sean              Pacific Lutheran      27:18.80   26
+    30 Deardorff, Joseph            Pacific University    27:21.72   27
+    31 Davis, Mark                  Whitworth             27:22.97   28
+    32 Reid, Curtis                 Whitman College       27:28.89   29
+    33 Anderson, Arian              Linfield College      27:29.96   30
+    34 Weiss, Asa                   Lewis & Clark         27:31.40   31
+    35 Baldridge, Jesse             Puget Sound           27:32.66   32
+    36 Weinbender, Eric             Linfield College      27:42.17   33
+    37 Bras, Orion                  Pacific Lutheran      27:43.03   34
+    38 Gage, Scott                  Linfield College      27:44.74   35
+    39 Snowden, Robert              Puget Sound           27:45.09   36
+    40 Smith, Samuel                Lewis & Clark         27:51.59   37
+    41 Barth, Justin                Pacific Lutheran      27:52.65   38
+    42 Gillem, John                 Pacific University    27:54.23   39
+    43 Kelly, Matthew               Whitman College       27:54.63   40
+    44 Luecke, Daniel               Whitman College       27:57.30   41
+    45 Rapet, Paul                  George Fox            27:57.82   42
+    46 VanSlyke, Alex               Linfield College      27:59.59   43
+    47 Boyer, Brendan               Whitman College       28:04.40
+    48 Butler, Cameron              Puget Sound           28:06.76   44
+    49 Bollen, Barrett              Pacific Lutheran      28:10.81   45
+    50 Fikak, Yonas                 Whitman College       28:13.23
+    51 Larson, Jonathan             Pacific University    28:14.25   46
+    52 Eifert, Christian            Whitworth             28:16.57
+    53 Battaglia, Lucian            Linfield College      28:22.11
+    54 Callow, John                 Whitman College       28:23.03
+    55 Wall, Casey                  Puget Sound           28:24.55   47
+    56 Horton, Anthony              Pacific Lutheran      28:26.95   48
+    57 Cushman, John                Pacific University    28:27.56   49
+    58 Grigsby, Kolter              Pacific Lutheran      28:30.31   50
+    59 Flora, Daniel                Pacific University    28:40.32   51
+    60 Martin, Austin               Pacific Lutheran      28:47.36
+    61 Burger, Adam                 Pacific University    28:54.09   52
+    62 Erickson, Ryan               George Fox            29:00.58   53
+    63 Cassel, Allen                George Fox            29:04.88   54
+    64 Klein, Matt                  Puget Sound           29:09.47   55
+    65 Fisher, Peter                Lewis & Clark         29:11.55   56
+    66 Sutfin, Chad                 George Fox            29:14.29   57
+    67 Shaver, Daniel               Lewis & Clark         29:14.85   58
+    68 Porter, Wesley               Pacific University    29:27.97   59
+    69 Allen-Slaba, Nathaniel       Pacific Lutheran      29:35.21
+    70 Polley, Shane                Whitworth             29:37.01
+    71 Page, Nathan                 Pacific Lutheran      29:37.38
+    72 Morrell, Austin              George Fox            29:39.32   60
+    73 Calavan, Mike                George Fox            29:55.43   61
+    74 Graham, Patrick              Puget Sound           30:08.67   62
+    75 Nishimura, Casey             Pacific University    30:19.56
+    76 Nevarez, Jose                Lewis & Clark         30:44.43   63
+    77 Church, Jason                Linfield College      31:01.34
+    78 Miles, Nic                   Linfield College      31:27.42
+    79 Cooper, Evan                 Pacific University    31:44.78
+    """
+    load("")
+    runners = load(nwc)
+    winner = runners[0]
+    assert winner.name == "Reynolds, Francis"
+    assert winner.time == RaceTime(1500.71)
+    assert winner.year == None
+    assert winner.team == "Puget Sound"
+    assert winner.place == 1
+    assert winner.points == 1
+    reg09m = """
+    1 #278 Jackson Brainerd     SO Colorado College      25:26.65    1
+    2 #323 Eric Kleinsasser     SO Occidental            25:26.81    2
+    3 #345 Francis Reynolds     SR Puget Sound           25:46.49
+    4 #276 Kramer Straube       JR Claremont-Mudd-S      25:49.09    3
+    5 #384 Matt Parker          JR Willamette            25:51.52    4
+    6 #272 Brian Kopczynski     JR Claremont-Mudd-S      25:51.63    5
+    7 #310 Shawn Fisher         SR Linfield              25:56.21    6
+    8 #387 Stefan Redfield      JR Willamette            26:00.05    7
+    9 #275 Florian Scheulen     SR Claremont-Mudd-S      26:01.07    8
+    10 #250 Ray Ostrander        JR Cal Lutheran          26:02.39    9
+    11 #376 Aaron Jenkins        SO Whitworth             26:09.04   10
+    12 #375 Nicholas Gallagher   JR Whitworth             26:15.19   11
+    13 #381 Leo Castillo         SO Willamette            26:16.52   12
+    14 #277 Brian Sutter         FR Claremont-Mudd-S      26:16.95   13
+    15 #298 Karl Dickman         SR Lewis & Clark         26:17.87   14
+    16 #342 John Mering          SR Pomona-Pitzer         26:21.86   15
+    17 #373 Tyler Dudley         SO Whitworth             26:23.00   16
+    18 #284 Daniel Kraft         JR Colorado College      26:24.03   17
+    19 #286 Andrew Wagner        JR Colorado College      26:26.00   18
+    20 #385 Chris Platano        SR Willamette            26:29.85   19
+    21 #341 Alex Johnson         FR Pomona-Pitzer         26:31.81   20
+    22 #271 Georgi Dinolov       JR Claremont-Mudd-S      26:37.37   21
+    23 #386 Nick Rebol           JR Willamette            26:41.82   22
+    24 #340 Brian Gillis         SR Pomona-Pitzer         26:43.80   23
+    25 #288 Cameron Eberhart     SR George Fox            26:45.43
+    26 #257 Alan Menezes         FR Caltech               26:51.25   24
+    27 #274 Matt Kurtis          SR Claremont-Mudd-S      26:52.96   25
+    28 #379 Collin Stewart       SR Whitworth             26:54.79   26
+    29 #349 Jeremy Kalmus        JR Redlands              26:57.19   27
+    30 #287 David Wilder         SO Colorado College      26:58.74   28
+    31 #283 Max Gerken           SO Colorado College      26:59.87   29
+    32 #344 Hale Shaw            SO Pomona-Pitzer         27:00.96   30
+    33 #254 Cameron Fen          FR Caltech               27:04.68   31
+    34 #370 Trevor Berrian       FR Whitworth             27:08.80   32
+    35 #338 Charles Enscoe       JR Pomona-Pitzer         27:08.93   33
+    36 #383 Ryan McLaughlin      JR Willamette            27:12.24   34
+    37 #311 Scott Gage           SO Linfield              27:13.06   35
+    38 #337 Anders Crabo         SO Pomona-Pitzer         27:14.77   36
+    39 #301 John Roberts         SO Lewis & Clark         27:21.27   37
+    40 #360 Curtis Reid          SR Whitman               27:24.82   38
+    41 #305 Asa Weiss            SR Lewis & Clark         27:26.47   39
+    42 #268 Kris Brown           JR Claremont-Mudd-S      27:28.47   40
+    43 #371 Dusty Caseria        SR Whitworth             27:29.68   41
+    44 #347 Jake Baechle         SR Redlands              27:30.18   42
+    45 #346 Duncan Ashby         SO Redlands              27:36.53   43
+    46 #372 Mark Davis           SO Whitworth             27:39.81   44
+    47 #336 Paul Balmer          SO Pomona-Pitzer         27:41.34   45
+    48 #280 Michael Dougan       SO Colorado College      27:42.56   46
+    49 #312 Chris McIsaac        SR Linfield              27:43.83   47
+    50 #380 Kevin Aubol          FR Willamette            27:46.79   48
+    51 #361 Alfredo Villasenor   FR Whitman               27:49.43   49
+    52 #322 Victor Kali          SR Occidental            27:49.47   50
+    53 #309 Tyler Davis          SR Linfield              27:52.47   51
+    54 #303 Samuel Smith         FR Lewis & Clark         27:55.69   52
+    55 #248 Brian Kahovec        SR Cal Lutheran          27:56.65   53
+    56 #291 Jasper Chang         SR La Verne              27:56.84   54
+    57 #304 Lars Steier          SR Lewis & Clark         28:03.95   55
+    58 #329 Joseph Deardorff     FR Pacific (Ore.)        28:03.98   56
+    59 #296 Leo Martinez         SO La Verne              28:04.47   57
+    60 #317 Thomas Cahuzac       SO Occidental            28:05.89   58
+    61 #359 Cory Rand            FR Whitman               28:07.99   59
+    62 #314 Alex VanSlyke        SO Linfield              28:09.76   60
+    63 #297 Matthew Sustayta     FR La Verne              28:10.74   61
+    64 #306 Arian Anderson       SO Linfield              28:12.50   62
+    65 #290 Oscar Castro         FR La Verne              28:17.58   63
+    66 #318 Mario Castillo       FR Occidental            28:24.03   64
+    67 #355 Matt Kelly           SR Whitman               28:26.85   65
+    68 #358 Hugh Parker          FR Whitman               28:27.03   66
+    69 #354 Sam Hennessey        JR Whitman               28:27.66   67
+    70 #252 Stephen Shirk        SO Cal Lutheran          28:27.95   68
+    71 #332 Jonathan Larson      FR Pacific (Ore.)        28:35.71   69
+    72 #319 Sebi Devlin-Foltz    SO Occidental            28:37.43   70
+    73 #251 Evan Reed            SO Cal Lutheran          28:44.01   71
+    74 #285 Andrew Vierra        FR Colorado College      28:45.71   72
+    75 #351 Aaron Minsk          SO Redlands              28:47.01   73
+    76 #295 Sean Kusick          FR La Verne              28:54.66   74
+    77 #292 Alex Forbess         FR La Verne              28:55.10   75
+    78 #261 Chris Cresci         SO Chapman               28:59.56   76
+    79 #363 Juan Bustos          SO Whittier              29:01.06   77
+    80 #331 John Gillem          SO Pacific (Ore.)        29:02.45   78
+    81 #348 Alec Fillmore        JR Redlands              29:09.36   79
+    82 #258 Andy Zucker          FR Caltech               29:11.82   80
+    83 #293 Marcus Fortugno      SO La Verne              29:14.12   81
+    84 #356 Daniel Luecke        JR Whitman               29:15.37   82
+    85 #330 Daniel Flora         FR Pacific (Ore.)        29:19.06   83
+    86 #315 Eric Weinbender      SO Linfield              29:21.99   84
+    87 #247 Brett Halvaks        SO Cal Lutheran          29:29.90   85
+    88 #362 Travis Airola        SO Whittier              29:38.48   86
+    89 #364 Bryce Holewinski     JR Whittier              29:39.80   87
+    90 #299 Peter Fisher         FR Lewis & Clark         29:42.24   88
+    91 #255 Andrew Gong          SO Caltech               29:46.96   89
+    92 #365 Vega Jordan          FR Whittier              29:52.60   90
+    93 #302 Daniel Shaver        FR Lewis & Clark         29:56.83   91
+    94 #324 Avery Mainardi       FR Occidental            30:24.94   92
+    95 #328 John Cushman         SO Pacific (Ore.)        30:28.22   93
+    96 #262 Angel Flores         FR Chapman               30:41.04   94
+    97 #350 Tom Marshall         FR Redlands              30:55.38   95
+    98 #325 Charlie Sauter       FR Occidental            30:56.00   96
+    99 #366 Marco Leone          SO Whittier              31:03.73   97
+    100 #256 Ryan Keeley          SO Caltech               31:16.39   98
+    101 #326 Adam Burger          FR Pacific (Ore.)        31:53.42   99
+    102 #264 Craig McGirr         FR Chapman               32:24.41  100
+    103 #267 Nathan Worden        FR Chapman               33:58.47  101
+    104 #260 Sergi Casamitjana    JR Chapman               34:29.63  102
+    105 #266 Cale Skagen          FR Chapman               35:08.82  103
+    """
+    runners = load(reg09m)
+    winner = runners[0]
+    assert winner.name == "Jackson Brainerd"
+    assert winner.time == RaceTime(25*60+26.65)
+    assert winner.year == "SO"
+    assert winner.team == "Colorado College"
+    assert winner.place == 1
+    assert winner.points == 1
+    assert winner.bib == "#278"
+    assert runners[2].name == "Francis Reynolds"
+    reg09w = """
+    1 #186 Alicia Freese        SR Pomona-Pitzer         22:07.60    1
+    2 #126 Jennifer Tave        SO Claremont-Mudd-S      22:10.70    2
+    3 #230 Dana Misterek        JR Whitworth             22:10.74    3
+    4 #162 Marci Klimek         SR Linfield              22:23.08    4
+    5 #218 Michele Callaway     SO Whittier              22:27.77    5
+    6 #233 Joy Shufeldt         FR Whitworth             22:29.25    6
+    7 #203 Mikayla Murphy       JR UC Santa Cruz         22:39.86    7
+    8 #235 Tonya Turner         JR Whitworth             22:44.39    8
+    9 #242 Tina Patel           SR Willamette            22:54.23    9
+    10 #190 Hayley Walker        SO Puget Sound           22:56.10
+    11 #124 Julia Rigby          SO Claremont-Mudd-S      22:58.87   10
+    12 #208 Yasmeen Colis        SR Whitman               23:01.15   11
+    13 #236 Kathryn Williams     JR Whitworth             23:03.28   12
+    14 #187 Rose Haag            SR Pomona-Pitzer         23:12.36   13
+    15 #241 Kimber Mattox        SO Willamette            23:13.81   14
+    16 #214 Sara McCune          SR Whitman               23:19.60   15
+    17 #173 Grace Peck           SR Occidental            23:20.81   16
+    18 #105 Toccoa Kahovec       SO Cal Lutheran          23:23.26   17
+    19 #207 Kristen Ballinger    JR Whitman               23:30.68   18
+    20 #183 Roxanne Cook         FR Pomona-Pitzer         23:35.70   19
+    21 #229 Jo E Mayer           SR Whitworth             23:41.36   20
+    22 #172 Sadie Mohler         SO Occidental            23:43.54   21
+    23 #194 Katie Ostrinski      JR Redlands              23:45.98   22
+    24 #160 Nelly Evans          SO Linfield              23:46.30   23
+    25 #158 Frances Corcorran    SR Linfield              23:46.77   24
+    26 #155 Heather Spurling     FR Lewis & Clark         23:46.92   25
+    27 #166 Anna Dalton          SO Occidental            23:48.66   26
+    28 #154 Hannah Palmer        JR Lewis & Clark         23:49.53   27
+    29 #192 Heather Mayer        JR Redlands              23:51.08   28
+    30 #167 Eliza Dornbush       SO Occidental            23:53.72   29
+    31 #122 Breanna Deutsch      SO Claremont-Mudd-S      23:54.49   30
+    32 #215 Heather O'Moore      SR Whitman               23:55.62   31
+    33 #156 Emily Thomas         FR Lewis & Clark         23:59.88   32
+    34 #209 Michela Corcorran    SR Whitman               24:01.12   33
+    35 #188 Rachel Haislet       SR Pomona-Pitzer         24:01.76   34
+    36 #219 Molly Litherland     SO Whittier              24:03.32   35
+    37 #177 Amanda Basham        SO Pacific (Ore.)        24:04.89   36
+    38 #225 Christine Verduzco   FR Whittier              24:04.95   37
+    39 #202 Jessica Meyer        FR UC Santa Cruz         24:06.67   38
+    40 #239 Kaitlin Greene       SO Willamette            24:12.17   39
+    41 #170 Megan Lang           FR Occidental            24:14.01   40
+    42 #125 Ashley Scott         JR Claremont-Mudd-S      24:14.70   41
+    43 #161 Gretchen George      SO Linfield              24:15.43   42
+    44 #243 Amanda Tamanaha      FR Willamette            24:15.54   43
+    45 #103 Nicole Flanary       JR Cal Lutheran          24:15.83   44
+    46 #121 Kate Crawford        FR Claremont-Mudd-S      24:16.18   45
+    47 #193 Stephanie Mera       SR Redlands              24:18.14   46
+    48 #150 Kirsten Fix          SR Lewis & Clark         24:19.64   47
+    49 #211 Emilie Gilbert       FR Whitman               24:21.66   48
+    50 #128 Aubrey Zimmerling    FR Claremont-Mudd-S      24:23.04   49
+    51 #226 Candace Wray         SO Whittier              24:24.70   50
+    52 #165 Charlotte Trowbridge  SR Linfield              24:25.75   51
+    53 #127 Laura Wyatt          FR Claremont-Mudd-S      24:27.80   52
+    54 #216 Emily Rodriguez      SR Whitman               24:27.87   53
+    55 #191 Kelly Luck           SR Redlands              24:30.35   54
+    56 #130 Maggie Harkins       SO Colorado College      24:33.35   55
+    57 #244 Alisha Till          FR Willamette            24:43.25   56
+    58 #152 Corinne Innes        SO Lewis & Clark         24:46.69   57
+    59 #197 Madison Smith        FR Redlands              24:48.56   58
+    60 #228 Kaitlin Hildebrand   SR Whitworth             24:50.97   59
+    61 #231 Emily Morehouse      SR Whitworth             24:52.08   60
+    62 #147 Raven Campbell       JR Lewis & Clark         24:54.26   61
+    63 #204 Rebecca Parsons      FR UC Santa Cruz         25:01.23   62
+    64 #185 Kayla Eland          SO Pomona-Pitzer         25:01.74   63
+    65 #237 Theresa Edwards      FR Willamette            25:04.67   64
+    66 #224 Guadalupe Ulloa      FR Whittier              25:05.09   65
+    67 #240 Megan Horning        JR Willamette            25:06.71   66
+    68 #132 Megan Hurster        SO Colorado College      25:08.06   67
+    69 #221 Darlene Partida      SR Whittier              25:13.56   68
+    70 #180 Samantha Lee         JR Pacific (Ore.)        25:16.48   69
+    71 #174 Tara Saxena          FR Occidental            25:18.81   70
+    72 #189 Zoe Meyers           SR Pomona-Pitzer         25:20.51   71
+    73 #129 Margot Cutter        SO Colorado College      25:23.54   72
+    74 #109 Justine Chia         JR Caltech               25:25.48   73
+    75 #140 Brigitte Blazys      JR La Verne              25:32.02   74
+    76 #205 Kelsey Shields       SO UC Santa Cruz         25:37.91   75
+    77 #142 Micaela Castillo     SO La Verne              25:38.95   76
+    78 #101 Lynn Clahassey       JR Cal Lutheran          25:43.24   77
+    79 #196 Vainayaki Sivaji     FR Redlands              25:45.75   78
+    80 #182 Kate Brieger         JR Pomona-Pitzer         25:47.24   79
+    81 #157 Jill Boroughs        FR Linfield              25:48.04   80
+    82 #206 Hailey Stiers        JR UC Santa Cruz         25:48.13   81
+    83 #222 Jamie Slingluff      SO Whittier              25:49.15   82
+    84 #111 Sylvia Sullivan      SO Caltech               25:51.62   83
+    85 #178 Hayley Brusewitz     FR Pacific (Ore.)        25:51.82   84
+    86 #198 Seana Thompson       FR Redlands              25:54.72   85
+    87 #176 Lauren Barnard       SO Pacific (Ore.)        25:58.61   86
+    88 #148 Kelsey Croall        JR Lewis & Clark         25:59.19   87
+    89 #163 Rosika Nees          FR Linfield              26:01.30   88
+    90 #110 Clara Eng            SO Caltech               26:05.69   89
+    91 #199 Danielle Breski      JR UC Santa Cruz         26:09.43   90
+    92 #117 Angelica Hernandez   SO Chapman               26:15.12   91
+    93 #134 Molly McGee          JR Colorado College      26:15.53   92
+    94 #146 Sydney Rose          FR La Verne              26:15.76   93
+    95 #104 Michelle Horgan      JR Cal Lutheran          26:16.01   94
+    96 #181 Whitney Nelson       JR Pacific (Ore.)        26:21.51   95
+    97 #179 Jilinda Franklin     FR Pacific (Ore.)        26:33.90   96
+    98 #102 Caitlin Coomber      SO Cal Lutheran          26:35.98   97
+    99 #119 Kirsten Moore        JR Chapman               27:05.26   98
+    100 #118 Amanda Kristedja     FR Chapman               27:15.75   99
+    101 #106 Masha Belyi          SR Caltech               27:20.58  100
+    102 #200 Jenny Cain           SO UC Santa Cruz         27:23.23  101
+    103 #138 Rebecca Thompson     SO Colorado College      27:34.76  102
+    104 #131 Chelsea Herzog       JR Colorado College      27:36.32  103
+    105 #175 Meghan Whalen        SO Occidental            27:43.37  104
+    106 #107 Nina Budaeva         FR Caltech               27:55.26  105
+    107 #143 Stephanie Fuentes    SR La Verne              28:05.81  106
+    108 #133 Georgia Ivsin        SO Colorado College      28:15.93  107
+    109 #141 Guadalupe Camberos   FR La Verne              28:58.78  108
+    110 #139 Amber Blackshear     JR La Verne              29:20.64  109
+    111 #113 Jessie Drews         FR Chapman               29:41.99  110
+    112 #114 Jillian Freitas      JR Chapman               32:09.15  111
+    113 #116 Katherine Hendricks  FR Chapman               32:18.20  112
+    """
+    runners = load(reg09w)
+    runner = runners[31]
+    assert runner.name == "Heather O'Moore"
+    assert runner.time == RaceTime(23*60+55.62)
+    assert runner.year == "SR"
+    assert runner.team == "Whitman"
+    assert runner.place == 32
+    assert runner.points == 31
+    assert runner.bib == "#215"
+
+def test_load_bad_files():
+    raises(LoadError, load, "This is a whole big load of nonsense.")
+
+def test_load_columnar_overflow():
+    #A number too large for a result set is a bad row, as is a time too
+    #large for a RaceTime in an eager load
+    good = "  1 Reynolds, Francis  Puget Sound  25:00.71  1\n"
+    time = "  2 Castillo, Leo  Willamette  99999999999999999:21.38  2"
+    raises(LoadError, load, good + time)
+    for bad in ("99999999999999999999 Reynolds, Francis  Puget Sound  "
+                "25:00.71  1", time):
+        report = good + "\n" + bad + "\n" + good
+        for stats in (None, Stats()):
+            try:
+                load(report, columnar=True, stats=stats)
+            except LoadError, error:
+                assert str(error).startswith("Line 3: ")
+            else:
+                assert False
+        meet = "Event 1  Men 8k Run CC\n" + report
+        raises(LoadError, load_meet, meet, columnar=True)
+        #Nothing is added to a result set by a row it cannot store
+        results = load(good, columnar=True)
+        values = ResultsParser.for_layout().parse_values(good)
+        values[0] = 10 ** 20
+        raises(OverflowError, results.append_values, values)
+        assert len(results) == 1
+        assert [len(column) for column in results.columns.values()] == \
+               [1] * len(results.columns)
+
+def test_iload_streams_lines():
+    lines = iter(["  1 Reynolds, Francis    Puget Sound    25:00.71    1\n",
+                  "  This line is not a finisher.\n"])
+    runners = iload(lines)
+    winner = runners.next()
+    assert winner.name == "Reynolds, Francis"
+    assert winner.team == "Puget Sound"
+    raises(LoadError, runners.next)
+    runners = iload(StringIO("  2 Castillo, Leo  Willamette  25:21.38  2\n"))
+    assert [runner.place for runner in runners] == [2]
+
+def test_load_line_endings():
+    rows = ["  1 Reynolds, Francis  Puget Sound  25:00.71 1",
+            "  2 Castillo, Leo  Willamette  25:21.38 2"]
+    for ending in ("\n", "\r\n", "\r"):
+        text = ending.join(rows) + ending
+        for data in (text, bytearray(text)):
+            assert [runner.place for runner in load(data)] == [1, 2]
+        assert len(ResultsFile(text)) == 2
+    #A "\r\n" split between two chunks of a buffer is one line ending
+    text = rows[0].ljust(65535) + "\r\n" + rows[1] + "\r\nPage 2\r\n"
+    try:
+        load(bytearray(text))
+    except LoadError, error:
+        assert str(error).startswith("Line 3:")
+    else:
+        assert False, "Page 2 is not a finisher."
+
+def test_load_buffers():
+    #Enough copies of a meet to span several chunks of a buffer
+    contents = (small_meet * 60).replace("\n", "\r\n")
+    expected = [(runner.place, runner.name, runner.team, runner.time)
+                for runner in load(contents)]
+    directory = mkdtemp()
+    try:
+        path = join(directory, "results.txt")
+        stream = open(path, "wb")
+        stream.write(contents)
+        stream.close()
+        stream = open(path, "rb")
+        try:
+            mapped = mmap(stream.fileno(), 0, access=ACCESS_READ)
+        finally:
+            stream.close()
+        for data in (bytearray(contents), buffer(contents),
+                     memoryview(contents), mapped):
+            assert [(runner.place, runner.name, runner.team, runner.time)
+                    for runner in load(data)] == expected
+        assert len(load(mapped, columnar=True)) == len(expected)
+        mapped.close()
+        #A line that runs on across several chunks
+        long_line = small_meet.replace("25:26.65    1", "25:26.65" +
+                                       " " * 200000 + "1")
+        assert [runner.time for runner in load(bytearray(long_line))] == \
+               [runner.time for runner in load(small_meet)]
+    finally:
+        rmtree(directory)
+    #Repeated teams and years share one string
+    runners = load(small_meet)
+    assert runners[0].team is runners[9].team
+    assert runners[0].year is runners[1].year
+
+def test_results_parser_layouts():
+    parser = ResultsParser.for_layout()
+    assert ResultsParser.for_layout() is parser
+    short = ResultsParser.for_layout(("place", "name", "team", "time"), ())
+    assert short is not parser
+    assert ResultsParser.for_layout(["place", "name", "team", "time"],
+                                    []) is short
+    runners = load("  3 Parker, Matt  Willamette  25:24.27\n", short)
+    assert runners[0].name == "Parker, Matt"
+    assert runners[0].time == RaceTime(25*60+24.27)
+    assert runners[0].points is None
+    assert runners[0].bib is None
+    raises(ValueError, ResultsParser, ("place", "shoe size"))
+    match = parser.match("  7 Van Dyke, Mary  SR Whitman  College  24:01.12")
+    assert match.group("name") == "Van Dyke, Mary"
+    assert match.group("team") == "Whitman  College"
+    assert match.group("bib") is None
+    assert short.match(match.string).group("year") is None
+    raises(IndexError, match.group, "shoe size")
+    assert parser.match("Page 2") is None
+    assert parser.match("  7 Van  Dyke, Mary  Whitman  24:01.12") is None
+    assert parser.match("1" * 100000) is None
+    #Lines too long for the row pattern are split into tokens instead, with
+    #the same results
+    tokenizer = ResultsParser()
+    tokenizer.fast_length = -1
+    assert repr(load(small_meet, tokenizer)) == repr(load(small_meet))
+    assert tokenizer.match(match.string).values == match.values
+
+def test_results_parser_fixed_width():
+    #Rows too long for the row pattern are cut into columns at the offsets of
+    #the rows before them, with the same results as splitting them into tokens
+    parser = ResultsParser.for_layout()
+    rows = [parser.match(line).groupdict()
+            for line in small_meet.splitlines() if line.strip()]
+    wide = "".join("%5s %6s %-30s %2s %-40s %12s %5s\n" %
+                   tuple(row[field] or "" for field in parser.field_order)
+                   for row in rows)
+    #A team run on into the time, a row shifted to the right, a row without
+    #a bib or year
+    wide += "   25  #1 Jo E Mayer                     SR Whitworth " \
+            "University Of Spokane Washington State 28:37.43    23\n" \
+            "      26   #319 Thomas Cahuzac            SO Occidental" \
+            "                                  28:05.89    24\n" \
+            "   27        Kevin Aubol                       Willamette" \
+            "                                   27:46.79    25\n"
+    wide = wide * 2
+    tokenizer = ResultsParser()
+    tokenizer.fixed_width = False
+    slicer = ResultsParser()
+    assert len(wide.splitlines()[0]) > slicer.fast_length
+    assert repr(load(wide, slicer)) == repr(load(wide, tokenizer))
+    assert repr(load(wide, slicer, lazy=True)) == \
+           repr(load(wide, tokenizer, lazy=True))
+    results = load(wide, slicer, columnar=True)
+    expected = load(wide, tokenizer, columnar=True)
+    assert list(results.irows(ResultSet.fields)) == \
+           list(expected.irows(ResultSet.fields))
+    #Lines that are not rows, or whose numbers are too long, are turned away
+    #as before
+    lines = wide.splitlines()
+    lines += [" " * 60 + "Page 2" + " " * 60, "1" * 200,
+              "  7" + " " * 200 + "7", "1234567890" + lines[5][5:],
+              lines[5][:-5] + "1234567890"]
+    match = slicer.row_matcher()
+    for line in lines:
+        expected = tokenizer.match(line)
+        assert getattr(match(line), "values", None) == \
+               getattr(expected, "values", None)
+    assert match.__self__.cut is not None
+    #Every row is cut into columns when the row pattern is never used
+    tokenizer.fast_length = slicer.fast_length = -1
+    assert repr(load(small_meet, slicer)) == repr(load(small_meet, tokenizer))
+    assert repr(load(small_meet, slicer)) == repr(load(small_meet))
+
+small_meet = """
+    1 #278 Jackson Brainerd     SO Colorado College      25:26.65    1
+    2 #323 Eric Kleinsasser     SO Occidental            25:26.81    2
+    3 #345 Francis Reynolds     SR Puget Sound           25:46.49
+    4 #276 Kramer Straube       JR Claremont-Mudd-S      25:49.09    3
+    5 #384 Matt Parker          JR Willamette            25:51.52    4
+    6 #272 Brian Kopczynski     JR Claremont-Mudd-S      25:51.63    5
+    7 #387 Stefan Redfield      JR Willamette            26:00.05    6
+    8 #275 Florian Scheulen     SR Claremont-Mudd-S      26:01.07    7
+    9 #381 Leo Castillo         SO Willamette            26:16.52    8
+    10 #284 Daniel Kraft         JR Colorado College      26:24.03    9
+    11 #286 Andrew Wagner        JR Colorado College      26:26.00   10
+    12 #385 Chris Platano        SR Willamette            26:29.85   11
+    13 #271 Georgi Dinolov       JR Claremont-Mudd-S      26:37.37   12
+    14 #386 Nick Rebol           JR Willamette            26:41.82   13
+    15 #274 Matt Kurtis          SR Claremont-Mudd-S      26:52.96   14
+    16 #287 David Wilder         SO Colorado College      26:58.74   15
+    17 #283 Max Gerken           SO Colorado College      26:59.87   16
+    18 #383 Ryan McLaughlin      JR Willamette            27:12.24   17
+    19 #322 Victor Kali          SR Occidental            27:49.47   18
+    20 #268 Kris Brown           JR Claremont-Mudd-S      27:28.47   19
+    21 #280 Michael Dougan       SO Colorado College      27:42.56   20
+    22 #380 Kevin Aubol          FR Willamette            27:46.79   21
+    23 #270 Tom Eckert           SO Claremont-Mudd-S      27:50.12
+    24 #317 Thomas Cahuzac       SO Occidental            28:05.89   22
+    """
+
+def test_load_name_forms():
+    runners = load("""
+    1 #329 Sebi Devlin-Foltz     SO Occidental            28:37.43   70
+    2 #215 Heather O'Moore       SR Whitman               23:55.62   31
+    3 #229 Jo E Mayer            SR Whitworth             23:41.36
+    4 Allen-Slaba, Nathaniel       Pacific Lutheran      29:35.21
+    5 O'Moore, Heather             Whitman               23:55.62   32
+    6 Van Dyke, Mary               Whitman               24:01.12
+    """)
+    assert [runner.name for runner in runners] == [
+        "Sebi Devlin-Foltz", "Heather O'Moore", "Jo E Mayer",
+        "Allen-Slaba, Nathaniel", "O'Moore, Heather", "Van Dyke, Mary"]
+    assert [runner.year for runner in runners[:3]] == ["SO", "SR", "SR"]
+    assert runners[3].team == "Pacific Lutheran"
+
+def test_load_many():
+    directory = mkdtemp()
+    try:
+        paths = [join(directory, name) for name in ("a", "b", "c", "d", "e")]
+        #A place too large to store in a result set
+        huge = "99999999999999999999 Reynolds, Francis  Puget Sound  " \
+               "25:00.71  1\n"
+        for path, text in zip(paths[:3] + paths[4:],
+                              [small_meet, "Nonsense.", small_meet, huge]):
+            stream = open(path, "w")
+            stream.write(text)
+            stream.close()
+        for workers in (1, 2):
+            loaded = list(load_many(paths, workers, ordered=True))
+            assert [path for path, results in loaded] == paths
+            assert [runner.name for runner in loaded[0][1]] == \
+                   [runner.name for runner in load(small_meet)]
+            assert isinstance(loaded[1][1], LoadError)
+            assert isinstance(loaded[3][1], LoadError)
+            assert len(loaded[2][1]) == 24
+        loaded = dict(load_many(paths, 2, columnar=True))
+        assert sorted(loaded) == paths
+        assert isinstance(loaded[paths[2]], ResultSet)
+        assert isinstance(loaded[paths[4]], LoadError)
+        assert paths[4] in str(loaded[paths[4]])
+    finally:
+        rmtree(directory)
+
+def test_results_cache():
+    directory = mkdtemp()
+    try:
+        path = join(directory, "meet.txt")
+        stream = open(path, "w")
+        stream.write(small_meet)
+        stream.close()
+        cache = ResultsCache(join(directory, "cache"))
+        expected = load(small_meet, columnar=True)
+        parser = ResultsParser.for_layout()
+        key = cache.key(small_meet, parser)
+        assert cache.get(key) is None
+        for i in xrange(2):
+            results = load(path, columnar=True, cache=cache)
+            assert list(results.irows(ResultSet.fields)) == \
+                   list(expected.irows(ResultSet.fields))
+        runners = load(path, cache=cache)
+        assert [repr(runner) for runner in runners] == \
+               [repr(runner) for runner in expected]
+        cached = cache.get(key)
+        assert list(cached.irows(ResultSet.fields)) == \
+               list(expected.irows(ResultSet.fields))
+        assert cached.where("team", "Willamette") == \
+               expected.where("team", "Willamette")
+        #A new parser version or layout gets a new entry
+        assert cache.key(small_meet, ResultsParser(optional=())) != key
+        #Damaged entries are discarded
+        entry = open(cache._path(key), "r+b")
+        entry.truncate(40)
+        entry.close()
+        assert cache.get(key) is None
+        assert len(load(path, cache=cache.directory)) == 24
+        assert cache.get(key) is not None
+        #Least recently used entries are evicted past the size limit
+        cache.put("other", expected[:5])
+        size = sum(getsize(join(cache.directory, name))
+                   for name in listdir(cache.directory))
+        cache.max_size = size - 1
+        utime(cache._path(key), (0, 0))
+        cache.evict()
+        assert cache.get(key) is None
+        assert len(cache.get("other")) == 5
+        cache.clear()
+        assert listdir(cache.directory) == []
+        raises(IOError, "load(join(directory, 'missing'), cache=cache)")
+    finally:
+        rmtree(directory)
+
+def test_load_meet():
+    meet = """
+Licensed to Willamette University       HY-TEK's MEET MANAGER 11/1/2008 Page 1
+                     2008 NWC Cross Country Championships
+                                   Results
+
+Event 1  Men 8k Run CC
+===============================================================================
+    Name                    Year School                  Finals  Points
+===============================================================================
+  1 Reynolds, Francis            Puget Sound           25:00.71    1
+  2 Castillo, Leo                Willamette            25:21.38    2
+
+Licensed to Willamette University       HY-TEK's MEET MANAGER 11/1/2008 Page 2
+                     2008 NWC Cross Country Championships
+===============================================================================
+  3 Parker, Matt                 Willamette            25:24.27    3
+
+                                 Team Scores
+===============================================================================
+Place School                      Total    1    2    3    4    5   *6   *7
+===============================================================================
+   1 Willamette                      50    2    3    4    8   33
+Event 2  Women 6k Run CC
+===============================================================================
+    Name                    Year School                  Finals  Points
+===============================================================================
+  1 #215 Heather O'Moore       SR Whitman               23:55.62   31
+Event 1  Men 8k Run CC
+  4 Redfield, Stefan             Willamette            25:35.76    4
+"""
+    for workers in (1, 2):
+        events = load_meet(meet, workers=workers)
+        assert [(event.number, event.name) for event in events] == \
+               [(1, "Men 8k Run CC"), (2, "Women 6k Run CC")]
+        assert [runner.name for runner in events[0].results] == \
+               ["Reynolds, Francis", "Castillo, Leo", "Parker, Matt",
+                "Redfield, Stefan"]
+        assert [runner.team for runner in events[1].results] == ["Whitman"]
+    events = load_meet(meet, columnar=True)
+    assert isinstance(events[0].results, ResultSet)
+    assert events[0].results.column("place") == [1, 2, 3, 4]
+    sections = split_events(meet)
+    assert [number for number, line in sections[0][2]] == [10, 11, 16, 29]
+    events = load_meet(small_meet)
+    assert len(events) == 1
+    assert events[0].number is None and len(events[0].results) == 24
+    assert load_meet("") == []
+    bad = meet.replace("  3 Parker, Matt", "  3 parker, matt")
+    for workers in (1, 2):
+        try:
+            load_meet(bad, workers=workers)
+        except LoadError, error:
+            assert str(error).startswith("Line 16:")
+        else:
+            assert False
+
+def test_score():
+    runners = load(small_meet)
+    scores = score(runners)
+    assert [team.name for team in scores] == ["Claremont-Mudd-S",
+                                              "Willamette", "Colorado College"]
+    assert [team.score for team in scores] == [36, 37, 47]
+    assert [team.place for team in scores] == [1, 2, 3]
+    assert [runner.points for runner in scores[0].finishers] == \
+           [2, 4, 6, 11, 13, 17, 20]
+    assert [runner.points for runner in scores[2].finishers] == \
+           [1, 8, 9, 14, 15, 18]
+    assert scores[0].top_five == RaceTime(26*60+14.42)
+    assert scores[2].top_seven is None
+    assert runners[1].points is None
+    assert runners[2].points is None
+    assert runners[23].points is None
+    results = load(small_meet, columnar=True)
+    columnar = score(results)
+    assert [(team.name, team.score, team.top_five, team.top_seven)
+            for team in columnar] == \
+           [(team.name, team.score, team.top_five, team.top_seven)
+            for team in scores]
+    assert results.column("points") == [runner.points for runner in runners]
+    assert list(ScoreDumper(columnar)) == list(ScoreDumper(scores))
+
+def test_score_tiebreaker():
+    time = RaceTime(20*60)
+    runners = [Finisher("Runner %d" % place, time, team=team, place=place)
+               for place, team in enumerate("AABBABBBABAA", 1)]
+    scores = score(runners)
+    assert [(team.name, team.score) for team in scores] == [("B", 28),
+                                                           ("A", 28)]
+    assert [team.place for team in scores] == [1, 2]
+    scores = score(runners[:10])
+    assert [(team.name, team.score) for team in scores] == [("B", 15)]
+    assert runners[0].points is None
+    assert score(runners, scoring=7) == []
+
+def test_live_race():
+    runners = load(small_meet)
+    race = LiveRace()
+    for runner in runners:
+        race.add_finisher(runner)
+    expected = load(small_meet)
+    scores = score(expected)
+    def summary(results, scores):
+        return ([(runner.place, runner.name, runner.time, runner.points)
+                 for runner in results],
+                [(team.name, team.place, team.score, team.top_five,
+                  team.top_seven, [runner.name for runner in team.finishers])
+                 for team in scores])
+    assert len(race) == 24
+    assert summary(race.results(), race.scores()) == summary(expected, scores)
+    assert race.dump(8000) == dump(expected, scores, 8000)
+    #Disqualify Willamette's first runner and swap two Claremont runners
+    #with an Occidental runner and an individual
+    assert race.disqualify(5).name == "Matt Parker"
+    race.swap(3, 7)
+    race.swap(12, 23)
+    expected = [Finisher(runner.name, runner.time, runner.year, runner.team,
+                         None, None, runner.bib) for runner in runners]
+    del expected[4]
+    for first, second in ((2, 6), (11, 22)):
+        for field in ("name", "team", "year", "bib"):
+            first_value = getattr(expected[first], field)
+            setattr(expected[first], field, getattr(expected[second], field))
+            setattr(expected[second], field, first_value)
+    for place, runner in enumerate(expected):
+        runner.place = place + 1
+        runner.time = runners[place + (place >= 4)].time
+    scores = score(expected)
+    assert summary(race.results(), race.scores()) == summary(expected, scores)
+    raises(IndexError, race.disqualify, 24)
+    #Swapping a place with itself changes nothing
+    race.swap(4, 4)
+    assert summary(race.results(), race.scores()) == summary(expected, scores)
+    #A scored finisher without a time is scored as by score()
+    runners = load(small_meet)
+    runners[0].time = None
+    race = LiveRace()
+    for runner in runners:
+        race.add_finisher(runner)
+    scores = score(runners)
+    assert summary(race.results(), race.scores()) == summary(runners, scores)
+    assert race.dump() == dump(runners, scores)
+
+def test_virtual_meet():
+    runners = load(small_meet)
+    meet = VirtualMeet(runners)
+    assert meet.teams == ["Colorado College", "Claremont-Mudd-S",
+                          "Willamette"]
+    scores = meet.score()
+    expected = score(load(small_meet))
+    assert [(team.name, team.place, team.score, team.top_five,
+             team.top_seven) for team in scores] == \
+           [(team.name, team.place, team.score, team.top_five,
+             team.top_seven) for team in expected]
+    #The finishers of the race are left alone
+    assert [runner.points for runner in runners] == \
+           [runner.points for runner in load(small_meet)]
+    assert dump([], scores) == dump([], expected)
+    #Each virtual meet agrees with scoring the race without the other teams
+    duals = list(meet.duals())
+    assert [pair for pair, scores in duals] == [
+        ("Colorado College", "Claremont-Mudd-S"),
+        ("Colorado College", "Willamette"),
+        ("Claremont-Mudd-S", "Willamette")]
+    subsets = [pair for pair, scores in duals] + \
+              [("Willamette", "Occidental", "Colorado College")]
+    for teams, scores in duals + [(subsets[-1], meet.score(subsets[-1]))]:
+        rescored = score([runner for runner in load(small_meet)
+                          if runner.team in teams])
+        assert dump([], scores) == dump([], rescored)
+        assert [team.top_seven for team in scores] == \
+               [team.top_seven for team in rescored]
+    assert meet.dual("Willamette", "Occidental")[0].score == 15
+    assert meet.score(["Puget Sound"]) == []
+    assert [pair for pair, scores in
+            meet.duals(["Willamette", "Puget Sound", "Colorado College"])] \
+           == [("Colorado College", "Willamette")]
+    raises(ValueError, "meet.score(['Reed'])")
+    results = ResultSet(load(small_meet))
+    assert VirtualMeet(results).teams == meet.teams
+    #Asking for the group of a team that did not run leaves the index alone
+    assert len(results.group("team", "Chapman")) == 0
+    assert "Chapman" not in results.index("team")
+    assert VirtualMeet(results).teams == meet.teams
+
+def test_results_file():
+    widths = ResultsDumper.standard_widths
+    def report(string):
+        runners = load(string)
+        return dump(runners, score(runners), 8000, widths)
+    results = ResultsFile(small_meet, distance=8000)
+    assert len(results) == 24
+    assert results.dump() == report(small_meet)
+    runners = results.results
+    changes = results.reload(small_meet)
+    assert len(changes) == 0 and results.results == runners
+    #Correct a misspelled name and swap two places
+    lines = small_meet.splitlines()
+    lines[4:6] = [
+        "4 #384 Matt Parkers         JR Willamette            25:49.09    3",
+        "5 #276 Kramer Straube       JR Claremont-Mudd-S      25:51.52    4"]
+    changes = results.reload("\n".join(lines))
+    assert (changes.inserted, changes.removed, changes.moved,
+            changes.rescored) == ([], [], [], [])
+    assert [(old.name, new.name, new.place) for old, new in
+            changes.modified] == [("Matt Parker", "Matt Parkers", 4),
+                                  ("Kramer Straube", "Kramer Straube", 5)]
+    assert results.dump() == report("\n".join(lines))
+    #Disqualify a Colorado College runner and move an individual's line
+    assert lines[10].split()[2:4] == ["Daniel", "Kraft"]
+    del lines[10]
+    lines.append(lines.pop(3))
+    changes = results.reload("\n".join(lines))
+    assert [runner.name for runner in changes.removed] == ["Daniel Kraft"]
+    assert changes.moved == [runners[2]]
+    assert changes.inserted == changes.modified == []
+    assert [runner.points for runner in changes.rescored] == range(8, 20)
+    assert results.dump() == report("\n".join(lines))
+    #Repeated and blank lines
+    lines[1:1] = ["", lines[1], "   "]
+    changes = results.reload("\n".join(lines))
+    assert [runner.bib for runner in changes.inserted] == ["#278"]
+    assert results.dump() == report("\n".join(lines))
+    changes = results.reload(StringIO("\n".join(lines)))
+    assert len(changes) == 0
+    before = results.dump()
+    raises(LoadError, results.reload, small_meet + "\n    Not a finisher")
+    assert results.dump() == before
+
+def _run(*arguments):
+    """Run the interpreter, beside the hytek package, returning its status
+    and output."""
+    process = Popen((executable,) + arguments, stdout=PIPE, stderr=PIPE,
+                    cwd=dirname(abspath(__file__)))
+    output, errors = process.communicate()
+    return process.returncode, output
+
+def test_command_line():
+    directory = mkdtemp()
+    try:
+        path = join(directory, "results.txt")
+        stream = open(path, "w")
+        try:
+            stream.write(small_meet)
+        finally:
+            stream.close()
+        assert _run("-m", "hytek", "load", path) == \
+               (0, "%s: 24 finishers\n" % path)
+        runners = load(small_meet)
+        scores = score(runners)
+        assert _run("-m", "hytek", "score", path) == \
+               (0, "\n".join(ScoreDumper(scores)) + "\n")
+        assert _run("-m", "hytek", "dump", "--score", path) == \
+               (0, dump(runners, scores) + "\n")
+        stream = StringIO()
+        export(stream, load(small_meet))
+        assert _run("-m", "hytek", "convert", path) == (0, stream.getvalue())
+        assert _run("-m", "hytek", "convert", "-f", "columns", "-s",
+                    path)[0] == 2
+        assert _run("-m", "hytek", "dump", join(directory, "missing"))[0] == 1
+        assert _run("-m", "hytek")[0] == 2
+        #Each command imports only what it needs
+        for command, needed in (("convert", []), ("dump", ["formatting"])):
+            status, output = _run("-c", "import sys\n"
+                                  "from hytek import main\n"
+                                  "main(['%s', %r])\n"
+                                  "print ' '.join(sys.modules)" %
+                                  (command, path))
+            modules = output.split("\n")[-2].split()
+            for module in ("cProfile", "formatting", "hashlib", "json",
+                           "multiprocessing", "optparse", "py", "tempfile"):
+                assert (module in modules) == (module in needed)
+    finally:
+        rmtree(directory)
+
+def test_idump_widths():
+    def finishers():
+        yield Finisher("Reynolds, Francis", RaceTime(1500.71), None,
+                       "Puget Sound", 1, 1)
+        raise LoadError("The rest of the field has not finished.")
+    widths = ResultsDumper.standard_widths
+    lines = idump(finishers(), distance=8000, widths=widths)
+    header = list(ResultsDumper([], 8000))
+    for row in header:
+        assert lines.next()
+    row = lines.next()
+    assert row.startswith("  1")
+    assert "Reynolds, Francis" in row and "25:00.71" in row
+    raises(LoadError, lines.next)
+    runners = load(small_meet)
+    stream = StringIO()
+    dump_to(stream, iter(runners), score(runners), widths=widths,
+            buffer_size=100)
+    report = stream.getvalue()
+    assert report == dump(runners, score(runners), widths=widths) + "\n"
+    start = len(list(ResultsDumper([])))
+    rows = report.splitlines()[start:start + len(runners)]
+    assert len(set(row.index(runner.name)
+                   for row, runner in zip(rows, runners))) == 1
+    raises(ValueError, ResultsDumper, runners, None, (3, 24))
+
+def test_result_set():
+    listed = load(small_meet)
+    results = load(small_meet, columnar=True)
+    assert len(results) == len(listed) == 24
+    for finisher, row in zip(listed, results):
+        for field in ResultSet.fields:
+            assert getattr(finisher, field) == getattr(row, field)
+    assert isinstance(results[0], IFinisher)
+    assert results[-1].name == "Thomas Cahuzac"
+    assert results[2].points is None
+    willamette = results.filter("team", "Willamette")
+    assert len(willamette) == 7
+    assert willamette[0].name == "Matt Parker"
+    assert results.where("team", "Chapman") == []
+    assert results.groups("team")["Occidental"] == [1, 18, 23]
+    by_time = results.sort("time")
+    assert by_time[18].name == "Kris Brown"
+    assert results.sort("name")[0].name == "Andrew Wagner"
+    assert results.sum("points", [0, 1, 2]) == 3
+    assert results.mean("time", [0, 1]) == RaceTime(25*60+26.73)
+    assert [row.place for row in results[1:4]] == [2, 3, 4]
+    assert ResultSet(listed).column("bib") == results.column("bib")
+    assert list(ResultsDumper(listed)) == list(ResultsDumper(results))
+
+def test_result_set_indexes():
+    results = load(small_meet, columnar=True)
+    assert results.lookup("bib", 384).name == "Matt Parker"
+    assert results.lookup("bib", "#384").name == "Matt Parker"
+    assert results.lookup("bib", 999) is None
+    assert results.lookup("name", "Parker, Matt").place == 5
+    assert results.where("name", "  MATT   parker") == [4]
+    assert results.where("year", "fr") == [21]
+    assert results.where("time", "25:26.65") == [0]
+    assert results.where("place", 3) == [2]
+    occidental = results.group("team", "Occidental")
+    chapman = results.group("team", "Chapman")
+    assert [runner.place for runner in occidental] == [2, 19, 24]
+    assert len(chapman) == 0
+    results.append(Finisher("Jordan Smith", RaceTime(30*60), "SO", "Chapman",
+                            25, None, "#500"))
+    results.append(Finisher("Sam Jones", RaceTime(31*60), "SR", "Occidental",
+                            26, None, "#501"))
+    assert [runner.name for runner in chapman] == ["Jordan Smith"]
+    assert occidental[-1].name == "Sam Jones"
+    assert results.lookup("bib", 501).place == 26
+    assert results.where("name", "Jones, Sam") == [25]
+    assert results.groups("team")["Occidental"] == [1, 18, 23, 25]
+    #Scoring reads the team index and replaces the points column
+    scores = score(results)
+    listed = [Finisher(runner.name, runner.time, runner.year, runner.team,
+                       runner.place, None, runner.bib) for runner in results]
+    assert results.where("points", 1) == [0]
+    assert [(team.name, team.score) for team in scores] == \
+           [(team.name, team.score) for team in score(listed)]
+    assert list(ScoreDumper(scores)) == list(ScoreDumper(score(listed)))
+
+def test_score_result_rows():
+    expected = load(small_meet)
+    scores = score(expected)
+    results = load(small_meet, columnar=True)
+    results[2].points = 99
+    assert results.where("points", 99) == [2]
+    rows = score(list(results))
+    assert [(team.name, team.score) for team in rows] == \
+           [(team.name, team.score) for team in scores]
+    assert results.column("points") == [runner.points for runner in expected]
+    assert results.where("points", 2) == [3]
+    #Scoring one team's rows awards points against that team alone
+    willamette = [results[i] for i in results.where("team", "Willamette")]
+    assert [team.score for team in score(willamette)] == [15]
+    assert [runner.points for runner in willamette] == range(1, 8)
+    assert results.where("points", 2) == [3, 6]
+    occidental = results.group("team", "Occidental")
+    assert score(occidental) == []
+    assert [runner.points for runner in occidental] == [None] * 3
+
+def test_athlete_index():
+    athletes = AthleteIndex({"Pacific (Ore.)": "Pacific University"})
+    athletes.add("nwc", load("""
+    1 Reynolds, Francis            Puget Sound           25:00.71    1
+    2 Kelly, Matthew               Pacific University    25:21.38    2
+    3 Smith, Sam                   Willamette            25:24.27    3
+    """))
+    athletes.add_meets([("regionals", load("""
+    1 #345 Francis Reynolds     SR Puget Sound           25:46.49
+    2 #300 Matt Kelly           JR Pacific (Ore.)        26:00.05
+    3 #301 Sam Smith            FR Willamette            26:01.07
+    4 #302 Samuel Smith         SO Willamette            26:02.07
+    5 #303 Sam Smith            SO Whitman College       26:03.07
+    """))])
+    assert len(athletes) == 5
+    reynolds, = athletes.find("Francis Reynolds")
+    assert reynolds.name == "Francis Reynolds"
+    assert [(performance.meet, performance.time)
+            for performance in reynolds.history] == \
+           [("nwc", RaceTime(25*60+0.71)),
+            ("regionals", RaceTime(25*60+46.49))]
+    kelly, = athletes.find("Kelly, Matt", "Pacific (Ore.)")
+    assert kelly.team == "Pacific University"
+    assert [performance.name for performance in kelly.history] == \
+           ["Kelly, Matthew", "Matt Kelly"]
+    smiths = athletes.find("Sam Smith")
+    assert [(smith.team, len(smith.history)) for smith in smiths] == \
+           [("Willamette", 2), ("Whitman College", 1)]
+    assert len(athletes.find("Samuel Smith", "Willamette")[0].history) == 1
+    assert athletes.find("Smith, Sam", "Whitman")[0] is smiths[1]
+    assert athletes.find("Nobody") == []
+    assert normalize_team("Univ. of Puget-Sound") == "of puget sound"
+
+def test_stats():
+    finished = []
+    stats = Stats(finished.append)
+    runners = load(small_meet + "\n\n", stats=stats)
+    assert finished == [stats]
+    assert stats.counts["lines"] == 24
+    assert stats.counts["blank lines"] == 3
+    assert stats.counts["bytes"] == len(small_meet) + 2
+    assert sorted(stats.times) == ["build", "convert bib", "convert name",
+                                   "convert place", "convert points",
+                                   "convert team", "convert time",
+                                   "convert year", "match", "read"]
+    assert stats.throughput() > 0
+    report = dump(runners, score(runners), stats=stats)
+    assert report == dump(runners, score(runners))
+    assert stats.counts["report lines"] == len(report.splitlines())
+    assert stats.counts["report bytes"] == len(report) + 1
+    assert "format scores" in stats.times
+    assert len(finished) == 2
+    columnar = Stats()
+    assert len(load(small_meet, columnar=True, stats=columnar)) == 24
+    assert columnar.counts["lines"] == 24 and "build" in columnar.times
+    failed = Stats()
+    raises(LoadError, "load('Nonsense.', stats=failed)")
+    assert failed.counts["failures"] == 1
+    assert failed.counts["lines"] == 0
+    assert failed.to_dict()["counts"]["failures"] == 1
+    assert '"failures": 1' in failed.to_json()
+    raises(ValueError, "failed.dump_profile('profile')")
+    directory = mkdtemp()
+    try:
+        profiled = Stats(profile=True)
+        load(small_meet, stats=profiled)
+        path = join(directory, "profile")
+        profiled.dump_profile(path)
+        assert "from_string" in str(Pstats(path).stats)
+    finally:
+        rmtree(directory)
+
+def test_load_lazy():
+    eager = load(small_meet)
+    lazy = load(small_meet, lazy=True)
+    assert all(isinstance(runner, LazyFinisher) for runner in lazy)
+    assert lazy[0].team == "Colorado College"
+    assert lazy[0]._team is lazy[0].team
+    assert lazy[0].line == small_meet.splitlines()[1]
+    raises(AttributeError, "lazy[0]._time")
+    assert [repr(runner) for runner in lazy] == \
+           [repr(runner) for runner in eager]
+    assert lazy[2].points is None
+    lazy = load(small_meet, lazy=True)
+    assert [(team.name, team.score) for team in score(lazy)] == \
+           [(team.name, team.score) for team in score(eager)]
+    assert [runner.points for runner in lazy] == \
+           [runner.points for runner in eager]
+    assert dump(lazy) == dump(eager)
+    runners = load("1 Reynolds, Francis   Puget Sound   25:00.71",
+                   ResultsParser(("place", "name", "team", "time"), ()),
+                   lazy=True)
+    assert runners[0].bib is None and runners[0].year is None
+    assert runners[0].time == RaceTime(25*60+0.71)
+    raises(LoadError, "load('Nonsense.', lazy=True)")
+    raises(ValueError, "load(small_meet, columnar=True, lazy=True)")
+    stats = Stats()
+    assert len(load(small_meet, stats=stats, lazy=True)) == 24
+    assert stats.counts["lines"] == 24 and "match" in stats.times
+
+def test_export():
+    runners = load(small_meet)
+    results = load(small_meet, columnar=True)
+    scores = score(runners)
+    for source in (runners, results, iter(runners)):
+        stream = StringIO()
+        export(stream, source, buffer_size=256)
+        lines = stream.getvalue().splitlines()
+        assert lines[0] == "place,bib,name,year,team,time,points"
+        assert lines[1] == "1,#278,Jackson Brainerd,SO,Colorado College," \
+                           "25:26.65,1"
+        assert lines[3] == "3,#345,Francis Reynolds,SR,Puget Sound,25:46.49,"
+        assert len(lines) == 25
+    stream = StringIO()
+    export(stream, results, "jsonl", buffer_size=1)
+    rows = [loads(line) for line in stream.getvalue().splitlines()]
+    assert rows[2] == dict(place=3, bib="#345", name="Francis Reynolds",
+                           year="SR", team="Puget Sound", time="25:46.49",
+                           points=None)
+    assert [row["name"] for row in rows] == results.column("name")
+    stream = StringIO()
+    export(stream, runners, "columns")
+    decoded = ResultSet.decode(stream.getvalue())
+    assert list(decoded.irows(ResultSet.fields)) == \
+           list(ResultSet(runners).irows(ResultSet.fields))
+    quoted = [Finisher('Ken "Speedy" Fast', RaceTime(60), team="A, B")]
+    stream = StringIO()
+    export(stream, quoted)
+    assert stream.getvalue().splitlines()[1] == \
+           ',,"Ken ""Speedy"" Fast",,"A, B",1:00.00,'
+    stream = StringIO()
+    export_scores(stream, scores)
+    lines = stream.getvalue().splitlines()
+    assert lines[0] == "place,team,score,top_five,top_seven,1,2,3,4,5,6,7"
+    assert lines[1] == "1,Claremont-Mudd-S,36,26:14.42,26:38.67,2,4,6,11," \
+                       "13,17,20"
+    assert lines[3].endswith(",")
+    stream = StringIO()
+    export_scores(stream, scores, "jsonl")
+    teams = [loads(line) for line in stream.getvalue().splitlines()]
+    assert teams[2]["top_seven"] is None
+    assert teams[0]["points"] == [2, 4, 6, 11, 13, 17, 20]
+    #Team names in JSON are decoded from Windows-1252 unless told otherwise
+    runners = [Finisher("Juan Ortiz", RaceTime(60), team="Pe\xf1a College",
+                        place=place) for place in xrange(1, 6)]
+    for source in (runners, ResultSet(runners)):
+        stream = StringIO()
+        export(stream, source)
+        assert stream.getvalue().splitlines()[1] == \
+               "1,,Juan Ortiz,,Pe\xf1a College,1:00.00,"
+        stream = StringIO()
+        export(stream, source, "jsonl")
+        assert loads(stream.getvalue().splitlines()[0])["team"] == \
+               u"Pe\xf1a College"
+        stream = StringIO()
+        export(stream, source, "jsonl", encoding="utf-8")
+        assert loads(stream.getvalue().splitlines()[0])["team"] == \
+               u"Pe\ufffda College"
+    stream = StringIO()
+    export_scores(stream, score(runners), "jsonl")
+    assert loads(stream.getvalue())["team"] == u"Pe\xf1a College"
+    raises(ValueError, "export(StringIO(), runners, 'xml')")
+    raises(ValueError, "export_scores(StringIO(), scores, 'columns')")
+
+def test_race_time_from_string_good():
+    assert RaceTime.from_string("0:0") == RaceTime(0)
+    assert RaceTime.from_string("24:44.80") == RaceTime(24*60+44.8)
+    assert RaceTime.from_string("1") == RaceTime(1)
+    assert RaceTime.from_string("777") == RaceTime(777)
+
+def test_race_time_arithmetic():
+    time = RaceTime.from_string("25:26.65")
+    assert time.hundredths == 152665
+    assert str(time) == "25:26.65"
+    assert repr(time) == "RaceTime(1526, 650000)"
+    assert str(RaceTime(5.5)) == "0:05.50"
+    assert str(RaceTime(-1.5)) == "-0:01.50"
+    assert time + RaceTime(0.35) == RaceTime(25*60+27)
+    assert time - RaceTime(60) == RaceTime(24*60+26.65)
+    assert sum([time, time], RaceTime(0)) / 2 == time
+    assert time * 2 == 2 * time == RaceTime(50*60+53.3)
+    assert RaceTime(1) < time <= time
+    assert sorted([time, RaceTime(1)]) == [RaceTime(1), time]
+    assert time == RaceTime.from_superclass(timedelta(0, 1526, 650000))
+    assert sum([time, time]) == time * 2
+    assert time + timedelta(0, 1) == RaceTime(25*60+27.65)
+    assert RaceTime.from_superclass(timedelta(0, 24*60+44.8)) == \
+           RaceTime(24*60+44.8)
+    assert time.to_superclass() == timedelta(0, 1526, 650000)
+    assert RaceTime.from_string("1:02.345") == RaceTime(62.35)
+    assert RaceTime.from_string("1:2.5") == RaceTime(62.5)
+    assert RaceTime.from_string(" 12.5") == RaceTime(12.5)
+    assert list(RaceTime.array_from_strings(["1:00.01", "59"])) == [6001, 5900]
+    assert len(set([time, RaceTime.from_string("25:26.65")])) == 1
+    raises(TypeError, RaceTime.from_string, None)
+
+def test_race_time_compatibility():
+    time = RaceTime(90.5)
+    delta = timedelta(0, 90.5)
+    assert time == delta and not time != delta
+    assert hash(time) == hash(delta)
+    assert {time: 1}[delta] == 1
+    assert time < timedelta(0, 91) and time <= delta
+    assert time > timedelta(0, 90, 499999) and time >= delta
+    assert time != timedelta(0, 90, 501000)
+    assert timedelta(0, 100) - time == RaceTime(9.5)
+    #A bare number is not a time
+    assert RaceTime(1) != 100 and not RaceTime(1) == 100
+    assert time != 9050 and 9050 != time
+    assert time != "1:30.50" and time is not None
+    for expression in ["time + 1", "1 + time", "time - 1", "1 - time",
+                       "time % 7", "7 % time", "divmod(time, 7)",
+                       "divmod(7, time)", "time ** 2", "2 ** time",
+                       "time & 1", "1 | time", "time ^ 1", "time << 1",
+                       "1 >> time", "~time", "1 / time", "1 // time",
+                       "time * time", "time / time", "time + 1.5",
+                       "time < 9051", "9051 > time", "time >= 0",
+                       "cmp(time, 9050)", "time + '1'"]:
+        raises(TypeError, expression)
+    assert sum([time, time]) == RaceTime(181)
+    assert time * 2 / 2.0 == time // 1 == time
+
+def test_race_from_string_bad():
+    raises(TypeError, "RaceTime.from_string(':0')")
+    raises(TypeError, "RaceTime.from_string(':')")
+    raises(TypeError, "RaceTime.from_string('33:44:70')")
+    raises(TypeError, "RaceTime.from_string('33.44:70')")
+    raises(TypeError, "RaceTime.from_string('0:777')")
+
+def test_race_time_from_string_seconds():
+    #The seconds of a time with minutes must be less than a minute
+    raises(TypeError, "RaceTime.from_string('1:60.00')")
+    assert RaceTime.from_string("1:59.99") == RaceTime(119.99)
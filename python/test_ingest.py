@@ -0,0 +1,91 @@
+"""Unit tests for the ingest module."""
+
+from benchmark import generate
+from hytek import dump, load, LoadError, ResultSet, score
+from ingest import BusyError, Ingestor, UnixIngestionServer
+from os.path import join
+from py.test import raises
+from shutil import rmtree
+from socket import AF_UNIX, socket, SOCK_STREAM
+from tempfile import mkdtemp
+from threading import Thread
+
+def test_ingestor():
+    upload = "\n".join(generate(300, 10, "bib_year"))
+    ingestor = Ingestor(2, capacity=4)
+    try:
+        first = ingestor.submit(upload)
+        assert ingestor.submit(upload) is first
+        results = ingestor.load(upload)
+        assert isinstance(results, ResultSet)
+        assert results.column("name") == \
+               [runner.name for runner in load(upload)]
+        assert isinstance(ingestor.submit("Nonsense.").get(), LoadError)
+        raises(LoadError, "ingestor.load('Nonsense.')")
+        assert ingestor.pending == 0
+        ingestor.capacity = 0
+        ingestor.wait = 0
+        raises(BusyError, "ingestor.submit('Something new.')")
+        assert ingestor.load(upload) is results
+    finally:
+        ingestor.close()
+    #An upload that fails in an unexpected way still gives back its place
+    ingestor = Ingestor(1, capacity=1, wait=0)
+    try:
+        bad = "99999999999999999999 Reynolds, Francis  Puget Sound  " \
+              "25:00.71  1\n"
+        raises(Exception, "ingestor.load(bad)")
+        assert ingestor.pending == 0
+        assert ingestor.load(upload).column("name") == results.column("name")
+    finally:
+        ingestor.close()
+
+def _post(path, body, query=""):
+    client = socket(AF_UNIX, SOCK_STREAM)
+    client.connect(path)
+    client.sendall("POST /%s HTTP/1.0\r\nContent-Length: %d\r\n\r\n%s" %
+                   (query, len(body), body))
+    chunks = []
+    while True:
+        chunk = client.recv(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    client.close()
+    head, blank, body = "".join(chunks).partition("\r\n\r\n")
+    return int(head.split()[1]), body
+
+def test_unix_server():
+    directory = mkdtemp()
+    ingestor = Ingestor(2, threads=True)
+    try:
+        path = join(directory, "socket")
+        server = UnixIngestionServer(path, ingestor)
+        thread = Thread(target=server.serve_forever)
+        thread.setDaemon(True)
+        thread.start()
+        upload = "\n".join(generate(500, 10, "last_first", seed=1))
+        status, body = _post(path, upload)
+        assert status == 200
+        assert body == dump(load(upload)) + "\n"
+        runners = load(upload)
+        status, body = _post(path, upload, "?score=1&distance=8000")
+        assert body == dump(runners, score(runners), 8000) + "\n"
+        assert _post(path, "Nonsense.")[0] == 400
+        bad = "99999999999999999999 Reynolds, Francis  Puget Sound  " \
+              "25:00.71  1\n"
+        assert _post(path, bad)[0] in (400, 500)
+        assert _post(path, upload)[0] == 200
+        replies = []
+        posts = [Thread(target=lambda: replies.append(_post(path, upload)))
+                 for i in xrange(50)]
+        for post in posts:
+            post.start()
+        for post in posts:
+            post.join()
+        assert [status for status, body in replies] == [200] * 50
+        server.shutdown()
+        server.server_close()
+    finally:
+        ingestor.close()
+        rmtree(directory)